@@ -1,9 +1,89 @@
-import random
-import csv
-import os
+import sys
+import time
+
+# Only what is needed to show the menu is imported here. The word file modules,
+# csv, the custom words store and the leaderboard are imported when first used
+# (the word list is loaded in the background while the menu is on screen).
+from game_engine import WRONG_LETTER, WRONG_WORD, HangmanGame
+from game_text import (DIFFICULTY_NAMES, DIFFICULTY_PROMPT, DIFFICULTY_RETRY_PROMPT,
+                       GUESS_PROMPT, HANGMAN_STAGES, HINT_PROMPT, MARATHON_PROMPT, MENU_PROMPT,
+                       MENU_TEXT, PLAY_AGAIN_PROMPT, adaptive_message, end_message, guess_message,
+                       marathon_end_message, marathon_status, progress_text, turn_text)
+from metrics import enable_from_environment, get_metrics
+
+# Where words are picked from: "catalog" (CSV cached in memory),
+# "pack" (compiled binary word pack, memory-mapped),
+# "stream" (one pass over the CSV per round, constant memory) or
+# "language" (CSV in WORD_ENCODING with words in any language, see below)
+WORD_SOURCE = "catalog"
+
+# Language of the word files for the "language" source. A guessed letter also
+# uncovers the same letter with an accent ("E" finds "É" and "È"), except for
+# the letters a language counts on their own: with "es", "N" does not uncover "Ñ".
+# None treats every accented letter as the plain one. How each word's letters
+# match is worked out when the file is loaded, so guesses cost the same in any script.
+WORD_LANGUAGE = None
+WORD_ENCODING = "utf-8-sig"  # UTF-8, with or without a byte order mark
+
+# Word files mixed together for "Play" (None plays words.csv alone), each as
+# (file, weight). A word in a later file replaces the same word in the files
+# before it, and a weight of 2 makes each of a file's words twice as likely to
+# come up. Catalog source only, without NO_REPEATS. For example:
+# WORD_LAYERS = (("words.csv", 1), ("custom_words.csv", 1), ("team_words.csv", 2))
+WORD_LAYERS = None
+
+# Set to True to play every word of a difficulty once before any word comes up
+# again (catalog source only; the order is saved in a .bag file next to the word
+# file, and words are picked at random when that file cannot be written)
+NO_REPEATS = False
+
+# Replace the CSV hint with the most useful letter to guess next (needs numpy)
+SMART_HINTS = False
+
+# Suggest a difficulty level for new custom words, from how hard they are to
+# guess compared with the default words (needs numpy)
+SUGGEST_DIFFICULTY = True
+
+# Set to True (or start the game with --marathon) to play rounds back to back
+# at one difficulty with a running score, instead of one game at a time
+MARATHON_MODE = False
+
+# Set to True (or start the game with --adaptive) to skip the difficulty question:
+# each word is picked so the player should solve it about ADAPTIVE_TARGET of the
+# time, from how they have been doing lately
+ADAPTIVE_MODE = False
+ADAPTIVE_TARGET = 0.6
+
+# Finished games are saved to this SQLite leaderboard (None to turn it off).
+# See the scores with: python leaderboard.py top --difficulty EASY
+LEADERBOARD_FILE = "leaderboard.db"
+
+# Every guess of every game is also written to this binary log (None to turn it off),
+# to replay games from bug reports or re-score them when the scoring rules change.
+# Re-score with: python game_log.py games.hlog --hit-points 10 --miss-points 5
+GAME_LOG_FILE = None
+
+# Seconds between background checks for edits to the word files (catalog source
+# only). Changed and added words show up from the next round without a restart,
+# and picking a word never waits for a file to be read. None checks the files
+# every time a word is picked instead.
+WATCH_INTERVAL = 1.0
+
+# Seed for the random choices of a run (None for a new seed each run). The seed
+# is written to the game log with every game; start with --seed N to play a run
+# again with the same words.
+RANDOM_SEED = None
+
+# Set once the word lists are being loaded in the background
+words_warming_up = False
+
+# Random number stream of this run, made on first use (see get_session_rng)
+session_rng = None
 
 # Function to read the default word list from CSV file
 def get_word_list():
+    import csv
+    
     word_list = []
     try:
         with open("words.csv", "r") as file:
@@ -18,6 +98,8 @@ def get_word_list():
 
 # Function to read custom words added by the user
 def get_custom_word_list():
+    import csv
+    
     word_list = []
     try:
         with open("custom_words.csv", "r") as file:
@@ -35,30 +117,154 @@ def get_custom_word_list():
         return []
     return word_list
 
+# Function to pick a random word and hint from a word file using one of the
+# WORD_SOURCE strategies (raises FileNotFoundError if there are no words to read).
+# Random choices come from rng (the run's stream by default).
+def pick_word(filename, difficulty, source, rng=None):
+    if rng is None:
+        rng = get_session_rng()
+    
+    if source == "stream":
+        # Read the file row by row and keep a single random match
+        from word_stream import sample_word
+        return sample_word(filename, difficulty, rng)
+    
+    if source == "language":
+        # Every word's spelling is worked out once, when the file is loaded
+        from word_language import get_language_pack
+        words = get_language_pack(filename, WORD_LANGUAGE, WORD_ENCODING)
+        if words.missing:
+            raise FileNotFoundError(filename)
+    elif source == "pack":
+        # The pack is compiled from the CSV when needed and read through a memory map
+        from word_pack import WordPackError, get_pack
+        try:
+            words = get_pack(filename)
+        except WordPackError as error:
+            print("Error:", error)
+            return None, None
+        if words is None:
+            raise FileNotFoundError(filename)
+    else:
+        # The catalog is loaded once and only re-read when the file changes
+        # (appended rows are read on their own)
+        from word_catalog import get_catalog
+        words = get_catalog(filename)
+        if words.missing:
+            raise FileNotFoundError(filename)
+        if NO_REPEATS:
+            # Draw the next word from the shuffled bag for this file and difficulty
+            from word_bag import draw_word
+            return draw_word(words, difficulty, rng)
+    
+    # Select a random word from the words with the requested difficulty
+    return words.random_word(difficulty, rng)
+
+# Function to pick a random word and hint from all the files in WORD_LAYERS at once
+def pick_layered_word(difficulty, rng=None):
+    if rng is None:
+        rng = get_session_rng()
+    from word_layers import get_layered_catalog
+    words = get_layered_catalog(WORD_LAYERS)
+    if words.missing:
+        raise FileNotFoundError(WORD_LAYERS[0][0])
+    return words.random_word(difficulty, rng)
+
+# Function to get the random number stream of this run
+def get_session_rng():
+    global session_rng
+    if session_rng is None:
+        from seeding import SessionRandom
+        session_rng = SessionRandom(RANDOM_SEED)
+    return session_rng
+
+# Function to load the word lists ahead of the first round, so choosing
+# "Play" does not wait for a large file to be parsed
+def load_words(source=None):
+    if source is None:
+        source = WORD_SOURCE
+    for filename in ("words.csv", "custom_words.csv"):
+        try:
+            if source == "pack":
+                from word_pack import get_pack
+                get_pack(filename)
+            elif source == "language":
+                from word_language import get_language_pack
+                get_language_pack(filename, WORD_LANGUAGE, WORD_ENCODING)
+            elif source != "stream":  # Streaming keeps nothing in memory
+                from word_catalog import get_catalog
+                get_catalog(filename)
+        except Exception:
+            pass  # The error is reported when a word is actually needed
+    if source == "catalog" and WORD_LAYERS is not None:
+        try:
+            from word_layers import get_layered_catalog
+            get_layered_catalog(WORD_LAYERS)
+        except Exception:
+            pass  # The error is reported when a word is actually needed
+    if source == "catalog" and WATCH_INTERVAL is not None:
+        # Keep the loaded word lists up to date from here on
+        from word_catalog import watch_word_files
+        watch_word_files(WATCH_INTERVAL)
+    if LEADERBOARD_FILE is not None:
+        # Open the leaderboard now, so the end of the first game does not wait for it
+        from leaderboard import get_leaderboard
+        get_leaderboard(LEADERBOARD_FILE)
+
+# Function to start loading the word lists in a background thread (only once).
+# _thread is built into the interpreter, so unlike threading it takes no time to
+# import before the menu prompt appears. Its threads end when the game exits.
+def warm_up_words():
+    global words_warming_up
+    if not words_warming_up:
+        import _thread
+        _thread.start_new_thread(load_words, ())
+        words_warming_up = True
+
 # Function to retrieve a random word with its hint based on difficulty level
-def get_word_with_hint(difficulty, is_custom=False):
+def get_word_with_hint(difficulty, is_custom=False, source=None, rng=None):
     # Select which word list to use based on user preference
     if is_custom:
-        all_words = get_custom_word_list()
+        filename = "custom_words.csv"
     else:
-        all_words = get_word_list()
+        filename = "words.csv"
     
-    if not all_words:
-        return None, None
+    if source is None:
+        source = WORD_SOURCE
     
-    # Filter the word list to match requested difficulty
-    filtered_words = []
-    for word_data in all_words:
-        if word_data["difficulty"] == difficulty:
-            filtered_words.append(word_data)
+    metrics = get_metrics()
+    if metrics.enabled:
+        start = time.perf_counter()
     
-    # Handle case where no words match the difficulty
-    if not filtered_words:
+    try:
+        if WORD_LAYERS is not None and not is_custom and source == "catalog":
+            word, hint = pick_layered_word(difficulty, rng)
+        else:
+            word, hint = pick_word(filename, difficulty, source, rng)
+    except FileNotFoundError:
+        if is_custom:
+            get_custom_word_list()  # Creates the custom words file
+        else:
+            print("Error: words.csv file not found.")
+        return None, None
+    except UnicodeDecodeError:
+        print(f"Error: {filename} is not in the {WORD_ENCODING} encoding.")
         return None, None
     
-    # Select a random word from the filtered list
-    word_data = random.choice(filtered_words)
-    return word_data["word"].upper(), word_data["hint"]
+    if metrics.enabled:
+        metrics.observe("hangman_word_selection_seconds", time.perf_counter() - start)
+        if word is not None:
+            metrics.inc("hangman_words_selected_total", label=("difficulty", difficulty))
+    return word, hint
+
+# Function to get how a word's letters match guesses when the word file has
+# already worked it out (None to work it out when the game starts)
+def get_spelling(word, is_custom=False):
+    if WORD_SOURCE != "language":
+        return None
+    from word_language import get_language_pack
+    filename = "custom_words.csv" if is_custom else "words.csv"
+    return get_language_pack(filename, WORD_LANGUAGE, WORD_ENCODING).spelling(word)
 
 # Function to allow users to add their own custom words
 def add_custom_word():
@@ -69,7 +275,18 @@ def add_custom_word():
         print("Word cannot be empty.")
         return False
     
+    # Words are compared ignoring case, so "Hello" and "hello" are the same word
+    from custom_store import get_custom_store
+    store = get_custom_store()
+    store.refresh()
+    if store.contains(word):
+        print(f"Word '{word}' is already in your custom words.")
+        return False
+    
     # Difficulty selection menu
+    suggestion = get_suggested_difficulty(word)
+    if suggestion is not None:
+        print(f"Suggested difficulty: {suggestion.title()} ({suggestion[0]})")
     print("Select difficulty level:")
     print("(E) Easy")
     print("(M) Medium")
@@ -90,243 +307,291 @@ def add_custom_word():
     
     hint = input("Enter a hint for the word: ").strip()
     
-    # Append the new word to custom_words.csv
-    with open("custom_words.csv", "a", newline="") as file:
-        writer = csv.writer(file)
-        writer.writerow([word, difficulty, hint])
+    # Append the new word to custom_words.csv (under a lock shared with other processes)
+    metrics = get_metrics()
+    if metrics.enabled:
+        start = time.perf_counter()
+    added = store.add(word, difficulty, hint) and store.commit()
+    if metrics.enabled:
+        metrics.observe("hangman_add_custom_word_seconds", time.perf_counter() - start)
+    if not added:
+        print(f"Word '{word}' is already in your custom words.")
+        return False
+    metrics.inc("hangman_custom_words_added_total")
+    
+    # Read the new row now, so the next round can pick the word without waiting for the watcher
+    if WORD_SOURCE == "catalog":
+        from word_catalog import get_catalog
+        get_catalog("custom_words.csv").refresh()
     
     print(f"Word '{word}' added successfully!")
     return True
 
+# Function to suggest a difficulty level for a word, returns None if not available
+def get_suggested_difficulty(word):
+    if not SUGGEST_DIFFICULTY:
+        return None
+    try:
+        from difficulty import suggest_difficulty
+    except ImportError:
+        return None
+    return suggest_difficulty(word, "words.csv")
+
 # Helper function to display the current game state
 def display_progress(word_completion, guessed_letters):
-    print("Guessed letters: ", " ".join(guessed_letters))
-    print("Current word: ", word_completion)
-
-# Main gameplay function
-def play(word, hint, score=100):
-    word_completion = "_" * len(word)  # Initialize with underscores for each letter
-    guessed = False
-    guessed_letters = []
-    guessed_words = []
-    remaining_attempts = 6  # Player has 6 incorrect guesses before losing
-    wrong_guesses = 0
-    hint_shown = False
+    print(progress_text(word_completion, guessed_letters))
+
+# Function to set up smart hints for a word, returns None if they are not available
+def get_smart_candidates(word, is_custom=False):
+    try:
+        from solver import get_solver
+    except ImportError:
+        return None
+    from word_catalog import get_catalog
+    filename = "custom_words.csv" if is_custom else "words.csv"
+    if WORD_LAYERS is not None and not is_custom and WORD_SOURCE == "catalog":
+        # Guess from the words of the file the word came from
+        from word_layers import get_layered_catalog
+        filename = get_layered_catalog(WORD_LAYERS).layer_of(word) or filename
+    catalog = get_catalog(filename)
+    return get_solver(catalog).candidates(len(word))
+
+# Main gameplay function (recorder is an optional game_log.GameLog)
+def play(word, hint, score=100, candidates=None, quiet=False, recorder=None, difficulty=None):
+    return play_round(HangmanGame(word, hint, score=score), candidates, quiet, recorder, difficulty)
+
+# Terminal front-end for one game: reads guesses and prints the game state.
+# With candidates from the solver, the hint suggests a letter instead.
+# Each turn is written to the terminal in one go; with quiet=True the hangman
+# and progress are not drawn at all (for headless runs).
+# With a recorder, every guess and hint is added to the game log.
+def play_round(game, candidates=None, quiet=False, recorder=None, difficulty=None):
+    metrics = get_metrics()
+    metrics.inc("hangman_games_started_total")
+    recording = recorder.start_game(game, difficulty) if recorder is not None else None
     
     # Display initial game state
-    print(display_hangman(remaining_attempts))
-    display_progress(word_completion, guessed_letters)
-    print("\n")
+    if not quiet:
+        sys.stdout.write(turn_text(game))
     
     # Main game loop
-    while not guessed and remaining_attempts > 0:
+    while not game.is_over:
         # Offer hint after 3 wrong guesses
-        if wrong_guesses >= 3 and not hint_shown:
-            hint_choice = input("Would you like a hint? (Y/N): ").upper()
+        if game.hint_available:
+            metrics.inc("hangman_hints_offered_total")
+            hint_choice = input(HINT_PROMPT).upper()
             if hint_choice == "Y":
+                metrics.inc("hangman_hints_taken_total")
+                hint = game.take_hint()
+                if recording is not None:
+                    recording.hint()
+                if candidates is not None:
+                    candidates.update(game.word_completion, game.guessed_letters)
+                    letter = candidates.best_letter(game.guessed_letters)
+                    if letter is not None:
+                        hint = "Try the letter " + letter
                 print("Hint:", hint)
-                hint_shown = True
         
         # Get the player's guess
-        guess = input("Please guess a letter or word: ").upper()
-        
-        # Process a single letter guess
-        if len(guess) == 1 and guess.isalpha():
-            if guess in guessed_letters:
-                print("You already guessed the letter", guess)
-            elif guess not in word:
-                print(guess, "is not in the word.")
-                remaining_attempts -= 1
-                wrong_guesses += 1
-                score -= 10  # Penalty for wrong guess
-                guessed_letters.append(guess)
-            else:
-                print("Good job,", guess, "is in the word!")
-                guessed_letters.append(guess)
-                
-                # Update the word completion display
-                word_as_list = list(word_completion)
-                indices = [i for i, letter in enumerate(word) if letter == guess]
-                for index in indices:
-                    word_as_list[index] = guess
-                word_completion = "".join(word_as_list)
-                score += 10  # Reward for correct guess
-                
-                # Check if the word is complete
-                if "_" not in word_completion:
-                    guessed = True
-        
-        # Process a full word guess
-        elif len(guess) == len(word) and guess.isalpha():
-            if guess in guessed_words:
-                print("You already guessed the word", guess)
-            elif guess != word:
-                print(guess, "is not the word.")
-                remaining_attempts -= 1
-                wrong_guesses += 1
-                score -= 10  # Penalty for wrong guess
-                guessed_words.append(guess)
-            else:
-                guessed = True
-                word_completion = word
-                score += 10  # Reward for correct guess
+        guess = input(GUESS_PROMPT).upper()
+        if metrics.enabled:
+            start = time.perf_counter()
+            result = game.guess(guess)
+            metrics.observe("hangman_guess_seconds", time.perf_counter() - start)
+            metrics.inc("hangman_guesses_total")
+            if result == WRONG_LETTER or result == WRONG_WORD:
+                metrics.inc("hangman_wrong_guesses_total")
         else:
-            print("Not a valid guess.")
+            result = game.guess(guess)
+        if recording is not None:
+            recording.guess(guess, result)
+        message = guess_message(result, guess)
         
         # Update display after each guess
-        print(display_hangman(remaining_attempts))
-        display_progress(word_completion, guessed_letters)
-        print("\n")
+        if not quiet:
+            sys.stdout.write(turn_text(game, message))
+        elif message is not None:
+            print(message)
     
     # Display end-game message
-    if guessed:
-        print("Congrats, you guessed the word! You win! Your score is:", score)
+    print(end_message(game))
+    if recording is not None:
+        recording.finish(game)
+    if game.won:
+        metrics.inc("hangman_games_won_total")
     else:
-        print("Sorry, you ran out of attempts. The word was " + word + ". Maybe next time! Your score is:", score)
+        metrics.inc("hangman_games_lost_total")
     
-    return score
+    return game.score
 
 # Function to display the hangman figure based on remaining attempts
 def display_hangman(remaining_attempts):
-    stages = [  # Array of hangman drawing stages
-                # final state: head, torso, both arms, and both legs (0 attempts left)
-                """
-                   --------
-                   |      |
-                   |      O
-                   |     \\|/
-                   |      |
-                   |     / \\
-                   -
-                """,
-                # head, torso, both arms, and one leg (1 attempt left)
-                """
-                   --------
-                   |      |
-                   |      O
-                   |     \\|/
-                   |      |
-                   |     /
-                   -
-                """,
-                # head, torso, and both arms (2 attempts left)
-                """
-                   --------
-                   |      |
-                   |      O
-                   |     \\|/
-                   |      |
-                   |
-                   -
-                """,
-                # head, torso, and one arm (3 attempts left)
-                """
-                   --------
-                   |      |
-                   |      O
-                   |     \\|
-                   |      |
-                   |
-                   -
-                """,
-                # head and torso (4 attempts left)
-                """
-                   --------
-                   |      |
-                   |      O
-                   |      |
-                   |      |
-                   |
-                   -
-                """,
-                # head only (5 attempts left)
-                """
-                   --------
-                   |      |
-                   |      O
-                   |
-                   |
-                   |
-                   -
-                """,
-                # initial empty state (6 attempts left)
-                """
-                   --------
-                   |      |
-                   |
-                   |
-                   |
-                   |
-                   -
-                """
-    ]
-    return stages[remaining_attempts]
+    return HANGMAN_STAGES[remaining_attempts]
 
 # Function to set up and start a game session
 def play_game(is_custom=False):
-    score = 100  # Initialize starting score
-    
-    # Game settings menu
-    print("\n===== Game Settings =====")
-    difficulty = input("Select difficulty level: Easy (E), Medium (M), Hard (H): ").upper()
-    while difficulty not in ["E", "M", "H"]:
-        difficulty = input("Invalid choice. Please select difficulty level: Easy (E), Medium (M), Hard (H): ").upper()
+    # Rounds are played in a loop, so "Play Again" does not go deeper into the stack
+    while True:
+        score = 100  # Initialize starting score
+        
+        # In adaptive mode the word is picked for the player, with no settings to choose
+        if ADAPTIVE_MODE:
+            word, hint, csv_difficulty = get_adaptive_word(is_custom)
+            if word is None:
+                if is_custom:
+                    print("No words found in custom words list.")
+                else:
+                    print("No words found in the default word list.")
+                return False
+        else:
+            # Game settings menu
+            print("\n===== Game Settings =====")
+            csv_difficulty = choose_difficulty()
+            
+            # Get a word based on the selected difficulty and word list
+            word, hint = get_word_with_hint(csv_difficulty, is_custom)
+        
+        # Handle case where no words match the criteria
+        if word is None:
+            if is_custom:
+                print(f"No {csv_difficulty} words found in custom words list.")
+                return False
+            else:
+                print(f"No {csv_difficulty} words found in the default word list.")
+                return False
+        
+        # Start the game with the selected word
+        candidates = None
+        if SMART_HINTS:
+            candidates = get_smart_candidates(word, is_custom)
+        game = HangmanGame(word, hint, score=score, spelling=get_spelling(word, is_custom))
+        start = time.perf_counter()
+        score = play_round(game, candidates, recorder=get_game_recorder(), difficulty=csv_difficulty)
+        record_game(game, csv_difficulty, time.perf_counter() - start)
+        if ADAPTIVE_MODE:
+            record_adaptive_result(game, csv_difficulty, is_custom)
+        
+        # Ask if player wants to play again
+        play_again = input(PLAY_AGAIN_PROMPT).upper()
+        if play_again != "Y":
+            return True
+
+# Function to get the matchmaker for adaptive mode (built on first use)
+def get_matchmaker(is_custom=False):
+    from matchmaking import get_matchmaker
+    return get_matchmaker("custom_words.csv" if is_custom else "words.csv", LEADERBOARD_FILE)
+
+# Function to pick a word for the player in adaptive mode: (word, hint, difficulty)
+def get_adaptive_word(is_custom=False):
+    from leaderboard import default_player
+    matchmaker = get_matchmaker(is_custom)
+    player = default_player()
+    word, hint, difficulty = matchmaker.next_word(player, ADAPTIVE_TARGET, get_session_rng())
+    if word is not None:
+        print(adaptive_message(difficulty, matchmaker.predicted(player, word, difficulty)))
+    return word, hint, difficulty
+
+# Function to update the player's skill and the word's rating after an adaptive round
+def record_adaptive_result(game, difficulty, is_custom=False):
+    from leaderboard import default_player
+    get_matchmaker(is_custom).record(default_player(), game.word, difficulty, game.won)
+
+# Function to save a finished game to the leaderboard (written in the background,
+# so the player never waits for it)
+def record_game(game, difficulty, seconds):
+    if LEADERBOARD_FILE is not None:
+        from leaderboard import default_player, get_leaderboard
+        get_leaderboard(LEADERBOARD_FILE).record(default_player(), game.word, difficulty, game.score,
+                                                 game.guess_count, seconds, game.won)
+
+# Function to get the game log that rounds are recorded to (None if it is turned off)
+def get_game_recorder():
+    if GAME_LOG_FILE is None:
+        return None
+    from game_log import get_game_log
+    log = get_game_log(GAME_LOG_FILE)
+    log.seed = get_session_rng().session_seed  # Recorded with each game, to replay the run
+    return log
+
+# Function to ask for a difficulty level and return its name in the word files
+def choose_difficulty():
+    difficulty = input(DIFFICULTY_PROMPT).upper()
+    while difficulty not in DIFFICULTY_NAMES:
+        difficulty = input(DIFFICULTY_RETRY_PROMPT).upper()
     
     # Convert single-letter input to full difficulty name
-    if difficulty == "E":
-        csv_difficulty = "EASY"
-    elif difficulty == "M":
-        csv_difficulty = "MEDIUM"
-    else:
-        csv_difficulty = "HARD"
-    
-    # Get a word based on the selected difficulty and word list
-    word, hint = get_word_with_hint(csv_difficulty, is_custom)
+    return DIFFICULTY_NAMES[difficulty]
+
+# Function to play rounds back to back at one difficulty, keeping a running score
+# and win streak. Nothing is kept from a finished round except the totals, so a
+# marathon can go on for any number of rounds.
+def play_marathon(is_custom=False, quiet=False):
+    print("\n===== Marathon Settings =====")
+    csv_difficulty = choose_difficulty()
     
-    # Handle case where no words match the criteria
-    if word is None:
-        if is_custom:
-            print(f"No {csv_difficulty} words found in custom words list.")
-            return False
+    rounds = 0
+    total_score = 0
+    streak = 0
+    best_streak = 0
+    while True:
+        # The word list stays loaded between rounds (it is only re-read if the file changes)
+        word, hint = get_word_with_hint(csv_difficulty, is_custom)
+        if word is None:
+            if is_custom:
+                print(f"No {csv_difficulty} words found in custom words list.")
+            else:
+                print(f"No {csv_difficulty} words found in the default word list.")
+            break
+        
+        candidates = None
+        if SMART_HINTS:
+            candidates = get_smart_candidates(word, is_custom)
+        game = HangmanGame(word, hint, spelling=get_spelling(word, is_custom))
+        start = time.perf_counter()
+        total_score += play_round(game, candidates, quiet, get_game_recorder(), csv_difficulty)
+        record_game(game, csv_difficulty, time.perf_counter() - start)
+        rounds += 1
+        
+        # Update the win streak
+        if game.won:
+            streak += 1
+            best_streak = max(best_streak, streak)
         else:
-            print(f"No {csv_difficulty} words found in the default word list.")
-            return False
-    
-    # Start the game with the selected word
-    score = play(word, hint, score=score)
+            streak = 0
+        print(marathon_status(rounds, total_score, streak, best_streak))
+        
+        if input(MARATHON_PROMPT).upper() != "Y":
+            break
     
-    # Ask if player wants to play again
-    play_again = input("Play Again? (Y/N) ").upper()
-    if play_again == "Y":
-        return play_game(is_custom)
-    else:
-        return True
+    print(marathon_end_message(rounds, total_score, best_streak))
+    return rounds > 0
 
 # Function to display the main menu
 def display_menu():
-    print("\n=========================")
-    print("     HANGMAN MENU       ")
-    print("=========================")
-    print("(1) Play")
-    print("(2) Play with Custom Words")
-    print("(3) Add to Custom Words")
-    print("(4) Exit")
-    print("=========================")
-    menu_choice = input("Enter your choice (1-4): ")
+    print(MENU_TEXT)
+    warm_up_words()  # Load the words while the player reads the menu
+    menu_choice = input(MENU_PROMPT)
     return menu_choice
 
 # Main function that runs the game
 def main():
+    enable_from_environment()  # Metrics are only collected when HANGMAN_METRICS is set
     print("Welcome to Hangman!")
     
+    # Marathon mode replaces the usual one-game-at-a-time play
+    if MARATHON_MODE:
+        play_rounds = play_marathon
+    else:
+        play_rounds = play_game
+    
     # Main program loop
     while True:
         menu_choice = display_menu()
         
         if menu_choice == "1":
-            play_game(is_custom=False)  # Play with default words
+            play_rounds(is_custom=False)  # Play with default words
         elif menu_choice == "2":
-            result = play_game(is_custom=True)  # Play with custom words
+            result = play_rounds(is_custom=True)  # Play with custom words
             if not result:
                 print("Returning to menu...")
         elif menu_choice == "3":
@@ -339,4 +604,10 @@ def main():
 
 # Program entry point
 if __name__ == "__main__":
+    if "--marathon" in sys.argv[1:]:
+        MARATHON_MODE = True
+    if "--adaptive" in sys.argv[1:]:
+        ADAPTIVE_MODE = True
+    if "--seed" in sys.argv[1:-1]:
+        RANDOM_SEED = int(sys.argv[sys.argv.index("--seed") + 1])
     main()
\ No newline at end of file
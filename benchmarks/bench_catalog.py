@@ -0,0 +1,62 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import format_seconds, load_game, write_word_file
+
+# Round-start cost of get_word_with_hint() for growing word files.
+# Run from the repository root: python -m benchmarks.bench_catalog
+
+
+# Time the old approach: parse the whole file and filter it on every round
+def time_full_parse(game, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        filtered = [w for w in game.get_word_list() if w["difficulty"] == "MEDIUM"]
+        random.choice(filtered)
+    return (time.perf_counter() - start) / rounds
+
+
+# Time the cached catalog (first load is reported separately)
+def time_catalog(game, rounds):
+    start = time.perf_counter()
+    game.get_word_with_hint("MEDIUM")
+    first = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        game.get_word_with_hint("MEDIUM")
+    return first, (time.perf_counter() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark word selection per round.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10000, 100000, 1000000])
+    parser.add_argument("--rounds", type=int, default=1000)
+    parser.add_argument("--full-parse-limit", type=int, default=100000,
+                        help="skip the full-parse timing above this many rows")
+    args = parser.parse_args()
+
+    game = load_game()
+    original_dir = os.getcwd()
+    print("%10s %14s %16s %16s" % ("rows", "first load", "catalog/round", "full parse/round"))
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            for size in args.sizes:
+                write_word_file("words.csv", size)
+                first, per_round = time_catalog(game, args.rounds)
+                if size <= args.full_parse_limit:
+                    full = format_seconds(time_full_parse(game, max(1, args.rounds // 100)))
+                else:
+                    full = "skipped"
+                print("%10d %14s %16s %16s" % (size, format_seconds(first),
+                                               format_seconds(per_round), full))
+        finally:
+            os.chdir(original_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.common import format_seconds, write_word_file
+from difficulty import analyze
+
+# Time to score a word file from scratch, again with nothing changed, and after
+# rows are appended (only the new rows are parsed; the corpus pass is redone).
+# Run from the repository root: python -m benchmarks.bench_difficulty
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the difficulty analyzer.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--append", type=int, default=1000, help="rows appended before the last run")
+    args = parser.parse_args()
+
+    print("%10s %12s %12s %12s %12s" % ("rows", "no cache", "cold", "unchanged", "appended"))
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "words.csv")
+        extra = os.path.join(directory, "extra.csv")
+        for rows in args.sizes:
+            write_word_file(filename, rows)
+            no_cache = timed(analyze, filename, use_cache=False)
+            cold = timed(analyze, filename)
+            unchanged = timed(analyze, filename)
+
+            write_word_file(extra, args.append, seed=rows)
+            with open(extra) as source, open(filename, "a") as target:
+                next(source)  # Header
+                target.write(source.read())
+            appended = timed(analyze, filename)
+            os.remove(filename + ".difficulty.npz")
+            print("%10d %12s %12s %12s %12s" % (rows, format_seconds(no_cache), format_seconds(cold),
+                                                format_seconds(unchanged), format_seconds(appended)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import format_seconds, write_word_file
+from game_log import GameLog, read_games, replay, rescore
+from game_engine import HangmanGame
+from simulator import random_letters
+from word_catalog import DIFFICULTY_LEVELS, get_catalog
+
+# Size of the game log and how fast it is read back: re-scoring every game with
+# new points (from the recorded hit/miss flags) and replaying every guess through
+# HangmanGame. Games are played by the simulator's random-letter strategy, with
+# an occasional whole-word guess, and recorded as the terminal game records them.
+# Run from the repository root: python -m benchmarks.bench_game_log --games 1000000
+
+# Events per second each pass should reach. Reading and re-scoring reach the
+# millions asked for. A replay runs every guess through HangmanGame.guess(),
+# about a microsecond each, so it stays well under a million events per second.
+TARGETS = {
+    "read": 1000000,
+    "read + rescore (+10/-5)": 1000000,
+    "read + replay (+10/-5)": 400000,
+}
+
+
+# Function to play and record a number of games
+def record_games(log, catalog, games, seed=0):
+    rng = random.Random(seed)
+    for _ in range(games):
+        difficulty = DIFFICULTY_LEVELS[rng.randrange(3)]
+        word, hint = catalog.random_word(difficulty, rng)
+        game = HangmanGame(word, hint)
+        recording = log.start_game(game, difficulty)
+        for guess in random_letters(game, rng, catalog):
+            if game.hint_available:
+                game.take_hint()
+                recording.hint()
+            if rng.random() < 0.05:
+                guess = word if rng.random() < 0.5 else word[::-1]
+            recording.guess(guess, game.guess(guess))
+            if game.is_over:
+                break
+        recording.finish(game)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the game log.")
+    parser.add_argument("--games", type=int, default=200000)
+    parser.add_argument("--words", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        words = os.path.join(directory, "words.csv")
+        write_word_file(words, args.words)
+        filename = os.path.join(directory, "games.hlog")
+
+        log = GameLog(filename, autoflush=False)
+        start = time.perf_counter()
+        record_games(log, get_catalog(words), args.games)
+        log.close()
+        recorded = time.perf_counter() - start
+
+        games = list(read_games(filename))
+        events = sum(len(game.codes) for game in games)
+        size = os.path.getsize(filename)
+        print("%d games, %d events, %.1f MB (%.2f bytes per event)" % (
+            len(games), events, size / 1e6, size / events))
+        print("Playing and recording: %s per game" % format_seconds(recorded / len(games)))
+
+        mismatched = sum(rescore(game) != game.score for game in games)
+        print("Re-scored with the recorded rules: %d games differ from the recorded score" % mismatched)
+
+        print("\n%-28s %12s %16s %12s" % ("pass", "time", "events/s", "target"))
+        passes = [
+            ("read", lambda: sum(1 for _ in read_games(filename))),
+            ("read + rescore (+10/-5)", lambda: sum(rescore(game, 10, 5) for game in read_games(filename))),
+            ("read + replay (+10/-5)", lambda: sum(replay(game, 10, 5, spellings)[0].score
+                                                   for game in read_games(filename))),
+        ]
+        for name, run in passes:
+            spellings = {}
+            start = time.perf_counter()
+            run()
+            seconds = time.perf_counter() - start
+            rate = events / seconds
+            print("%-28s %12s %16.0f %12d%s" % (name, format_seconds(seconds), rate, TARGETS[name],
+                                                "" if rate >= TARGETS[name] else "  (below target)"))
+
+        spellings = {}
+        changed = sum(replay(game, 10, 5, spellings)[0].score != rescore(game, 10, 5) for game in games)
+        print("\nReplay and rescore disagree on %d games" % changed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+import unicodedata
+
+from benchmarks.common import format_seconds
+from game_engine import HangmanGame
+from word_catalog import DIFFICULTY_LEVELS
+from word_language import LanguagePack
+
+# Words in other languages and scripts: loading a language pack (every word's
+# spelling worked out once) and the cost of a letter guess against it (starting
+# the game included), compared with casefolding and taking the accents off the
+# guess and the word's letters on every guess. The CJK alphabet has thousands
+# of letters, so a game there guesses many letters that are not in the word.
+# Run from the repository root: python -m benchmarks.bench_language
+
+ALPHABETS = {
+    "french": "abcdeéèêfghiîjklmnoôpqrstuùûvwxyzàâçë",
+    "greek": "αβγδεζηθικλμνξοπρστυφχψωάέήίόύώ",
+    "cjk": "".join(chr(code) for code in range(0x4E00, 0x4E00 + 3000)),
+}
+
+
+# Function to write a pack of random words in an alphabet
+def write_language_file(filename, alphabet, rows, seed=0):
+    rng = random.Random(seed)
+    with open(filename, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        for number in range(rows):
+            word = "".join(rng.choice(alphabet) for _ in range(rng.randint(3, 12)))
+            writer.writerow([word, DIFFICULTY_LEVELS[number % 3], "hint %d" % number])
+
+
+# Function to match a guess by normalizing it and the word on every guess
+def normalized_positions(word, guess):
+    def fold(text):
+        text = unicodedata.normalize("NFD", text.casefold())
+        return "".join(char for char in text if not unicodedata.combining(char))
+    key = fold(guess)
+    return [index for index, char in enumerate(word) if fold(char) == key]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark language packs.")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--guesses", type=int, default=20, help="letter guesses in each game")
+    args = parser.parse_args()
+
+    print("%8s %10s %14s %14s" % ("script", "load", "guess (table)", "normalizing"))
+    with tempfile.TemporaryDirectory() as directory:
+        for name, alphabet in ALPHABETS.items():
+            filename = os.path.join(directory, name + ".csv")
+            write_language_file(filename, alphabet, args.rows)
+            pack = LanguagePack(filename)
+            start = time.perf_counter()
+            pack.refresh()
+            loaded = time.perf_counter() - start
+
+            rng = random.Random(0)
+            games = []
+            for _ in range(args.games):
+                word, _ = pack.random_word("EASY", rng)
+                guesses = [rng.choice(alphabet).upper() for _ in range(args.guesses)]
+                games.append((word, guesses))
+
+            start = time.perf_counter()
+            for word, guesses in games:
+                guess = HangmanGame(word, "", spelling=pack.spelling(word)).guess
+                for letter in guesses:
+                    guess(letter)
+            table = time.perf_counter() - start
+            start = time.perf_counter()
+            for word, guesses in games:
+                for letter in guesses:
+                    normalized_positions(word, letter)
+            normalizing = time.perf_counter() - start
+            total = args.games * args.guesses
+            print("%8s %10s %14s %14s" % (name, format_seconds(loaded), format_seconds(table / total),
+                                           format_seconds(normalizing / total)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.common import format_seconds, write_word_file
+from word_catalog import get_catalog
+from word_layers import LayeredCatalog
+
+# Layered word files: indexing a large default word file, putting a pack on top
+# of it (only the pack is indexed, whatever the size of the layers below) and
+# picking words from the union, against merging every file into one new list
+# of rows, which has to be rebuilt whenever a pack is added.
+# Run from the repository root: python -m benchmarks.bench_layers
+
+
+# Function to write a pack with some of the base words (which it shadows) and new ones
+def write_pack(filename, base, rows, shadowed, seed):
+    rng = random.Random(seed)
+    words = [word for group in get_catalog(base).words.values() for word in group]
+    with open(filename, "w", newline="") as file:
+        writer = csv.writer(file)
+        for number in range(rows):
+            if number < shadowed:
+                word = rng.choice(words).lower()
+            else:
+                word = "pack%dword%d" % (seed, number)
+            writer.writerow([word, "EASY", "pack hint %d" % number])
+
+
+# Function to merge layers into a single list of rows per difficulty (the last copy of a word wins)
+def merge_copies(filenames):
+    merged = {}
+    for filename in filenames:
+        catalog = get_catalog(filename)
+        for difficulty, words in catalog.words.items():
+            for word, hint in zip(words, catalog.hints[difficulty]):
+                merged[word] = (difficulty, hint)
+    groups = {}
+    for word, (difficulty, hint) in merged.items():
+        groups.setdefault(difficulty, []).append((word, hint))
+    return groups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark layered word files.")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--pack", type=int, default=10000, help="rows in each pack")
+    parser.add_argument("--shadowed", type=int, default=1000, help="pack rows replacing a base word")
+    parser.add_argument("--packs", type=int, default=3)
+    parser.add_argument("--picks", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        base = os.path.join(directory, "words.csv")
+        write_word_file(base, args.rows)
+        get_catalog(base)
+        packs = []
+        for number in range(args.packs):
+            pack = os.path.join(directory, "pack%d.csv" % number)
+            write_pack(pack, base, args.pack, args.shadowed, number)
+            get_catalog(pack)
+            packs.append(pack)
+
+        start = time.perf_counter()
+        layers = LayeredCatalog([(base, 1)])
+        print("Indexing %d base rows: %s" % (args.rows, format_seconds(time.perf_counter() - start)))
+        for number, pack in enumerate(packs):
+            start = time.perf_counter()
+            layers.add_layer(pack, 2)
+            added = time.perf_counter() - start
+            start = time.perf_counter()
+            merge_copies([base] + packs[:number + 1])
+            merged = time.perf_counter() - start
+            print("Adding pack %d (%d rows): %s, merging copies of every row: %s" % (
+                number + 1, args.pack, format_seconds(added), format_seconds(merged)))
+
+        rng = random.Random(0)
+        start = time.perf_counter()
+        for _ in range(args.picks):
+            layers.random_word("EASY", rng)
+        picked = (time.perf_counter() - start) / args.picks
+        catalog = get_catalog(base)
+        start = time.perf_counter()
+        for _ in range(args.picks):
+            catalog.random_word("EASY", rng)
+        single = (time.perf_counter() - start) / args.picks
+        print("Picking a word: %s across %d layers, %s from one file" % (
+            format_seconds(picked), len(layers.layers), format_seconds(single)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from benchmarks.common import format_seconds
+from leaderboard import INSERT, Leaderboard, connect, day_of
+from word_catalog import DIFFICULTY_LEVELS
+
+# Leaderboard query times and end-of-game recording latency on a database
+# filled with synthetic games spread over a year and many players.
+# Run from the repository root: python -m benchmarks.bench_leaderboard --games 10000000
+
+DAY = 24 * 60 * 60
+
+
+# Function to fill a new database with synthetic games
+def fill(filename, games, players, seed=0):
+    rng = random.Random(seed)
+    now = time.time()
+    connection = connect(filename)
+    batch = []
+    for i in range(games):
+        finished = now - rng.random() * 365 * DAY
+        batch.append(("player%d" % rng.randrange(players), "word%d" % rng.randrange(100000),
+                      DIFFICULTY_LEVELS[i % 3], rng.randrange(0, 101, 10), rng.randint(1, 26),
+                      rng.random() * 120, rng.random() < 0.5, finished, day_of(finished)))
+        if len(batch) == 100000:
+            with connection:
+                connection.executemany(INSERT, batch)
+            batch = []
+    with connection:
+        connection.executemany(INSERT, batch)
+    connection.close()
+
+
+# Function to time a query a number of times and return the mean
+def time_query(query, repeat=20):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        query()
+        timings.append(time.perf_counter() - start)
+    return statistics.mean(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the leaderboard.")
+    parser.add_argument("--games", type=int, default=1000000)
+    parser.add_argument("--players", type=int, default=10000)
+    parser.add_argument("--records", type=int, default=10000, help="games recorded for the latency test")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "leaderboard.db")
+        start = time.perf_counter()
+        fill(filename, args.games, args.players)
+        print("Filled %d games in %.1fs (%.1f MB)" % (
+            args.games, time.perf_counter() - start, os.path.getsize(filename) / 1e6))
+
+        leaderboard = Leaderboard(filename)
+        today = day_of(time.time())
+        queries = [
+            ("top 10 (MEDIUM)", lambda: leaderboard.top_scores("MEDIUM")),
+            ("personal best", lambda: leaderboard.personal_best("player42")),
+            ("daily ranking", lambda: leaderboard.daily_ranking(today)),
+            ("daily ranking (HARD)", lambda: leaderboard.daily_ranking(today, "HARD")),
+            ("recent games", lambda: leaderboard.recent_games("player42")),
+        ]
+        print("\n%-24s %12s" % ("query", "mean"))
+        for name, query in queries:
+            print("%-24s %12s" % (name, format_seconds(time_query(query))))
+
+        # Query plans, to check that every query is answered from an index
+        connection = sqlite3.connect(filename)
+        print()
+        for sql, parameters in [
+                ("SELECT player, word, score FROM games WHERE difficulty = ? ORDER BY score DESC, finished LIMIT 10",
+                 ("MEDIUM",)),
+                ("SELECT MAX(score) FROM games WHERE player = ? AND difficulty = ?", ("player42", "EASY")),
+                ("SELECT player, MAX(score) AS best, COUNT(*) FROM games WHERE day = ?"
+                 " GROUP BY player ORDER BY best DESC, player LIMIT 10", (today,)),
+                ("SELECT word, difficulty, won FROM games WHERE player = ? ORDER BY finished DESC LIMIT ?",
+                 ("player42", 20))]:
+            plan = connection.execute("EXPLAIN QUERY PLAN " + sql, parameters).fetchall()
+            print(sql[:60] + "...")
+            for row in plan:
+                print("    " + row[-1])
+        connection.close()
+
+        # record() is what the end of a game pays for
+        timings = []
+        for i in range(args.records):
+            start = time.perf_counter()
+            leaderboard.record("bench", "word", "EASY", 100, 10, 12.5, True)
+            timings.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        leaderboard.flush()
+        flushed = time.perf_counter() - start
+        timings.sort()
+        print("\nrecord(): mean %s, p99 %s, max %s (then %s to write the last batch)" % (
+            format_seconds(statistics.mean(timings)), format_seconds(timings[len(timings) * 99 // 100]),
+            format_seconds(timings[-1]), format_seconds(flushed)))
+        leaderboard.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import builtins
+import contextlib
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.common import format_seconds, load_game, max_rss_bytes, write_word_file
+from game_text import MARATHON_PROMPT
+from simulator import LETTER_FREQUENCY_ORDER
+
+# Plays one long marathon through the terminal front-end with scripted answers
+# and checks that neither the stack nor memory grows with the number of rounds.
+# At every checkpoint it reports the stack depth at the "Next round?" prompt,
+# the memory held by Python objects (tracemalloc) and the live object count.
+# Run from the repository root: python -m benchmarks.bench_marathon --rounds 100000
+
+
+# Function to count the frames on the current call stack
+def stack_depth():
+    depth = 0
+    frame = sys._getframe(1)
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+def run(game, rounds, checkpoints, trace):
+    every = max(1, rounds // checkpoints)
+    answers = ["E"]  # Difficulty, then the scripted game
+    state = {"rounds": 0, "letters": iter(LETTER_FREQUENCY_ORDER), "depths": set()}
+    report = []
+    start = time.perf_counter()
+
+    def scripted_input(prompt=""):
+        if answers:
+            return answers.pop(0)
+        if prompt != MARATHON_PROMPT:
+            if "hint" in prompt:
+                return "N"
+            return next(state["letters"])
+
+        # End of a round
+        state["rounds"] += 1
+        state["letters"] = iter(LETTER_FREQUENCY_ORDER)
+        state["depths"].add(stack_depth())
+        if state["rounds"] % every == 0:
+            gc.collect()
+            traced = tracemalloc.get_traced_memory()[0] if trace else 0
+            report.append((state["rounds"], time.perf_counter() - start, stack_depth(),
+                           traced, len(gc.get_objects()), max_rss_bytes()))
+        return "Y" if state["rounds"] < rounds else "N"
+
+    builtins.input = scripted_input
+    if trace:
+        tracemalloc.start()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        game.play_marathon(quiet=True)
+    if trace:
+        tracemalloc.stop()
+    return report, state["depths"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that marathon mode runs in constant memory.")
+    parser.add_argument("--rounds", type=int, default=100000)
+    parser.add_argument("--checkpoints", type=int, default=10)
+    parser.add_argument("--words", type=int, default=10000, help="rows in the synthetic word file")
+    parser.add_argument("--no-trace", action="store_true",
+                        help="skip tracemalloc (faster, but only the object count is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_word_file(os.path.join(directory, "words.csv"), args.words)
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            game = load_game()
+            report, depths = run(game, args.rounds, args.checkpoints, not args.no_trace)
+        finally:
+            os.chdir(cwd)
+
+    print("%10s %10s %8s %14s %10s %10s" % ("rounds", "elapsed", "stack", "traced", "objects", "max RSS"))
+    for rounds, elapsed, depth, traced, objects, rss in report:
+        print("%10d %10s %8d %13.1fK %10d %9.1fM" % (
+            rounds, format_seconds(elapsed), depth, traced / 1e3, objects, rss / 1e6))
+
+    first, last = report[0], report[-1]
+    print("\nStack depth at the end of a round: %s" % ", ".join(str(depth) for depth in sorted(depths)))
+    if len(report) > 1:
+        print("Growth from round %d to round %d: %+.1fK traced, %+d objects" % (
+            first[0], last[0], (last[3] - first[3]) / 1e3, last[4] - first[4]))
+    print("Per round: %s" % format_seconds(last[1] / last[0]))
+
+
+if __name__ == "__main__":
+    main()
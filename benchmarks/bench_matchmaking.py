@@ -0,0 +1,72 @@
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from benchmarks.common import format_seconds, write_word_file
+from matchmaking import TARGET_SOLVE_RATE, Matchmaker, SolveRateIndex, logit
+from word_catalog import get_catalog
+
+# Adaptive word choice on large word files: building the rating index, choosing
+# a word (a bisect) against scanning every word for the nearest rating, recording
+# a result (the word moves to its new place in the index) and bringing the index
+# up to date after rows are appended to the word file.
+# Run from the repository root: python -m benchmarks.bench_matchmaking
+
+
+# Function to time a call a number of times and return the mean
+def time_calls(function, repeat=1000):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.mean(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark adaptive matchmaking.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--append", type=int, default=1000, help="rows appended before the last sync")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print("%10s %12s %12s %12s %12s %12s" % ("rows", "build", "next word", "scan", "record", "sync"))
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "words.csv")
+        extra = os.path.join(directory, "extra.csv")
+        for rows in args.sizes:
+            write_word_file(filename, rows)
+            catalog = get_catalog(filename)
+            index = SolveRateIndex()
+            start = time.perf_counter()
+            index.sync(catalog)
+            build = time.perf_counter() - start
+            matchmaker = Matchmaker(index)
+
+            pick = time_calls(lambda: matchmaker.next_word("bench", rng=rng))
+            wanted = -logit(TARGET_SOLVE_RATE)
+            scan = time_calls(lambda: min(index.entries, key=lambda entry: abs(entry[0] - wanted)), 10)
+
+            def play():
+                word, hint, difficulty = matchmaker.next_word("bench", rng=rng)
+                matchmaker.record("bench", word, difficulty, rng.random() < 0.6)
+            record = time_calls(play) - pick
+
+            write_word_file(extra, args.append, seed=rows)
+            with open(extra) as source, open(filename, "a") as target:
+                next(source)  # Header
+                target.write(source.read())
+            catalog = get_catalog(filename)
+            start = time.perf_counter()
+            index.sync(catalog)
+            sync = time.perf_counter() - start
+            print("%10d %12s %12s %12s %12s %12s" % (rows, format_seconds(build), format_seconds(pick),
+                                                     format_seconds(scan), format_seconds(record),
+                                                     format_seconds(sync)))
+
+
+if __name__ == "__main__":
+    main()
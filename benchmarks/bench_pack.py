@@ -0,0 +1,76 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import format_seconds, max_rss_bytes, write_word_file
+
+# Startup cost and memory of the compiled word pack against the CSV catalog.
+# Run from the repository root: python -m benchmarks.bench_pack
+
+
+# Runs in a fresh process: open one word source, draw words, report timings and RSS
+def child(source, filename, draws):
+    start = time.perf_counter()
+    if source == "pack":
+        from word_pack import WordPack
+        words = WordPack(filename)
+    else:
+        from word_catalog import get_catalog
+        words = get_catalog(filename)
+    words.random_word("MEDIUM")
+    startup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(draws):
+        words.random_word("MEDIUM")
+    per_draw = (time.perf_counter() - start) / draws
+
+    print(json.dumps({"startup": startup, "per_draw": per_draw, "max_rss": max_rss_bytes()}))
+
+
+def run_child(source, filename, draws):
+    output = subprocess.check_output([sys.executable, "-m", "benchmarks.bench_pack",
+                                      "--child", source, filename, "--draws", str(draws)])
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compiled word packs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--draws", type=int, default=10000)
+    parser.add_argument("--child", nargs=2, metavar=("SOURCE", "FILE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child[0], args.child[1], args.draws)
+        return
+
+    from word_pack import compile_pack
+
+    print("%10s %8s %12s %10s %12s %12s %10s" % (
+        "rows", "source", "compile", "size", "startup", "per draw", "max RSS"))
+    with tempfile.TemporaryDirectory() as directory:
+        csv_name = os.path.join(directory, "words.csv")
+        pack_name = os.path.join(directory, "words.pack")
+        for size in args.sizes:
+            write_word_file(csv_name, size)
+            start = time.perf_counter()
+            compile_pack(csv_name, pack_name)
+            compile_time = time.perf_counter() - start
+            for source, filename in (("catalog", csv_name), ("pack", pack_name)):
+                result = run_child(source, filename, args.draws)
+                print("%10d %8s %12s %9.1fM %12s %12s %9.1fM" % (
+                    size, source,
+                    format_seconds(compile_time) if source == "pack" else "-",
+                    os.path.getsize(filename) / 1e6,
+                    format_seconds(result["startup"]),
+                    format_seconds(result["per_draw"]),
+                    result["max_rss"] / 1e6))
+
+
+if __name__ == "__main__":
+    main()
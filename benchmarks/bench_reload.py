@@ -0,0 +1,66 @@
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.common import format_seconds, write_word_file
+from custom_store import CustomWordStore
+from word_catalog import WordCatalog, get_catalog, watch_word_files
+
+# Picking up changes to a word file: reading the whole file again against
+# reading only the rows appended to it (as add_custom_word() does), and the
+# cost of getting the catalog for a round when every round checks the file
+# against when the background watcher does the checking.
+# Run from the repository root: python -m benchmarks.bench_reload
+
+
+# Function to time a call a number of times and return the mean
+def time_calls(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reloading word files.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--append", type=int, default=10, help="custom words added before each reload")
+    parser.add_argument("--rounds", type=int, default=100000)
+    args = parser.parse_args()
+
+    print("%10s %12s %12s" % ("rows", "full reload", "append"))
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "words.csv")
+        for rows in args.sizes:
+            write_word_file(filename, rows)
+            catalog = WordCatalog(filename)
+            catalog.refresh()
+            store = CustomWordStore(filename, batch_size=args.append + 1)
+
+            full = 0
+            appended = 0
+            for attempt in range(3):
+                for number in range(args.append):
+                    store.add("added%d%d" % (attempt, number), "EASY", "appended word")
+                store.commit()
+                start = time.perf_counter()
+                catalog.refresh()
+                appended += time.perf_counter() - start
+                fresh = WordCatalog(filename)
+                start = time.perf_counter()
+                fresh.refresh()
+                full += time.perf_counter() - start
+                assert fresh.words == catalog.words and fresh.hints == catalog.hints
+            print("%10d %12s %12s" % (rows, format_seconds(full / 3), format_seconds(appended / 3)))
+
+        get_catalog(filename)
+        checked = time_calls(lambda: get_catalog(filename), args.rounds)
+        watch_word_files()
+        watched = time_calls(lambda: get_catalog(filename), args.rounds)
+        print("Getting the catalog for a round: %s checking the file, %s with the watcher" % (
+            format_seconds(checked), format_seconds(watched)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import argparse
+import builtins
+import io
+import os
+import random
+import sys
+import time
+
+from benchmarks.common import load_game
+from game_engine import HangmanGame
+from game_text import HANGMAN_STAGES, guess_message
+from simulator import LETTER_FREQUENCY_ORDER
+from word_catalog import get_catalog
+
+# Writes reaching the operating system per game for the terminal front-end.
+# stdout is replaced by a line-buffered text stream (like a terminal or pty)
+# over a file object that counts the write system calls it receives.
+# Run from the repository root: python -m benchmarks.bench_render
+
+
+# Raw file that counts how many times it is written to
+class CountingFile(io.FileIO):
+    writes = 0
+
+    def write(self, data):
+        CountingFile.writes += 1
+        return super().write(data)
+
+
+# The terminal front-end as it was before turns were rendered into one write:
+# one print() per line of output, and the frame list rebuilt on every call
+def legacy_play_round(game):
+    def display_hangman(remaining_attempts):
+        stages = list(HANGMAN_STAGES)
+        return stages[remaining_attempts]
+
+    def display_progress(word_completion, guessed_letters):
+        print("Guessed letters: ", " ".join(guessed_letters))
+        print("Current word: ", word_completion)
+
+    print(display_hangman(game.remaining_attempts))
+    display_progress(game.word_completion, game.guessed_letters)
+    print("\n")
+    while not game.is_over:
+        if game.hint_available:
+            input("Would you like a hint? (Y/N): ")
+        guess = input("Please guess a letter or word: ").upper()
+        message = guess_message(game.guess(guess), guess)
+        if message is not None:
+            print(message)
+        print(display_hangman(game.remaining_attempts))
+        display_progress(game.word_completion, game.guessed_letters)
+        print("\n")
+    return game.score
+
+
+def run(play_round, words, games, seed):
+    rng = random.Random(seed)
+    letters = iter(())
+
+    # input() on a non-terminal writes the prompt to stdout and flushes it.
+    # Guesses go in letter frequency order, and hint offers are turned down.
+    def scripted_input(prompt=""):
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+        if "hint" in prompt:
+            return "N"
+        return next(letters)
+
+    real_stdout, real_input = sys.stdout, builtins.input
+    raw = CountingFile(os.devnull, "w")
+    sys.stdout = io.TextIOWrapper(io.BufferedWriter(raw), line_buffering=True)
+    builtins.input = scripted_input
+    CountingFile.writes = 0
+    try:
+        start = time.perf_counter()
+        for _ in range(games):
+            letters = iter(LETTER_FREQUENCY_ORDER)
+            play_round(HangmanGame(rng.choice(words), ""))
+        sys.stdout.flush()
+        elapsed = time.perf_counter() - start
+    finally:
+        sys.stdout = real_stdout
+        builtins.input = real_input
+    return CountingFile.writes / games, elapsed / games
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count terminal writes per game.")
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    game = load_game()
+    words = [word for group in get_catalog("words.csv").words.values() for word in group]
+    cases = [
+        ("print per line (before)", legacy_play_round),
+        ("one write per turn", game.play_round),
+        ("quiet", lambda g: game.play_round(g, quiet=True)),
+    ]
+    print("%-26s %16s %14s" % ("front-end", "writes per game", "time per game"))
+    for name, play_round in cases:
+        writes, seconds = run(play_round, words, args.games, args.seed)
+        print("%-26s %16.1f %11.1f us" % (name, writes, seconds * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.bench_server import percentile
+from game_text import DIFFICULTY_PROMPT
+from rooms import NAME_PROMPT, ROOM_PROMPT
+from seeding import SeedStreams
+from server import raise_file_limit
+from simulator import LETTER_FREQUENCY_ORDER
+
+# Load test for rooms.py: rooms of players racing on the same word. Every
+# player joins their room (the round starts once it is full), guesses letters
+# in frequency order, and the first player of each room starts the next round.
+# Reports the time from sending a guess to receiving its answer, and how much
+# each player receives per round (their own answers and everyone's standings).
+# The players are spread over several processes, and over several loopback
+# addresses when there are more connections than one address has ports.
+# Run from the repository root: python -m benchmarks.bench_rooms --rooms 1000 --players 50
+
+CONNECTIONS_PER_ADDRESS = 25000
+
+
+# Function to tell the answer to a guess (or the end of the round) from the other lines
+def is_answer(line):
+    return line.startswith(("+ ", "- ", "= ", "! ", "END ")) and not line.startswith("! A hint")
+
+
+# Class counting what one player received
+class Received:
+    def __init__(self):
+        self.lines = 0
+        self.bytes = 0
+
+
+async def read_until(reader, received, predicate):
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        received.lines += 1
+        received.bytes += len(line)
+        line = line.decode("utf-8").rstrip("\n")
+        if predicate(line):
+            return line
+
+
+async def run_player(host, port, source, room, number, rounds, think, gate, latencies, received, rng):
+    # Limit how many connections are being opened at once so the listen backlog keeps up
+    async with gate:
+        reader, writer = await asyncio.open_connection(host, port, local_addr=(source, 0))
+    try:
+        await read_until(reader, received, lambda line: line == ROOM_PROMPT)
+        writer.write(b"room%d\n" % room)
+        await read_until(reader, received, lambda line: line == NAME_PROMPT)
+        writer.write(b"player%d\n" % number)
+        line = await read_until(reader, received, lambda line: line.startswith(("ROOM ", DIFFICULTY_PROMPT)))
+        if line == DIFFICULTY_PROMPT:
+            writer.write(b"E\n")
+            await read_until(reader, received, lambda line: line.startswith("ROOM "))
+
+        for round_number in range(rounds):
+            await read_until(reader, received, lambda line: line.startswith("ROUND "))
+            letters = iter(LETTER_FREQUENCY_ORDER)
+            line = ""
+            while not line.startswith(("! Congrats", "! Sorry", "END ")):
+                if think:
+                    await asyncio.sleep(rng.uniform(0, 2 * think))
+                start = time.perf_counter()
+                writer.write(next(letters).encode("ascii") + b"\n")
+                line = await read_until(reader, received, is_answer)
+                latencies.append(time.perf_counter() - start)
+            if not line.startswith("END "):
+                await read_until(reader, received, lambda line: line.startswith("END "))
+            if number == 0 and round_number < rounds - 1:
+                writer.write(b"/start\n")
+
+        writer.write(b"/quit\n")
+        await reader.read()
+    finally:
+        writer.close()
+
+
+async def run_players(host, port, players, rounds, think, connect_limit, seed, worker):
+    latencies = []
+    received = []
+    gate = asyncio.Semaphore(connect_limit)
+    streams = SeedStreams(seed, "player", worker)
+
+    async def gated_player(index, room, number):
+        counts = Received()
+        received.append(counts)
+        source = "127.0.0.%d" % (1 + index // CONNECTIONS_PER_ADDRESS)
+        await run_player(host, port, source, room, number, rounds, think, gate, latencies, counts,
+                         streams.session(index))
+
+    results = await asyncio.gather(*(gated_player(index, room, number)
+                                     for index, (room, number) in players),
+                                   return_exceptions=True)
+    errors = [repr(result) for result in results if isinstance(result, BaseException)]
+    return latencies, [(counts.lines, counts.bytes) for counts in received], errors
+
+
+# Function run in each client process: plays its share of the players
+def run_worker(arguments):
+    raise_file_limit()
+    return asyncio.run(run_players(*arguments))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Hangman room server.")
+    parser.add_argument("--rooms", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--players", type=int, default=50, help="players in each room")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--think", type=float, default=0.0,
+                        help="mean seconds a player waits before each guess")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="client processes")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None,
+                        help="port of a running room server (default: start one)")
+    parser.add_argument("--connect-limit", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    raise_file_limit()
+    server = None
+    port = args.port
+    if port is None:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        server = subprocess.Popen([sys.executable, "rooms.py", "--port", "0", "--seed", str(args.seed),
+                                   "--room-size", str(args.players)],
+                                  cwd=root, stdout=subprocess.PIPE, text=True)
+        port = int(server.stdout.readline().rsplit(":", 1)[1])
+
+    try:
+        print("%9s %9s %9s %10s %10s %10s %12s %12s %8s" % (
+            "rooms", "players", "guesses", "guesses/s", "p50", "p99", "lines/round", "bytes/round",
+            "errors"))
+        for rooms in args.rooms:
+            everyone = list(enumerate((room, number) for room in range(rooms)
+                                      for number in range(args.players)))
+            shares = [(args.host, port, everyone[worker::args.workers], args.rounds, args.think,
+                       args.connect_limit, args.seed, worker) for worker in range(args.workers)]
+            start = time.perf_counter()
+            with multiprocessing.Pool(args.workers) as pool:
+                results = pool.map(run_worker, shares)
+            elapsed = time.perf_counter() - start
+
+            latencies = sorted(latency for result in results for latency in result[0])
+            received = [counts for result in results for counts in result[1]]
+            errors = [error for result in results for error in result[2]]
+            per_round = len(received) * args.rounds
+            print("%9d %9d %9d %10.0f %8.2fms %8.2fms %12.1f %12.0f %8d" % (
+                rooms, len(everyone), len(latencies), len(latencies) / elapsed,
+                percentile(latencies, 0.5) * 1e3, percentile(latencies, 0.99) * 1e3,
+                sum(lines for lines, _ in received) / per_round,
+                sum(size for _, size in received) / per_round, len(errors)))
+            if errors:
+                print("  first error:", errors[0])
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import format_seconds, load_game, max_rss_bytes, write_word_file
+
+# Latency and peak RSS of the word selection strategies in get_word_with_hint():
+# "list" parses every row into dicts and filters them (the original approach),
+# "catalog" keeps the file indexed in memory and "stream" uses reservoir sampling.
+# Run from the repository root: python -m benchmarks.bench_selection
+
+
+# Runs in a fresh process (inside the directory holding words.csv)
+def child(strategy, rounds):
+    game = load_game()
+    baseline_rss = max_rss_bytes()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        if strategy == "list":
+            filtered = [w for w in game.get_word_list() if w["difficulty"] == "MEDIUM"]
+            random.choice(filtered)
+        else:
+            game.get_word_with_hint("MEDIUM", source=strategy)
+    per_round = (time.perf_counter() - start) / rounds
+
+    print(json.dumps({"per_round": per_round, "max_rss": max_rss_bytes(),
+                      "baseline_rss": baseline_rss}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark word selection strategies.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--strategies", nargs="+", default=["list", "catalog", "stream"])
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.rounds)
+        return
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    print("%10s %8s %12s %14s" % ("rows", "strategy", "per round", "RSS growth"))
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            write_word_file(os.path.join(directory, "words.csv"), size)
+            for strategy in args.strategies:
+                output = subprocess.check_output(
+                    [sys.executable, "-m", "benchmarks.bench_selection", "--child", strategy,
+                     "--rounds", str(args.rounds)], cwd=directory, env=env)
+                result = json.loads(output)
+                growth = result["max_rss"] - result["baseline_rss"]
+                print("%10d %8s %12s %13.1fM" % (size, strategy,
+                                                  format_seconds(result["per_round"]),
+                                                  growth / 1e6))
+
+
+if __name__ == "__main__":
+    main()
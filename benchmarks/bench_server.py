@@ -0,0 +1,153 @@
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from game_text import DIFFICULTY_PROMPT, GUESS_PROMPT, HINT_PROMPT, MENU_PROMPT, PLAY_AGAIN_PROMPT
+from seeding import SeedStreams
+from server import raise_file_limit
+from simulator import LETTER_FREQUENCY_ORDER
+
+# Load test for server.py: N sessions connect, wait until all of them are open,
+# then each plays games guessing letters in frequency order. Reports the time
+# from sending a guess to receiving the next prompt.
+# Run from the repository root: python -m benchmarks.bench_server --sessions 1000 5000 10000
+
+PROMPTS = {MENU_PROMPT, DIFFICULTY_PROMPT, HINT_PROMPT, GUESS_PROMPT, PLAY_AGAIN_PROMPT}
+
+
+# Read lines until the server sends a prompt, and return the prompt
+async def next_prompt(reader):
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        line = line.decode("utf-8").rstrip("\n")
+        if line in PROMPTS:
+            return line
+
+
+async def run_session(host, port, games, think, all_connected, connected, latencies, rng):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await next_prompt(reader)  # Main menu
+        connected()
+        await all_connected.wait()
+
+        for game_number in range(games):
+            if game_number == 0:
+                writer.write(b"1\n")
+                await next_prompt(reader)  # Difficulty
+            writer.write(b"E\n")
+            prompt = await next_prompt(reader)
+            letters = iter(LETTER_FREQUENCY_ORDER)
+            while prompt != PLAY_AGAIN_PROMPT:
+                if prompt == HINT_PROMPT:
+                    writer.write(b"N\n")
+                    prompt = await next_prompt(reader)
+                    continue
+                if think:
+                    await asyncio.sleep(rng.uniform(0, 2 * think))
+                start = time.perf_counter()
+                writer.write(next(letters).encode("ascii") + b"\n")
+                prompt = await next_prompt(reader)
+                latencies.append(time.perf_counter() - start)
+            writer.write(b"Y\n" if game_number < games - 1 else b"N\n")
+            await next_prompt(reader)  # Difficulty again, or the main menu
+
+        writer.write(b"4\n")
+        await reader.read()
+    finally:
+        writer.close()
+
+
+async def run_level(host, port, sessions, games, think, connect_limit, streams):
+    all_connected = asyncio.Event()
+    latencies = []
+    count = [0]
+
+    def connected():
+        count[0] += 1
+        if count[0] == sessions:
+            all_connected.set()
+
+    # Limit how many connections are being opened at once so the listen backlog keeps up
+    gate = asyncio.Semaphore(connect_limit)
+
+    async def gated_session(rng):
+        await gate.acquire()
+        released = False
+
+        def release_after_connect():
+            nonlocal released
+            if not released:
+                released = True
+                gate.release()
+            connected()
+
+        try:
+            await run_session(host, port, games, think, all_connected, release_after_connect,
+                              latencies, rng)
+        finally:
+            if not released:
+                gate.release()
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(gated_session(streams.next_session()) for _ in range(sessions)),
+                                   return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    errors = [result for result in results if isinstance(result, BaseException)]
+    return latencies, errors, elapsed
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return float("nan")
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Hangman server.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--games", type=int, default=1, help="games per session")
+    parser.add_argument("--think", type=float, default=0.0,
+                        help="mean seconds a player waits before each guess")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None,
+                        help="port of a running server (default: start one)")
+    parser.add_argument("--connect-limit", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for the server's words and the players' think times")
+    args = parser.parse_args()
+
+    raise_file_limit()
+    server = None
+    port = args.port
+    if port is None:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        server = subprocess.Popen([sys.executable, "server.py", "--port", "0", "--seed", str(args.seed)],
+                                  cwd=root, stdout=subprocess.PIPE, text=True)
+        port = int(server.stdout.readline().rsplit(":", 1)[1])
+
+    try:
+        print("%9s %9s %10s %10s %10s %8s" % ("sessions", "guesses", "p50", "p99", "time", "errors"))
+        for sessions in args.sessions:
+            latencies, errors, elapsed = asyncio.run(
+                run_level(args.host, port, sessions, args.games, args.think, args.connect_limit,
+                          SeedStreams(args.seed, "client", sessions)))
+            latencies.sort()
+            print("%9d %9d %8.2fms %8.2fms %9.2fs %8d" % (
+                sessions, len(latencies), percentile(latencies, 0.5) * 1e3,
+                percentile(latencies, 0.99) * 1e3, elapsed, len(errors)))
+            if errors:
+                print("  first error:", repr(errors[0]))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import random
+import time
+
+from game_engine import HangmanGame
+from solver import WordSolver
+
+# Time per smart-hint answer (narrow candidates + pick a letter) on a synthetic catalog.
+# Run from the repository root: python -m benchmarks.bench_solver
+
+# Letters repeated roughly in proportion to how common they are in English
+WEIGHTED_LETTERS = ("E" * 12 + "T" * 9 + "A" * 8 + "O" * 8 + "I" * 7 + "N" * 7 + "S" * 6
+                    + "H" * 6 + "R" * 6 + "D" * 4 + "L" * 4 + "C" * 3 + "U" * 3 + "M" * 2
+                    + "W" * 2 + "F" * 2 + "G" * 2 + "Y" * 2 + "P" * 2 + "BVKJXQZ")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the letter solver.")
+    parser.add_argument("--words", type=int, default=500000)
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    words = ["".join(rng.choice(WEIGHTED_LETTERS) for _ in range(rng.randint(4, 12)))
+             for _ in range(args.words)]
+    start = time.perf_counter()
+    solver = WordSolver(words)
+    print("Built solver for %d words in %.2fs" % (args.words, time.perf_counter() - start))
+
+    timings = []
+    wins = 0
+    for _ in range(args.games):
+        word = rng.choice(words)
+        game = HangmanGame(word, "")
+        candidates = solver.candidates(len(word))
+        while not game.is_over:
+            start = time.perf_counter()
+            candidates.update(game.word_completion, game.guessed_letters)
+            letter = candidates.best_letter(game.guessed_letters)
+            timings.append(time.perf_counter() - start)
+            if len(candidates) == 1:
+                letter = candidates.words()[0]
+            game.guess(letter)
+        wins += game.won
+
+    timings.sort()
+    print("Answers: %d  mean %.3f ms  p50 %.3f ms  p99 %.3f ms  max %.3f ms" % (
+        len(timings), 1e3 * sum(timings) / len(timings), 1e3 * timings[len(timings) // 2],
+        1e3 * timings[int(len(timings) * 0.99)], 1e3 * timings[-1]))
+    print("Solver won %d of %d games" % (wins, args.games))
+
+
+if __name__ == "__main__":
+    main()
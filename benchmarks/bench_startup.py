@@ -0,0 +1,98 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import GAME_SCRIPT, format_seconds, write_word_file
+from game_text import GUESS_PROMPT, MENU_PROMPT
+
+# Cold start of the terminal game, as seen by a player: time from starting the
+# process until the menu prompt is on screen, and until the first round can be
+# played after choosing "Play" (the word list is loaded in the background while
+# the menu is shown). With --importtime the slowest imports of a start that goes
+# straight to Exit are listed, from python -X importtime.
+# Run from the repository root: python -m benchmarks.bench_startup
+
+
+# Function to read the output of a process until some text appears
+def read_until(process, text):
+    data = b""
+    text = text.encode()
+    while text not in data:
+        chunk = os.read(process.stdout.fileno(), 65536)
+        if not chunk:
+            raise RuntimeError("The game ended before printing %r" % text)
+        data += chunk
+
+
+# Function to start the game once and time the menu and the first round
+def time_start(directory, think_time):
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, GAME_SCRIPT], cwd=directory,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    try:
+        read_until(process, MENU_PROMPT)
+        menu = time.perf_counter() - start
+        time.sleep(think_time)  # The player reading the menu
+        choice = time.perf_counter()
+        process.stdin.write(b"1\nE\n")
+        process.stdin.flush()
+        read_until(process, GUESS_PROMPT)
+        first_round = time.perf_counter() - choice
+    finally:
+        process.kill()
+        process.wait()
+    return menu, first_round
+
+
+# Function to list the slowest imports of a start that exits at the menu
+def import_times(directory, top):
+    result = subprocess.run([sys.executable, "-X", "importtime", GAME_SCRIPT], cwd=directory,
+                            input=b"4\n", stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    imports = []
+    for line in result.stderr.decode().splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        imports.append((int(cumulative), int(own), name.rstrip()))
+    imports.sort(reverse=True)
+    print("\n%12s %12s  %s" % ("cumulative", "self", "module"))
+    for cumulative, own, name in imports[:top]:
+        print("%12s %12s  %s" % (format_seconds(cumulative / 1e6), format_seconds(own / 1e6), name))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the game's cold start.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 100000, 1000000])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--think-time", type=float, default=1.0,
+                        help="seconds between the menu appearing and choosing Play")
+    parser.add_argument("--importtime", action="store_true", help="list the slowest imports")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    if os.environ.get("PYTHONDONTWRITEBYTECODE"):
+        print("Note: PYTHONDONTWRITEBYTECODE is set, so every module is compiled on each start")
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"])
+    print("Bare interpreter start: %s" % format_seconds(time.perf_counter() - start))
+
+    print("\n%10s %14s %14s %18s" % ("rows", "menu (median)", "menu (max)", "first round (median)"))
+    for rows in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            write_word_file(os.path.join(directory, "words.csv"), rows)
+            timings = [time_start(directory, args.think_time) for _ in range(args.runs)]
+            menus = [menu for menu, first_round in timings]
+            rounds = [first_round for menu, first_round in timings]
+            print("%10d %14s %14s %18s" % (rows, format_seconds(statistics.median(menus)),
+                                           format_seconds(max(menus)),
+                                           format_seconds(statistics.median(rounds))))
+            if args.importtime and rows == args.sizes[-1]:
+                import_times(directory, args.top)
+
+
+if __name__ == "__main__":
+    main()
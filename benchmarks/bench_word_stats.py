@@ -0,0 +1,58 @@
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.bench_game_log import record_games
+from benchmarks.common import format_seconds, max_rss_bytes, write_word_file
+from game_log import GameLog
+from word_catalog import get_catalog
+from word_stats import StatsStore
+
+# Per-word statistics from a game log: the first update over the whole log,
+# then an update after a small batch of games is appended (only the new games
+# are read and merged into the stored totals). Peak memory stays the same however
+# many games the log holds, as only one total per word is kept.
+# Run from the repository root: python -m benchmarks.bench_word_stats --games 1000000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the per-word statistics.")
+    parser.add_argument("--games", type=int, default=200000)
+    parser.add_argument("--words", type=int, default=10000)
+    parser.add_argument("--append", type=int, default=1000, help="games logged before the second update")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        words = os.path.join(directory, "words.csv")
+        write_word_file(words, args.words)
+        catalog = get_catalog(words)
+        filename = os.path.join(directory, "games.hlog")
+        log = GameLog(filename, autoflush=False)
+        record_games(log, catalog, args.games)
+        log.close()
+        before = max_rss_bytes()
+
+        with StatsStore(os.path.join(directory, "word_stats.db")) as store:
+            start = time.perf_counter()
+            games = store.update_from_log(filename)
+            first = time.perf_counter() - start
+            print("First update: %d games in %s (%.0f games/s), peak memory +%.1f MB" % (
+                games, format_seconds(first), games / first, (max_rss_bytes() - before) / 1e6))
+
+            log = GameLog(filename, autoflush=False)
+            record_games(log, catalog, args.append, seed=1)
+            log.close()
+            start = time.perf_counter()
+            games = store.update_from_log(filename)
+            print("Update after %d more games: %d games in %s" % (
+                args.append, games, format_seconds(time.perf_counter() - start)))
+
+            start = time.perf_counter()
+            stats = store.load()
+            print("Loading the totals of %d words: %s" % (len(stats.totals),
+                                                         format_seconds(time.perf_counter() - start)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import csv
+import importlib.util
+import os
+import random
+import resource
+import string
+import sys
+
+from word_catalog import DIFFICULTY_LEVELS
+
+# Path of the main game script (its file name is not importable directly)
+GAME_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           "Hangman (FINAL - With the comments).py")
+
+
+# Function to import the game script as a module
+def load_game():
+    spec = importlib.util.spec_from_file_location("hangman_game", GAME_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Function to write a synthetic word file with the given number of rows
+def write_word_file(filename, rows, seed=0):
+    rng = random.Random(seed)
+    letters = string.ascii_lowercase
+    with open(filename, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["word", "difficulty", "hint"])
+        for i in range(rows):
+            difficulty = DIFFICULTY_LEVELS[i % 3]
+            length = rng.randint(3, 12)
+            word = "".join(rng.choice(letters) for _ in range(length))
+            writer.writerow([word, difficulty, "synthetic hint number %d" % i])
+
+
+# Function to format a number of seconds for the reports
+def format_seconds(seconds):
+    if seconds < 1e-3:
+        return "%.2f us" % (seconds * 1e6)
+    if seconds < 1:
+        return "%.2f ms" % (seconds * 1e3)
+    return "%.2f s" % seconds
+
+
+# Function to get the peak resident set size of this process in bytes
+def max_rss_bytes():
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    if sys.platform != "darwin":
+        max_rss *= 1024
+    return max_rss
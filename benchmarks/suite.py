@@ -0,0 +1,240 @@
+import argparse
+import builtins
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.common import format_seconds, load_game, max_rss_bytes, write_word_file
+from word_catalog import EMPTY_INDEX, get_catalog
+
+# Benchmark suite for the word loading and gameplay hot paths.
+# Every case runs in its own process against synthetic word files, and reports
+# wall time per call, tracemalloc peak and net allocations, and peak RSS.
+#
+# Run from the repository root:
+#   python -m benchmarks.suite --save results.json
+#   python -m benchmarks.suite --compare results.json     (exit status 1 on regressions)
+#   python -m benchmarks.suite --sizes 100 10000000 --cases get_word_with_hint
+
+DEFAULT_SIZES = [100, 10000, 100000, 1000000]
+TIME_BUDGET = 0.5  # Seconds spent repeating each case for the timing
+METRICS = ("seconds", "alloc_peak_bytes", "alloc_net_bytes", "max_rss_bytes")
+MIN_BYTES_CHANGE = 1024  # Smaller memory changes are noise, never flagged
+LETTERS = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
+
+
+# Scripted answers for input(), so the interactive functions run unattended
+class ScriptedInput:
+    def __init__(self):
+        self.answers = []
+        self.letters = iter(())
+
+    def __call__(self, prompt=""):
+        if self.answers:
+            return self.answers.pop(0)
+        if "hint" in prompt:
+            return "N"
+        return next(self.letters)
+
+
+# The cases: each takes the game module and returns a function running one call
+def case_get_word_list(game, script):
+    return game.get_word_list
+
+
+def case_get_custom_word_list(game, script):
+    return game.get_custom_word_list
+
+
+def case_get_word_with_hint_cold(game, script):
+    def run():
+        get_catalog("words.csv").index = EMPTY_INDEX  # Forget the loaded file
+        game.get_word_with_hint("MEDIUM")
+    return run
+
+
+def case_get_word_with_hint(game, script):
+    game.get_word_with_hint("MEDIUM")  # Load the catalog before timing
+    return lambda: game.get_word_with_hint("MEDIUM")
+
+
+def case_play(game, script):
+    def run():
+        word, hint = game.get_word_with_hint("MEDIUM")
+        script.letters = iter(LETTERS)
+        game.play(word, hint)
+    return run
+
+
+def case_display_hangman(game, script):
+    return lambda: game.display_hangman(3)
+
+
+def case_add_custom_word(game, script):
+    counter = [0]
+
+    def run():
+        counter[0] += 1
+        script.answers = ["benchword%s" % _letters(counter[0]), "E", "benchmark hint"]
+        game.add_custom_word()
+    return run
+
+
+CASES = {
+    "get_word_list": case_get_word_list,
+    "get_custom_word_list": case_get_custom_word_list,
+    "get_word_with_hint_cold": case_get_word_with_hint_cold,
+    "get_word_with_hint": case_get_word_with_hint,
+    "play": case_play,
+    "display_hangman": case_display_hangman,
+    "add_custom_word": case_add_custom_word,
+}
+
+
+# Function to spell a number with letters (custom words must be alphabetic)
+def _letters(number):
+    text = ""
+    while True:
+        number, digit = divmod(number, 26)
+        text += chr(97 + digit)
+        if not number:
+            return text
+
+
+# Runs in a fresh process inside the directory holding the synthetic word files
+def run_case(name):
+    game = load_game()
+    script = ScriptedInput()
+    builtins.input = script
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        run = CASES[name](game, script)
+
+        # Timing: repeat until the time budget is used (at least once)
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            run()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= TIME_BUDGET:
+                break
+
+        # Allocations of a single call, measured separately because tracing slows it down.
+        # Seeded (a new session stream) so the same word is played in every run.
+        game.RANDOM_SEED = 0
+        game.session_rng = None
+        game.get_session_rng()  # Made here, so it is not counted in the allocations
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        run()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "seconds": elapsed / calls,
+        "calls": calls,
+        "alloc_peak_bytes": peak - before,
+        "alloc_net_bytes": current - before,
+        "max_rss_bytes": max_rss_bytes(),
+    }
+
+
+# Function to run every case for every size and return the results document
+def run_suite(sizes, cases, workdir=None):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    results = []
+    with tempfile.TemporaryDirectory(dir=workdir) as directory:
+        source = os.path.join(directory, "source.csv")
+        for rows in sizes:
+            write_word_file(source, rows)
+            for name in cases:
+                # Fresh copies, since add_custom_word() changes the custom words file
+                for filename in ("words.csv", "custom_words.csv"):
+                    shutil.copyfile(source, os.path.join(directory, filename))
+                output = subprocess.check_output(
+                    [sys.executable, "-m", "benchmarks.suite", "--child", name],
+                    cwd=directory, env=env)
+                result = json.loads(output)
+                result.update(case=name, rows=rows)
+                results.append(result)
+                print("%-26s %10d %12s %12.1fK %12.1fM" % (
+                    name, rows, format_seconds(result["seconds"]),
+                    result["alloc_peak_bytes"] / 1e3, result["max_rss_bytes"] / 1e6),
+                    file=sys.stderr)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+# Function to compare results with a baseline; returns the list of regressions
+def compare(current, baseline, threshold):
+    old = {(r["case"], r["rows"]): r for r in baseline["results"]}
+    regressions = []
+    print("%-26s %10s %-18s %14s %14s %9s" % ("case", "rows", "metric", "baseline", "current", "change"))
+    for result in current["results"]:
+        before = old.get((result["case"], result["rows"]))
+        if before is None:
+            continue
+        for metric in METRICS:
+            if not before.get(metric):
+                continue
+            change = result[metric] / before[metric] - 1
+            flag = ""
+            if metric != "seconds" and abs(result[metric] - before[metric]) < MIN_BYTES_CHANGE:
+                pass
+            elif change > threshold:
+                flag = "  REGRESSION"
+                regressions.append((result["case"], result["rows"], metric, change))
+            elif change < -threshold:
+                flag = "  improved"
+            print("%-26s %10d %-18s %14.6g %14.6g %+8.1f%%%s" % (
+                result["case"], result["rows"], metric, before[metric], result[metric],
+                change * 100, flag))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Hangman benchmark suite.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON file to compare the results with")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative change counted as a regression (default 0.10)")
+    parser.add_argument("--workdir", help="where to write the synthetic word files")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_case(args.child)))
+        return
+
+    print("%-26s %10s %12s %13s %13s" % ("case", "rows", "per call", "alloc peak", "max RSS"),
+          file=sys.stderr)
+    current = run_suite(args.sizes, args.cases, args.workdir)
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(current, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print("\n%d regression(s) above %.0f%%" % (len(regressions), args.threshold * 100))
+            sys.exit(1)
+        print("\nNo regressions above %.0f%%" % (args.threshold * 100))
+
+
+if __name__ == "__main__":
+    main()
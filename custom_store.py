@@ -0,0 +1,243 @@
+import csv
+import io
+import locale
+import os
+import stat
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# Class for an advisory lock shared by every process writing a word file.
+# The lock is taken on a separate ".lock" file, because compaction replaces
+# the word file itself with a new one.
+class FileLock:
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.filename, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        else:
+            self._file.seek(0)
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+# Function to get the key used to spot duplicate words ("Hello" and "hello" are the same word)
+def word_key(word):
+    return word.strip().casefold()
+
+
+# Class that adds words to a custom words CSV without duplicates.
+# Words are buffered in memory and written in batches under the file lock, so
+# rows from several processes never interleave. The file stays a plain CSV
+# that get_custom_word_list() and the word catalog read as before.
+class CustomWordStore:
+    def __init__(self, filename="custom_words.csv", batch_size=100):
+        self.filename = filename
+        self.batch_size = batch_size
+        self._lock = FileLock(filename + ".lock")
+        # _write_lock is held while the file is read or written (one thread at a
+        # time); _thread_lock only while the index and the waiting words are
+        # looked at or changed in memory, so contains() never waits for the disk
+        self._write_lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._index = set()  # Keys of the words already in the file
+        self._pending = []  # Rows waiting to be written
+        self._pending_keys = set()
+        self.written = 0  # Rows this store has written to the file
+        self._offset = 0  # Bytes of the file already read into the index
+        self._inode = None
+        self._encoding = locale.getpreferredencoding(False)  # Same as open() uses
+        with self._lock:
+            self._catch_up()
+
+    # Read rows written since the index was last updated (by this or another
+    # process). Called with _write_lock and the file lock held.
+    def _catch_up(self):
+        try:
+            file_stat = os.stat(self.filename)
+        except FileNotFoundError:
+            with self._thread_lock:
+                self._index = set()
+            self._offset = 0
+            self._inode = None
+            return
+
+        # The file was replaced (compacted) or truncated: index it again from the start
+        restart = file_stat.st_ino != self._inode or file_stat.st_size < self._offset
+        if restart:
+            self._offset = 0
+            self._inode = file_stat.st_ino
+        keys = []
+        if file_stat.st_size > self._offset:
+            with open(self.filename, "rb") as file:
+                file.seek(self._offset)
+                data = file.read()
+            self._offset += len(data)
+            for row in csv.reader(io.StringIO(data.decode(self._encoding), newline="")):
+                if row and len(row) >= 3:  # Ensure row has required columns
+                    keys.append(word_key(row[0]))
+        if restart:
+            index = set(keys)
+            with self._thread_lock:
+                self._index = index
+        elif keys:
+            with self._thread_lock:
+                self._index.update(keys)
+
+    # Pick up words other processes have written since the last look
+    def refresh(self):
+        with self._write_lock, self._lock:
+            self._catch_up()
+
+    # Check whether a word is already stored or waiting to be written
+    def contains(self, word):
+        key = word_key(word)
+        with self._thread_lock:
+            return key in self._index or key in self._pending_keys
+
+    def __contains__(self, word):
+        return self.contains(word)
+
+    def pending(self):
+        return len(self._pending)
+
+    # Queue a word to be written; returns False if it is a duplicate.
+    # The batch is written once batch_size words are waiting.
+    def add(self, word, difficulty, hint):
+        key = word_key(word)
+        with self._thread_lock:
+            if key in self._index or key in self._pending_keys:
+                return False
+            self._pending.append((word, difficulty, hint))
+            self._pending_keys.add(key)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.commit()
+        return True
+
+    # Write all waiting words to the file in one append; returns how many were written
+    def commit(self):
+        with self._write_lock:
+            with self._thread_lock:
+                batch = self._pending[:]
+            if not batch:
+                return 0
+
+            # The waiting words are only dropped, and their keys only counted as
+            # stored, once the file write has worked (a full disk keeps them waiting).
+            # Words added meanwhile stay waiting for the next batch.
+            with self._lock:
+                # Another process may have added some of the same words since we last looked
+                self._catch_up()
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                keys = set()
+                index = self._index
+                for word, difficulty, hint in batch:
+                    key = word_key(word)
+                    if key in index or key in keys:
+                        continue
+                    writer.writerow([word, difficulty, hint])
+                    keys.add(key)
+
+                if keys:
+                    data = buffer.getvalue().encode(self._encoding)
+                    with open(self.filename, "ab") as file:
+                        # Start on a new line if the last row has no line ending
+                        if file.tell() > 0:
+                            with open(self.filename, "rb") as existing:
+                                existing.seek(-1, os.SEEK_END)
+                                if existing.read(1) not in (b"\n", b"\r"):
+                                    data = b"\r\n" + data
+                        file.write(data)
+                        file.flush()
+                        os.fsync(file.fileno())
+                    file_stat = os.stat(self.filename)
+                    self._offset = file_stat.st_size
+                    self._inode = file_stat.st_ino
+                    self.written += len(keys)
+                with self._thread_lock:
+                    self._index.update(keys)
+                    self._pending = self._pending[len(batch):]
+                    self._pending_keys.difference_update(word_key(row[0]) for row in batch)
+                return len(keys)
+
+    # Rewrite the file without duplicate or malformed rows (first occurrence wins).
+    # The new file is written next to the old one and renamed over it, so readers
+    # see either the old file or the new one.
+    def compact(self):
+        self.commit()
+        with self._write_lock, self._lock:
+            seen = set()
+            rows = []
+            removed = 0
+            try:
+                with open(self.filename, "r", newline="") as file:
+                    for row in csv.reader(file):
+                        if not row:
+                            continue
+                        key = word_key(row[0])
+                        if len(row) < 3 or key in seen:
+                            removed += 1
+                            continue
+                        seen.add(key)
+                        rows.append(row)
+            except FileNotFoundError:
+                return 0
+
+            directory = os.path.dirname(os.path.abspath(self.filename))
+            fd, temp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", newline="") as file:
+                    csv.writer(file).writerows(rows)
+                    file.flush()
+                    os.fsync(file.fileno())
+                os.chmod(temp_name, stat.S_IMODE(os.stat(self.filename).st_mode))
+                os.replace(temp_name, self.filename)
+            except BaseException:
+                os.remove(temp_name)
+                raise
+            self._offset = 0
+            self._inode = None
+            self._catch_up()
+            return removed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.commit()
+
+
+# Stores shared by the whole process, one per custom words file
+_stores = {}
+
+
+# Function to get the store for a custom words file
+def get_custom_store(filename="custom_words.csv"):
+    store = _stores.get(filename)
+    if store is None:
+        store = CustomWordStore(filename)
+        _stores[filename] = store
+    return store
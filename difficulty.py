@@ -0,0 +1,396 @@
+import argparse
+import csv
+import hashlib
+import io
+import locale
+import os
+import tempfile
+
+import numpy as np
+
+from word_catalog import DIFFICULTY_LEVELS
+
+# Scores how hard every word of a word file is to guess, from the whole corpus
+# at once, and suggests an EASY/MEDIUM/HARD tier for it. A word is harder when:
+#   - it is short (fewer letters to find),
+#   - it has few different letters (fewer guesses can hit),
+#   - its letters are rare in the corpus (frequent-letter guesses miss),
+#   - many other words differ from it in one letter only (CAT, BAT, HAT, ...).
+# Each feature is turned into a percentile rank over the corpus and the score is
+# their weighted sum (0 = easiest, 1 = hardest). Tiers keep the file's own share
+# of EASY, MEDIUM and HARD words, given to the words in score order.
+#
+# The per-row features are cached next to the file (<file>.difficulty.npz) with
+# a hash of the bytes they were read from. When the file has only been appended
+# to (like custom_words.csv), only the new rows are parsed and scored again.
+#
+# Usage: python difficulty.py words.csv [--mismatches] [--write rescored.csv]
+
+# Weight of each feature in the score
+WEIGHTS = {"length": 0.2, "unique": 0.2, "rarity": 0.35, "neighbours": 0.25}
+
+CACHE_SUFFIX = ".difficulty.npz"
+CACHE_VERSION = 1
+HASH_CHUNK_SIZE = 1 << 20
+
+# Lookup table from byte value to letter code (26 for anything outside A-Z)
+_CODES = np.full(256, 26, dtype=np.uint8)
+_CODES[np.arange(65, 91)] = np.arange(26, dtype=np.uint8)
+
+_HASH_BASE = np.uint64(0x9E3779B97F4A7C15)  # Odd 64-bit multiplier for the row hashes
+
+
+# Function to compute the features of each word that do not depend on the rest
+# of the corpus: length, number of different letters, and a bit mask of its letters
+def word_features(words):
+    if not words:
+        return (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32),
+                np.zeros(0, dtype=np.uint32))
+    raw = np.frombuffer("".join(words).encode("latin-1", "replace"), dtype=np.uint8)
+    lengths = np.array([len(word) for word in words], dtype=np.int32)
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    codes = _CODES[raw]
+    bits = np.where(codes < 26, np.left_shift(np.uint32(1), codes.astype(np.uint32)), np.uint32(0))
+    masks = np.bitwise_or.reduceat(bits, starts).astype(np.uint32)
+    unique = np.zeros(len(words), dtype=np.int32)
+    for code in range(26):
+        unique += ((masks >> np.uint32(code)) & np.uint32(1)).astype(np.int32)
+    return lengths, unique, masks
+
+
+# Function to get each value's percentile rank among sorted values (ties share the mid rank)
+def _ranks(sorted_values, values):
+    if len(sorted_values) < 2:
+        return np.full(np.shape(values), 0.5)
+    low = np.searchsorted(sorted_values, values, side="left")
+    high = np.searchsorted(sorted_values, values, side="right")
+    return (low + high - 1) / 2 / (len(sorted_values) - 1)
+
+
+# Function to get the percentile rank of every value within the values themselves.
+# Same result as _ranks(np.sort(values), values), without a binary search per value.
+def _corpus_ranks(values):
+    if len(values) < 2:
+        return np.full(len(values), 0.5)
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    below = np.cumsum(counts) - counts
+    return ((below + (counts - 1) / 2) / (len(values) - 1))[inverse.ravel()]
+
+
+# Class holding the scores and suggested tiers of every word in a file
+class DifficultyAnalysis:
+    def __init__(self, words, labels, lengths, unique, masks, neighbours=None):
+        self.words = words
+        self.labels = labels
+        self.lengths = lengths
+        self.unique = unique
+        total = len(words)
+
+        # Rarity: average information (bits) of the word's letters, from the
+        # share of corpus words containing each letter
+        present = ((masks[:, None] >> np.arange(26, dtype=np.uint32)) & np.uint32(1)).astype(bool)
+        letter_counts = present.sum(axis=0)
+        self.letter_rarity = -np.log2((letter_counts + 1) / (total + 1))
+        self.rarity = (present @ self.letter_rarity) / np.maximum(unique, 1)
+
+        # Neighbours: other words of the same length that differ in exactly one position
+        # (the slowest part, so counts saved with an unchanged file are used as they are)
+        self._groups = {}
+        if neighbours is None:
+            neighbours = np.zeros(total, dtype=np.int32)
+            for length in np.unique(lengths):
+                if length > 0:
+                    indices = np.flatnonzero(lengths == length)
+                    neighbours[indices] = _neighbour_counts(self._group(int(length)))
+        self.neighbours = neighbours
+
+        features = {"length": lengths, "unique": unique, "rarity": self.rarity,
+                    "neighbours": self.neighbours}
+        self._sorted = {name: np.sort(values) for name, values in features.items()}
+        ranks = {name: _corpus_ranks(values) for name, values in features.items()}
+        self.scores = (WEIGHTS["length"] * (1 - ranks["length"])
+                       + WEIGHTS["unique"] * (1 - ranks["unique"])
+                       + WEIGHTS["rarity"] * ranks["rarity"]
+                       + WEIGHTS["neighbours"] * ranks["neighbours"])
+
+        # Tier cut-offs: the same share of each tier as the file's own labels
+        counts = np.array([labels.count(level) for level in DIFFICULTY_LEVELS], dtype=float)
+        if counts.sum() == 0:
+            counts[:] = 1
+        shares = np.cumsum(counts / counts.sum())[:-1]
+        self.thresholds = np.quantile(self.scores, shares) if total else np.zeros(len(shares))
+        self.tiers = np.searchsorted(self.thresholds, self.scores, side="right")
+
+    # Matrix of the words of one length, one word per row (built on first use)
+    def _group(self, length):
+        matrix = self._groups.get(length)
+        if matrix is None:
+            indices = np.flatnonzero(self.lengths == length)
+            raw = np.frombuffer("".join(self.words[i] for i in indices).encode("latin-1", "replace"),
+                                dtype=np.uint8)
+            matrix = raw.reshape(len(indices), length)
+            self._groups[length] = matrix
+        return matrix
+
+    def _score(self, lengths, unique, rarity, neighbours):
+        return (WEIGHTS["length"] * (1 - _ranks(self._sorted["length"], lengths))
+                + WEIGHTS["unique"] * (1 - _ranks(self._sorted["unique"], unique))
+                + WEIGHTS["rarity"] * _ranks(self._sorted["rarity"], rarity)
+                + WEIGHTS["neighbours"] * _ranks(self._sorted["neighbours"], neighbours))
+
+    def __len__(self):
+        return len(self.words)
+
+    # Suggested tier name for the word at an index
+    def suggested(self, index):
+        return DIFFICULTY_LEVELS[self.tiers[index]]
+
+    # Score a word that is not in the file against this corpus: (score, tier name)
+    def score_word(self, word):
+        word = word.strip().upper()
+        lengths, unique, masks = word_features([word])
+        present = ((masks[0] >> np.arange(26, dtype=np.uint32)) & np.uint32(1)).astype(bool)
+        rarity = (present @ self.letter_rarity) / max(unique[0], 1)
+        neighbours = 0
+        matrix = self._group(len(word))
+        if len(matrix):
+            row = np.frombuffer(word.encode("latin-1", "replace"), dtype=np.uint8)
+            neighbours = int(np.count_nonzero((matrix != row).sum(axis=1) == 1))
+        score = float(self._score(lengths, unique, np.array([rarity]), np.array([neighbours]))[0])
+        return score, DIFFICULTY_LEVELS[int(np.searchsorted(self.thresholds, score, side="right"))]
+
+    # Indices of words whose label is at least min_gap tiers away from the suggestion
+    # (e.g. min_gap=2: labelled EASY but scored HARD, or the other way round)
+    def mismatches(self, min_gap=2):
+        found = []
+        for index, label in enumerate(self.labels):
+            if label in DIFFICULTY_LEVELS:
+                if abs(DIFFICULTY_LEVELS.index(label) - self.tiers[index]) >= min_gap:
+                    found.append(index)
+        found.sort(key=lambda index: -abs(self.scores[index] - 0.5))
+        return found
+
+
+# Function to count how many times each key occurs among the keys
+def _key_counts(keys):
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    return counts[inverse.ravel()]
+
+
+# Function to count, for each row, the other distinct rows that differ in one position.
+# Rows are compared by a 64-bit polynomial hash; the hash of a row with one position
+# blanked out is the row's hash minus that position's term, so no copies are made.
+# (Collisions are possible in principle but vanishingly rare at corpus sizes.)
+def _neighbour_counts(matrix):
+    length = matrix.shape[1]
+    with np.errstate(over="ignore"):
+        powers = np.cumprod(np.full(length, _HASH_BASE, dtype=np.uint64))
+        terms = (matrix.astype(np.uint64) + np.uint64(1)) * powers
+        keys = terms.sum(axis=1, dtype=np.uint64)
+        # Count among distinct words only, then give every copy its word's count
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        keys = keys[first]
+        terms = terms[first]
+        total = np.zeros(len(keys), dtype=np.int32)
+        for position in range(length):
+            total += _key_counts(keys - terms[:, position]) - 1
+    return total[inverse.ravel()]
+
+
+# Function to read (word, label) rows from bytes of a word file
+def _parse_rows(data, encoding, skip_header):
+    words = []
+    labels = []
+    for row in csv.reader(io.StringIO(data.decode(encoding, "replace"), newline="")):
+        if not row or len(row) < 3:  # Ensure row has required columns
+            continue
+        if skip_header and not words and [cell.strip().lower() for cell in row[:3]] == ["word", "difficulty", "hint"]:
+            continue
+        word = row[0].strip().upper()
+        if word:
+            words.append(word)
+            labels.append(row[1].strip().upper())
+    return words, labels
+
+
+# Function to hash the first size bytes of a file
+def _hash_prefix(filename, size):
+    digest = hashlib.sha256()
+    with open(filename, "rb") as file:
+        while size > 0:
+            chunk = file.read(min(HASH_CHUNK_SIZE, size))
+            if not chunk:
+                break
+            digest.update(chunk)
+            size -= len(chunk)
+    return np.frombuffer(digest.digest(), dtype=np.uint8)
+
+
+def _load_cache(cache_name):
+    try:
+        with np.load(cache_name) as cache:
+            if int(cache["version"]) != CACHE_VERSION:
+                return None
+            return {name: cache[name] for name in cache.files}
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _save_cache(cache_name, **arrays):
+    directory = os.path.dirname(os.path.abspath(cache_name))
+    fd, temp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            np.savez(file, version=CACHE_VERSION, **arrays)
+        os.replace(temp_name, cache_name)
+    except BaseException:
+        os.remove(temp_name)
+        raise
+
+
+def _join(strings):
+    return np.frombuffer("\n".join(strings).encode("utf-8"), dtype=np.uint8)
+
+
+def _split(array, count):
+    if count == 0:
+        return []
+    return array.tobytes().decode("utf-8").split("\n")
+
+
+# Function to analyse a word file, reusing the cached features of rows read before
+def analyze(filename, use_cache=True, encoding=None):
+    if encoding is None:
+        encoding = locale.getpreferredencoding(False)  # Same as open() uses
+    cache_name = filename + CACHE_SUFFIX
+    size = os.path.getsize(filename)
+
+    cache = _load_cache(cache_name) if use_cache else None
+    start = 0
+    if cache is not None:
+        start = int(cache["size"])
+        if start > size or not np.array_equal(_hash_prefix(filename, start), cache["hash"]):
+            cache = None  # Changed, not just appended to: score every row again
+            start = 0
+
+    with open(filename, "rb") as file:
+        file.seek(start)
+        data = file.read()
+    # Only whole lines are cached; a last line without a line ending is read again next time
+    complete = data.rfind(b"\n") + 1
+    new_words, new_labels = _parse_rows(data[:complete], encoding, skip_header=start == 0)
+    tail_words, tail_labels = _parse_rows(data[complete:], encoding,
+                                          skip_header=start == 0 and not new_words)
+
+    new_lengths, new_unique, new_masks = word_features(new_words)
+    if cache is not None:
+        count = int(cache["count"])
+        words = _split(cache["words"], count) + new_words
+        labels = _split(cache["labels"], count) + new_labels
+        lengths = np.concatenate((cache["lengths"], new_lengths))
+        unique = np.concatenate((cache["unique"], new_unique))
+        masks = np.concatenate((cache["masks"], new_masks))
+    else:
+        words, labels, lengths, unique, masks = new_words, new_labels, new_lengths, new_unique, new_masks
+
+    if tail_words:
+        tail_lengths, tail_unique, tail_masks = word_features(tail_words)
+        analysis = DifficultyAnalysis(words + tail_words, labels + tail_labels,
+                                      np.concatenate((lengths, tail_lengths)),
+                                      np.concatenate((unique, tail_unique)),
+                                      np.concatenate((masks, tail_masks)))
+    elif cache is not None and not new_words and "neighbours" in cache:
+        return DifficultyAnalysis(words, labels, lengths, unique, masks, cache["neighbours"])
+    else:
+        analysis = DifficultyAnalysis(words, labels, lengths, unique, masks)
+
+    if use_cache and (cache is None or new_words or "neighbours" not in cache):
+        # The neighbour counts are saved too when they cover exactly the cached rows
+        scored = {} if tail_words else {"neighbours": analysis.neighbours}
+        try:
+            _save_cache(cache_name, size=start + complete, hash=_hash_prefix(filename, start + complete),
+                        count=len(words), words=_join(words), labels=_join(labels),
+                        lengths=lengths, unique=unique, masks=masks, **scored)
+        except OSError:
+            pass  # The cache only saves time; without it every row is scored next time
+    return analysis
+
+
+# Analyses kept for the whole process, redone when their file changes
+_analyses = {}
+
+
+# Function to get the (up to date) analysis of a word file, or None if it does not exist
+def get_analysis(filename):
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _analyses.get(filename)
+    if cached is None or cached[0] != signature:
+        cached = (signature, analyze(filename))
+        _analyses[filename] = cached
+    return cached[1]
+
+
+# Function to suggest a difficulty level for a new word, scored against a word file
+def suggest_difficulty(word, filename="words.csv"):
+    analysis = get_analysis(filename)
+    if analysis is None or not len(analysis):
+        return None
+    return analysis.score_word(word)[1]
+
+
+# Function to write a copy of the word file with the suggested difficulty levels
+def write_tiers(filename, analysis, output):
+    hints = {}
+    with open(filename, "r", newline="") as file:
+        for row in csv.reader(file):
+            if row and len(row) >= 3:
+                hints.setdefault(row[0].strip().upper(), []).append(row[2])
+    with open(output, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["word", "difficulty", "hint"])
+        for index, word in enumerate(analysis.words):
+            word_hints = hints.get(word)
+            hint = word_hints.pop(0) if word_hints else ""
+            writer.writerow([word.lower(), analysis.suggested(index), hint])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score how hard the words of a word file are.")
+    parser.add_argument("file", nargs="?", default="words.csv")
+    parser.add_argument("--mismatches", action="store_true",
+                        help="list words labelled two tiers away from their score")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--write", help="write the words with their suggested difficulty to this file")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    analysis = analyze(args.file, use_cache=not args.no_cache)
+    print(f"===== Difficulty of {len(analysis)} words in {args.file} =====")
+    print("%-10s" % "label" + "".join("%10s" % level for level in DIFFICULTY_LEVELS) + "   (suggested)")
+    for label in DIFFICULTY_LEVELS:
+        counts = [0] * len(DIFFICULTY_LEVELS)
+        for index in range(len(analysis)):
+            if analysis.labels[index] == label:
+                counts[analysis.tiers[index]] += 1
+        print("%-10s" % label + "".join("%10d" % count for count in counts))
+
+    if args.mismatches:
+        print("\n%-20s %8s %10s %7s %7s %7s %10s" % (
+            "word", "label", "suggested", "score", "unique", "rarity", "neighbours"))
+        for index in analysis.mismatches()[:args.limit]:
+            print("%-20s %8s %10s %7.2f %7d %7.2f %10d" % (
+                analysis.words[index], analysis.labels[index], analysis.suggested(index),
+                analysis.scores[index], analysis.unique[index], analysis.rarity[index],
+                analysis.neighbours[index]))
+
+    if args.write:
+        write_tiers(args.file, analysis, args.write)
+        print(f"\nWrote the suggested difficulty levels to {args.write}")
+
+
+if __name__ == "__main__":
+    main()
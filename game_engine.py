@@ -0,0 +1,166 @@
+from spelling import compose, spell_word
+
+# Rules of the game
+STARTING_SCORE = 100
+MAX_ATTEMPTS = 6  # Player has 6 incorrect guesses before losing
+POINTS_PER_GUESS = 10  # Added for a correct guess, taken away for a wrong one
+HINT_AFTER_WRONG_GUESSES = 3
+
+# Results returned by HangmanGame.guess()
+INVALID = 0
+REPEATED_LETTER = 1
+WRONG_LETTER = 2
+CORRECT_LETTER = 3
+REPEATED_WORD = 4
+WRONG_WORD = 5
+CORRECT_WORD = 6
+
+
+# Class holding the state of one game, without any input or output
+class HangmanGame:
+    __slots__ = (
+        "word", "hint", "score", "remaining_attempts", "wrong_guesses", "guess_count",
+        "hint_shown", "guessed_letters", "won", "hit_points", "miss_points",
+        "_letters", "_keys", "_folded", "_positions", "_fills", "_guessed_mask", "_guessed_keys",
+        "_revealed", "_hidden", "_guessed_words",
+    )
+
+    # spelling is the word's spelling.WordSpelling, when it was worked out
+    # beforehand (a word pack, or one round played by several players)
+    def __init__(self, word, hint, score=STARTING_SCORE, attempts=MAX_ATTEMPTS,
+                 hit_points=POINTS_PER_GUESS, miss_points=POINTS_PER_GUESS, spelling=None):
+        self.word = word
+        self.hint = hint
+        self.score = score
+        self.hit_points = hit_points  # Added for a correct guess
+        self.miss_points = miss_points  # Taken away for a wrong guess
+        self.remaining_attempts = attempts
+        self.wrong_guesses = 0
+        self.guess_count = 0
+        self.hint_shown = False
+        self.guessed_letters = []  # In the order they were guessed, for display
+        self.won = False
+
+        # Index of where each letter appears (by its key, so a guess also
+        # uncovers the same letter with an accent), so a guess only touches its hits.
+        # The reveal mask is a bytearray, or a list for words outside Latin-1.
+        if spelling is None:
+            spelling = spell_word(word)
+        self._letters = spelling.letters
+        self._keys = spelling.letters.keys  # character -> key, for letters seen before
+        self._folded = spelling.folded
+        self._positions = spelling.positions
+        self._fills = spelling.fills
+        if isinstance(self._fills, bytes):
+            self._revealed = bytearray(b"_" * len(word))
+        else:
+            self._revealed = ["_"] * len(word)
+        self._guessed_mask = 0  # Bit (ord(key) - ord("a")) is set once a letter is guessed
+        self._guessed_keys = None  # Keys of guessed letters outside a to z, once there are any
+        self._hidden = len(word)  # Positions still showing "_"
+        self._guessed_words = set()
+
+    # The word with unguessed letters shown as "_"
+    @property
+    def word_completion(self):
+        if isinstance(self._revealed, bytearray):
+            return self._revealed.decode("latin-1")
+        return "".join(self._revealed)
+
+    # Number of letters still shown as "_"
+    @property
+    def letters_left(self):
+        return self._hidden
+
+    @property
+    def is_over(self):
+        return self.won or self.remaining_attempts <= 0
+
+    # The hint is offered once the player has made enough wrong guesses
+    @property
+    def hint_available(self):
+        return self.wrong_guesses >= HINT_AFTER_WRONG_GUESSES and not self.hint_shown
+
+    def take_hint(self):
+        self.hint_shown = True
+        return self.hint
+
+    # Process a letter or whole-word guess and return one of the result constants.
+    # The letter's key is looked up before the guess is put in capitals, as a few
+    # letters turn into several in capitals ("ß" into "SS"); a guess that already
+    # did is taken as that letter when the word has it (a capital "SS" for a word
+    # with "ß"), and otherwise as a whole-word guess.
+    def guess(self, guess):
+        if len(guess) != 1 and not guess.isascii():
+            guess = compose(guess)  # A letter and its accent typed as two characters
+        key = None
+        if len(guess) == 1:
+            key = self._keys.get(guess) or self._letters.key(guess)
+            upper = guess.upper()
+            if len(upper) == 1:
+                guess = upper
+        else:
+            folded = guess.casefold()
+            if len(folded) > 1 and folded in self._positions:
+                key = folded  # A letter of this word that is several letters in capitals
+            guess = guess.upper()
+
+        # Process a single letter guess
+        if key is not None and guess.isalpha():
+            if len(key) == 1 and key < "\x80":
+                bit = 1 << (ord(key) - 97)
+                if self._guessed_mask & bit:
+                    return REPEATED_LETTER
+                self._guessed_mask |= bit
+            else:
+                if self._guessed_keys is None:
+                    self._guessed_keys = set()
+                elif key in self._guessed_keys:
+                    return REPEATED_LETTER
+                self._guessed_keys.add(key)
+            self.guessed_letters.append(guess)
+            self.guess_count += 1
+
+            indices = self._positions.get(key)
+            if indices is None:
+                self._wrong_guess()
+                return WRONG_LETTER
+
+            fills = self._fills
+            revealed = self._revealed
+            for index in indices:
+                revealed[index] = fills[index]
+            self._hidden -= len(indices)
+            self.score += self.hit_points  # Reward for correct guess
+            if self._hidden == 0:
+                self.won = True
+            return CORRECT_LETTER
+
+        # Process a full word guess (compared as keys, so "STRASSE" is "STRAßE")
+        if key is None and guess.isalpha():
+            if guess != self.word:
+                guess = self._letters.fold(guess)
+                if len(guess) != len(self._folded):
+                    return INVALID
+            else:
+                guess = self._folded
+            if guess in self._guessed_words:
+                return REPEATED_WORD
+            self.guess_count += 1
+            if guess != self._folded:
+                self._guessed_words.add(guess)
+                self._wrong_guess()
+                return WRONG_WORD
+
+            self._revealed[:] = self._fills
+            self._hidden = 0
+            self.won = True
+            self.score += self.hit_points  # Reward for correct guess
+            return CORRECT_WORD
+
+        return INVALID
+
+    def _wrong_guess(self):
+        self.remaining_attempts -= 1
+        self.wrong_guesses += 1
+        self.score -= self.miss_points  # Penalty for wrong guess
@@ -0,0 +1,476 @@
+import argparse
+import atexit
+import mmap
+import sys
+import time
+
+from game_engine import (CORRECT_LETTER, CORRECT_WORD, POINTS_PER_GUESS, WRONG_LETTER,
+                         WRONG_WORD, HangmanGame)
+from spelling import spell_word
+from word_catalog import DIFFICULTY_LEVELS
+
+# Binary log of played games, one event per guess, for reproducing bug reports
+# and re-scoring old games when the scoring rules change. The file is a header
+# (magic "HMGL", version) followed by records, each a type byte, the length of
+# the record as a varint and the record itself:
+#
+#   session  the time the log was opened (varint ms since the epoch); starts a
+#            new word table, so every run of the game only appends to the file
+#   word     a word (UTF-8), given the next word id of the session
+#   seed     seed of the random number stream the next games were played with
+#            (varint; see seeding.py); the games after it are its rounds 0, 1, ...
+#   game     start time (varint ms after the session start, zigzag), difficulty
+#            (byte), word id (varint), starting score (varint, zigzag), attempts
+#            (byte), final score (varint, zigzag), number of events (varint),
+#            one byte per event, the text of each TEXT event (varint length,
+#            UTF-8), then one varint per event with the ms since the previous one
+#
+# An event byte holds the guess in its low 5 bits (0-25 for the letters A-Z,
+# TEXT for any other guess, HINT for a hint taken) and two flags: HIT if the
+# guess scored points and MISS if it cost points. Re-scoring a game is just
+# counting the flags, which is done on the whole event block at once; a replay
+# of the guesses does not need to decode the times.
+#
+# Usage: python game_log.py games.hlog --hit-points 10 --miss-points 5
+#        python game_log.py games.hlog --show 41
+LOG_MAGIC = b"HMGL"
+LOG_VERSION = 1
+
+RECORD_SESSION = 1
+RECORD_WORD = 2
+RECORD_GAME = 3
+RECORD_SEED = 4
+
+TEXT = 26  # A whole word or anything else that is not one letter A-Z
+HINT = 27
+HIT = 0x80
+MISS = 0x40
+_KIND = 0x1F
+
+# Guess for each letter event
+_LETTERS = [chr(65 + kind) for kind in range(26)]
+
+NO_DIFFICULTY = 255
+
+# Bytes with the HIT (or MISS) flag, deleted to count the events that have it
+_HIT_BYTES = bytes(b for b in range(256) if b & HIT)
+_MISS_BYTES = bytes(b for b in range(256) if b & MISS)
+_LETTER_BYTES = bytes(b for b in range(256) if (b & _KIND) < TEXT)
+
+
+# Function to add an unsigned varint (7 bits per byte, low bits first) to a buffer
+def write_varint(buffer, value):
+    while value > 0x7F:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+# Function to read a varint from data at pos; returns the value and the next pos
+def read_varint(data, pos):
+    byte = data[pos]
+    if byte < 0x80:
+        return byte, pos + 1
+    value = byte & 0x7F
+    shift = 7
+    while True:
+        pos += 1
+        byte = data[pos]
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos + 1
+        shift += 7
+
+
+# Functions to map signed numbers to unsigned ones (0, -1, 1, -2, ...) for varints
+def zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value):
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+# Function to make the event byte for a guess and its result
+def event_code(guess, result):
+    if len(guess) == 1 and "A" <= guess <= "Z":
+        code = ord(guess) - 65
+    else:
+        code = TEXT
+    if result == CORRECT_LETTER or result == CORRECT_WORD:
+        code |= HIT
+    elif result == WRONG_LETTER or result == WRONG_WORD:
+        code |= MISS
+    return code
+
+
+# Events of one game while it is being played; written to the log by finish()
+class GameRecording:
+    __slots__ = ("log", "difficulty", "seed", "start_score", "attempts", "started", "last",
+                 "codes", "deltas", "texts")
+
+    def __init__(self, log, game, difficulty):
+        self.log = log
+        self.difficulty = difficulty
+        self.seed = log.seed
+        self.start_score = game.score
+        self.attempts = game.remaining_attempts
+        self.started = time.time()
+        self.last = time.monotonic()
+        self.codes = bytearray()
+        self.deltas = bytearray()
+        self.texts = bytearray()
+
+    def _tick(self):
+        now = time.monotonic()
+        write_varint(self.deltas, int((now - self.last) * 1000))
+        self.last = now
+
+    def hint(self):
+        self.codes.append(HINT)
+        self._tick()
+
+    def guess(self, guess, result):
+        code = event_code(guess, result)
+        self.codes.append(code)
+        self._tick()
+        if code & _KIND == TEXT:
+            text = guess.encode("utf-8", "surrogatepass")
+            write_varint(self.texts, len(text))
+            self.texts += text
+
+    def finish(self, game):
+        self.log.write_game(self, game)
+
+
+# Class appending games to a log file
+class GameLog:
+    def __init__(self, filename, autoflush=True):
+        self.filename = filename
+        self.autoflush = autoflush  # Write each game to the file as soon as it ends
+        self._file = open(filename, "ab")
+        self.seed = None  # Seed of the random number stream games are being played with
+        self._written_seed = None
+        self._word_ids = {}
+        self._session_ms = int(time.time() * 1000)
+        if self._file.tell() == 0:
+            self._file.write(LOG_MAGIC + bytes((LOG_VERSION,)))
+        record = bytearray()
+        write_varint(record, self._session_ms)
+        self._write_record(RECORD_SESSION, record)
+
+    def start_game(self, game, difficulty=None):
+        return GameRecording(self, game, difficulty)
+
+    def _write_record(self, kind, payload):
+        header = bytearray((kind,))
+        write_varint(header, len(payload))
+        self._file.write(header + payload)
+
+    def _word_id(self, word):
+        word_id = self._word_ids.get(word)
+        if word_id is None:
+            word_id = len(self._word_ids)
+            self._word_ids[word] = word_id
+            self._write_record(RECORD_WORD, word.encode("utf-8", "surrogatepass"))
+        return word_id
+
+    def write_game(self, recording, game):
+        try:
+            difficulty = DIFFICULTY_LEVELS.index(recording.difficulty)
+        except ValueError:
+            difficulty = NO_DIFFICULTY
+        if recording.seed != self._written_seed and recording.seed is not None:
+            record = bytearray()
+            write_varint(record, recording.seed)
+            self._write_record(RECORD_SEED, record)
+            self._written_seed = recording.seed
+        record = bytearray()
+        write_varint(record, zigzag(int(recording.started * 1000) - self._session_ms))
+        record.append(difficulty)
+        write_varint(record, self._word_id(game.word))
+        write_varint(record, zigzag(recording.start_score))
+        record.append(recording.attempts)
+        write_varint(record, zigzag(game.score))
+        write_varint(record, len(recording.codes))
+        record += recording.codes
+        record += recording.texts
+        record += recording.deltas
+        self._write_record(RECORD_GAME, record)
+        if self.autoflush:
+            self._file.flush()
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+# Logs shared by the whole process, one per file
+_logs = {}
+
+
+# Function to get the log for a file, opened once per process
+def get_game_log(filename="games.hlog"):
+    log = _logs.get(filename)
+    if log is None:
+        log = GameLog(filename)
+        _logs[filename] = log
+        atexit.register(log.close)
+    return log
+
+
+# One game read back from a log
+class LoggedGame:
+    __slots__ = ("word", "difficulty", "started", "start_score", "attempts", "score",
+                 "codes", "events", "seed", "round")
+
+    def __init__(self, word, difficulty, started, start_score, attempts, score, codes, events,
+                 seed=None, round=0):
+        self.word = word
+        self.difficulty = difficulty
+        self.seed = seed  # Seed of the random number stream the game was played with, if known
+        self.round = round  # Games played with that stream before this one
+        self.started = started  # Seconds since the epoch
+        self.start_score = start_score
+        self.attempts = attempts
+        self.score = score  # Score the game ended with when it was played
+        self.codes = codes  # One byte per event
+        self.events = events  # Texts and time deltas of the events, decoded by timeline()
+
+    @property
+    def difficulty_name(self):
+        if self.difficulty < len(DIFFICULTY_LEVELS):
+            return DIFFICULTY_LEVELS[self.difficulty]
+        return None
+
+    # The guesses, in order (None for a hint), and where the time deltas start
+    def _guesses(self):
+        data = self.events
+        pos = 0
+        guesses = []
+        for code in self.codes:
+            kind = code & _KIND
+            if kind < TEXT:
+                guesses.append(_LETTERS[kind])
+            elif kind == TEXT:
+                length, pos = read_varint(data, pos)
+                guesses.append(data[pos:pos + length].decode("utf-8", "surrogatepass"))
+                pos += length
+            else:
+                guesses.append(None)
+        return guesses, pos
+
+    # Decode the events: (guess or None for a hint, ms since the previous event, flags)
+    def timeline(self):
+        guesses, pos = self._guesses()
+        events = []
+        for code, guess in zip(self.codes, guesses):
+            delta, pos = read_varint(self.events, pos)
+            events.append((guess, delta, code & (HIT | MISS)))
+        return events
+
+
+# Class reading the games in a log, in the order they were played. Once a game
+# is read, checkpoint is where to carry on from; a reader given that checkpoint
+# later only reads the games added since (the file is never read from the start
+# again, only from the start of the current session, skipping its old games).
+class GameLogReader:
+    def __init__(self, filename, checkpoint=None):
+        self.filename = filename
+        self.checkpoint = checkpoint  # (offset of the session, offset after the last game read)
+
+    def __iter__(self):
+        with open(self.filename, "rb") as file:
+            if file.read(len(LOG_MAGIC) + 1) != LOG_MAGIC + bytes((LOG_VERSION,)):
+                raise ValueError("%s is not a game log" % self.filename)
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        with data:
+            session, skip = len(LOG_MAGIC) + 1, 0
+            if self.checkpoint is not None:
+                if self.checkpoint[1] <= len(data) and data[self.checkpoint[0]] == RECORD_SESSION:
+                    session, skip = self.checkpoint
+                # Otherwise the log was replaced by another one: read it all
+            yield from self._read_records(data, session, skip)
+
+    def _read_records(self, data, pos, skip):
+        end = len(data)
+        words = []
+        session = pos
+        session_ms = 0
+        seed = None
+        rounds = 0
+        # Most varints here are a single byte, so read_varint() is only called
+        # for the ones that are not (a byte under 0x80 is the whole value)
+        while pos < end:
+            kind = data[pos]
+            try:
+                length = data[pos + 1]
+                if length < 0x80:
+                    start = pos + 2
+                else:
+                    length, start = read_varint(data, pos + 1)
+            except IndexError:
+                break
+            record_end = start + length
+            if record_end > end:
+                break  # Cut off by a crash while the game was being written
+            if kind == RECORD_GAME:
+                if record_end > skip:
+                    started, start = read_varint(data, start)  # Milliseconds: several bytes
+                    difficulty = data[start]
+                    word_id = data[start + 1]
+                    if word_id < 0x80:
+                        start += 2
+                    else:
+                        word_id, start = read_varint(data, start + 1)
+                    start_score = data[start]
+                    if start_score < 0x80:
+                        start += 1
+                    else:
+                        start_score, start = read_varint(data, start)
+                    attempts = data[start]
+                    score = data[start + 1]
+                    if score < 0x80:
+                        start += 2
+                    else:
+                        score, start = read_varint(data, start + 1)
+                    count = data[start]
+                    if count < 0x80:
+                        start += 1
+                    else:
+                        count, start = read_varint(data, start)
+                    game = LoggedGame(words[word_id], difficulty, (session_ms + unzigzag(started)) / 1000,
+                                      unzigzag(start_score), attempts, unzigzag(score),
+                                      data[start:start + count], data[start + count:record_end],
+                                      seed, rounds)
+                    self.checkpoint = (session, record_end)
+                    yield game
+                rounds += 1
+            elif kind == RECORD_WORD:
+                words.append(data[start:record_end].decode("utf-8", "surrogatepass"))
+            elif kind == RECORD_SEED:
+                seed = read_varint(data, start)[0]
+                rounds = 0
+            elif kind == RECORD_SESSION:
+                session = pos
+                session_ms = read_varint(data, start)[0]
+                words = []
+                seed = None
+            pos = record_end
+
+
+# Function to read every game in a log, in the order they were played
+def read_games(filename):
+    return iter(GameLogReader(filename))
+
+
+# Function to get the score of a logged game under other scoring rules
+# (the same rules as HangmanGame, from the flags recorded for each guess)
+def rescore(game, hit_points=POINTS_PER_GUESS, miss_points=POINTS_PER_GUESS):
+    codes = game.codes
+    hits = len(codes) - len(codes.translate(None, _HIT_BYTES))
+    misses = len(codes) - len(codes.translate(None, _MISS_BYTES))
+    return game.start_score + hits * hit_points - misses * miss_points
+
+
+# Function to play a logged game again, guess by guess, through HangmanGame.
+# Returns the finished game and the results of its guesses. spellings is a
+# dictionary (word -> spelling.WordSpelling) kept by the caller across games,
+# so the spelling of a word that comes up in many games is worked out once.
+def replay(game, hit_points=POINTS_PER_GUESS, miss_points=POINTS_PER_GUESS, spellings=None):
+    word = game.word
+    spelling = None
+    if spellings is not None:
+        spelling = spellings.get(word)
+        if spelling is None:
+            spelling = spellings[word] = spell_word(word)
+    played = HangmanGame(word, "", score=game.start_score, attempts=game.attempts,
+                         hit_points=hit_points, miss_points=miss_points, spelling=spelling)
+    guess = played.guess
+    letters = _LETTERS
+    codes = game.codes
+    if not codes.translate(None, _LETTER_BYTES):
+        # Letters only: guessed straight from the event bytes
+        return played, [guess(letters[code & _KIND]) for code in codes]
+    # Words and hints too: the words are decoded as they come (the event times are not needed)
+    results = []
+    data = game.events
+    pos = 0
+    for code in codes:
+        kind = code & _KIND
+        if kind < TEXT:
+            results.append(guess(letters[kind]))
+        elif kind == TEXT:
+            length, pos = read_varint(data, pos)
+            results.append(guess(data[pos:pos + length].decode("utf-8", "surrogatepass")))
+            pos += length
+        else:
+            played.take_hint()
+    return played, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score or replay a Hangman game log.")
+    parser.add_argument("log", nargs="?", default="games.hlog")
+    parser.add_argument("--hit-points", type=int, default=POINTS_PER_GUESS)
+    parser.add_argument("--miss-points", type=int, default=POINTS_PER_GUESS)
+    parser.add_argument("--replay", action="store_true",
+                        help="play every game again through HangmanGame and check the scores")
+    parser.add_argument("--show", type=int, metavar="N", help="print the guesses of game N (from 0)")
+    args = parser.parse_args()
+
+    if args.show is not None:
+        for index, game in enumerate(read_games(args.log)):
+            if index == args.show:
+                break
+        else:
+            sys.exit("The log has no game %d" % args.show)
+        print("%s  %s  %s  score %d" % (time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(game.started)),
+                                       game.difficulty_name, game.word, game.score))
+        if game.seed is not None:
+            print("Random seed %d, round %d" % (game.seed, game.round))
+        played = HangmanGame(game.word, "", score=game.start_score, attempts=game.attempts,
+                             hit_points=args.hit_points, miss_points=args.miss_points)
+        elapsed = 0
+        for guess, delta, flags in game.timeline():
+            elapsed += delta
+            if guess is None:
+                played.take_hint()
+                guess = "(hint)"
+            else:
+                played.guess(guess)
+            print("%9.3fs  %-12s %s  score %d" % (elapsed / 1000, guess, played.word_completion, played.score))
+        return
+
+    start = time.perf_counter()
+    games = events = changed = mismatched = 0
+    old_total = new_total = 0
+    spellings = {}
+    for game in read_games(args.log):
+        if args.replay:
+            score = replay(game, args.hit_points, args.miss_points, spellings)[0].score
+            if score != rescore(game, args.hit_points, args.miss_points):
+                mismatched += 1
+        else:
+            score = rescore(game, args.hit_points, args.miss_points)
+        games += 1
+        events += len(game.codes)
+        old_total += game.score
+        new_total += score
+        changed += score != game.score
+    seconds = time.perf_counter() - start
+
+    print("%d games, %d events in %.3fs (%.0f events/s)" % (
+        games, events, seconds, events / seconds if seconds else 0))
+    if games:
+        print("Mean score: %.1f recorded, %.1f with +%d/-%d (%d games changed)" % (
+            old_total / games, new_total / games, args.hit_points, args.miss_points, changed))
+    if args.replay:
+        print("%d games replayed to a different score than the recorded flags give" % mismatched)
+
+
+if __name__ == "__main__":
+    main()
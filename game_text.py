@@ -0,0 +1,161 @@
+from game_engine import (CORRECT_LETTER, INVALID, REPEATED_LETTER, REPEATED_WORD,
+                         WRONG_LETTER, WRONG_WORD)
+
+# Text shared by the terminal game and the network server
+
+# Hangman drawing for each number of remaining attempts, built once at import time
+HANGMAN_STAGES = (
+    # final state: head, torso, both arms, and both legs (0 attempts left)
+    """
+                   --------
+                   |      |
+                   |      O
+                   |     \\|/
+                   |      |
+                   |     / \\
+                   -
+                """,
+    # head, torso, both arms, and one leg (1 attempt left)
+    """
+                   --------
+                   |      |
+                   |      O
+                   |     \\|/
+                   |      |
+                   |     /
+                   -
+                """,
+    # head, torso, and both arms (2 attempts left)
+    """
+                   --------
+                   |      |
+                   |      O
+                   |     \\|/
+                   |      |
+                   |
+                   -
+                """,
+    # head, torso, and one arm (3 attempts left)
+    """
+                   --------
+                   |      |
+                   |      O
+                   |     \\|
+                   |      |
+                   |
+                   -
+                """,
+    # head and torso (4 attempts left)
+    """
+                   --------
+                   |      |
+                   |      O
+                   |      |
+                   |      |
+                   |
+                   -
+                """,
+    # head only (5 attempts left)
+    """
+                   --------
+                   |      |
+                   |      O
+                   |
+                   |
+                   |
+                   -
+                """,
+    # initial empty state (6 attempts left)
+    """
+                   --------
+                   |      |
+                   |
+                   |
+                   |
+                   |
+                   -
+                """
+)
+
+# Main menu
+MENU_TEXT = """
+=========================
+     HANGMAN MENU       
+=========================
+(1) Play
+(2) Play with Custom Words
+(3) Add to Custom Words
+(4) Exit
+========================="""
+MENU_PROMPT = "Enter your choice (1-4): "
+
+# Difficulty selection
+DIFFICULTY_PROMPT = "Select difficulty level: Easy (E), Medium (M), Hard (H): "
+DIFFICULTY_RETRY_PROMPT = "Invalid choice. Please select difficulty level: Easy (E), Medium (M), Hard (H): "
+DIFFICULTY_NAMES = {"E": "EASY", "M": "MEDIUM", "H": "HARD"}
+
+# Prompts during a game
+HINT_PROMPT = "Would you like a hint? (Y/N): "
+GUESS_PROMPT = "Please guess a letter or word: "
+PLAY_AGAIN_PROMPT = "Play Again? (Y/N) "
+
+# Marathon mode
+MARATHON_PROMPT = "Next round? (Y/N) "
+
+
+# Function to get the message shown after a guess (None when there is nothing to say)
+def guess_message(result, guess):
+    if result == REPEATED_LETTER:
+        return "You already guessed the letter " + guess
+    if result == WRONG_LETTER:
+        return guess + " is not in the word."
+    if result == CORRECT_LETTER:
+        return "Good job, " + guess + " is in the word!"
+    if result == REPEATED_WORD:
+        return "You already guessed the word " + guess
+    if result == WRONG_WORD:
+        return guess + " is not the word."
+    if result == INVALID:
+        return "Not a valid guess."
+    return None
+
+
+# Function to get the guessed letters and current word as two lines of text
+def progress_text(word_completion, guessed_letters):
+    return "Guessed letters:  " + " ".join(guessed_letters) + "\nCurrent word:  " + word_completion
+
+
+# Function to get everything shown after a turn as one string: the message about
+# the guess (if any), the hangman frame and the progress, followed by a blank line
+def turn_text(game, message=None):
+    text = (HANGMAN_STAGES[game.remaining_attempts] + "\n"
+            + progress_text(game.word_completion, game.guessed_letters) + "\n\n\n")
+    if message is not None:
+        return message + "\n" + text
+    return text
+
+
+# Function to get the message shown when a game ends
+def end_message(game):
+    if game.won:
+        return "Congrats, you guessed the word! You win! Your score is: " + str(game.score)
+    return ("Sorry, you ran out of attempts. The word was " + game.word
+            + ". Maybe next time! Your score is: " + str(game.score))
+
+
+# Function to get the running totals shown after each marathon round
+def marathon_status(rounds, total_score, streak, best_streak):
+    return ("Round " + str(rounds) + " | Total score: " + str(total_score)
+            + " | Win streak: " + str(streak) + " (best " + str(best_streak) + ")")
+
+
+# Function to get the message shown when a marathon ends
+def marathon_end_message(rounds, total_score, best_streak):
+    return ("Marathon over after " + str(rounds) + " round(s). Final score: " + str(total_score)
+            + ". Best win streak: " + str(best_streak))
+
+
+# Function to get the message shown when adaptive mode picks a word
+def adaptive_message(difficulty, chance):
+    return ("Here is a " + difficulty + " word picked for you (you should solve it about "
+            + str(round(chance * 100)) + "% of the time)")
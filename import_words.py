@@ -0,0 +1,161 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+from custom_store import CustomWordStore
+from word_catalog import DIFFICULTY_LEVELS
+
+# Bulk import of custom words from a CSV, TSV or JSONL file.
+# Rows are read one at a time and written to custom_words.csv in large batches,
+# so memory does not grow with the size of the input (apart from the store's
+# duplicate index, one entry per distinct word).
+#
+# Usage: python import_words.py new_words.csv [--rejects rejects.csv]
+#   CSV/TSV rows:  word,difficulty,hint   (a "word,difficulty,hint" header is skipped)
+#   JSONL rows:    {"word": "...", "difficulty": "EASY", "hint": "..."}
+
+CHUNK_SIZE = 10000  # Accepted rows written per batch
+EXAMPLES_PER_REASON = 5  # Rejected rows shown in the report for each reason
+
+
+# Function to guess the file format from its extension
+def detect_format(filename):
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    if extension in (".tsv", ".tab"):
+        return "tsv"
+    return "csv"
+
+
+# Function to read (line number, word, difficulty, hint) tuples from a file, one at a time.
+# Rows that cannot be read at all come back with word set to None and the reason as hint.
+def read_rows(file, file_format):
+    if file_format == "jsonl":
+        for line_number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield line_number, None, None, "invalid JSON"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, None, None, "not a JSON object"
+                continue
+            yield (line_number, record.get("word"), record.get("difficulty"), record.get("hint"))
+        return
+
+    reader = csv.reader(file, delimiter="\t" if file_format == "tsv" else ",")
+    for row in reader:
+        if not row:
+            continue
+        if reader.line_num == 1 and [cell.strip().lower() for cell in row[:3]] == ["word", "difficulty", "hint"]:
+            continue  # Header row
+        if len(row) < 3:
+            yield reader.line_num, None, None, "missing columns"
+            continue
+        yield reader.line_num, row[0], row[1], row[2]
+
+
+# Function to check and normalise one row; returns (word, difficulty, hint, reject reason)
+def validate_row(word, difficulty, hint):
+    if not isinstance(word, str) or not word.strip():
+        return None, None, None, "empty word"
+    word = word.strip().lower()
+    if not word.isalpha():
+        return None, None, None, "word is not alphabetic"
+    if not isinstance(difficulty, str) or difficulty.strip().upper() not in DIFFICULTY_LEVELS:
+        return None, None, None, "bad difficulty"
+    if not isinstance(hint, str) or not hint.strip():
+        return None, None, None, "missing hint"
+    return word, difficulty.strip().upper(), hint.strip(), None
+
+
+# Function to import a word file into the custom words store and return the counts
+def import_words(filename, store, file_format=None, rejects_file=None, progress=None):
+    if file_format is None:
+        file_format = detect_format(filename)
+    counts = Counter()
+    examples = {}
+    rejects_writer = csv.writer(rejects_file) if rejects_file is not None else None
+    written_before = store.written
+    start = time.perf_counter()
+
+    with open(filename, "r", encoding="utf-8-sig", newline="") as file:
+        for line_number, word, difficulty, hint in read_rows(file, file_format):
+            counts["rows"] += 1
+            if word is None:
+                reason = hint
+            else:
+                word, difficulty, hint, reason = validate_row(word, difficulty, hint)
+                if reason is None and not store.add(word, difficulty, hint):
+                    reason = "duplicate"
+            if reason is None:
+                counts["accepted"] += 1
+            else:
+                counts[reason] += 1
+                reason_examples = examples.setdefault(reason, [])
+                if len(reason_examples) < EXAMPLES_PER_REASON:
+                    reason_examples.append(line_number)
+                if rejects_writer is not None:
+                    rejects_writer.writerow([line_number, reason])
+
+            if progress is not None and counts["rows"] % CHUNK_SIZE == 0:
+                progress(counts["rows"], time.perf_counter() - start)
+
+    # Rows added by another process during the import are dropped when the last batch is written
+    store.commit()
+    counts["written"] = store.written - written_before
+    counts["seconds"] = time.perf_counter() - start
+    return counts, examples
+
+
+# Function to print the summary and rejects report of an import
+def print_report(counts, examples):
+    rows = counts["rows"]
+    seconds = counts["seconds"]
+    print("\n===== Import Report =====")
+    print("Rows read:     ", rows)
+    print("Words added:   ", counts["written"])
+    rejected = rows - counts["accepted"]
+    print("Rows rejected: ", rejected)
+    for reason, lines in sorted(examples.items()):
+        shown = ", ".join(str(line) for line in lines)
+        if counts[reason] > len(lines):
+            shown += ", ..."
+        print("  %-24s %8d   (lines %s)" % (reason + ":", counts[reason], shown))
+    if counts["accepted"] > counts["written"]:
+        print("  %-24s %8d" % ("added by another process:", counts["accepted"] - counts["written"]))
+    print("Time: %.2fs (%.0f rows/sec)" % (seconds, rows / seconds if seconds else 0.0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import custom words in bulk.")
+    parser.add_argument("file", help="CSV, TSV or JSONL file of words")
+    parser.add_argument("--format", choices=["csv", "tsv", "jsonl"], default=None,
+                        help="file format (default: from the file extension)")
+    parser.add_argument("--custom-words", default="custom_words.csv")
+    parser.add_argument("--rejects", help="write the line number and reason of every rejected row here")
+    args = parser.parse_args()
+
+    def progress(rows, seconds):
+        print("  %d rows (%.0f rows/sec)" % (rows, rows / seconds if seconds else 0.0), file=sys.stderr)
+
+    store = CustomWordStore(args.custom_words, batch_size=CHUNK_SIZE)
+    rejects_file = open(args.rejects, "w", newline="") if args.rejects else None
+    try:
+        counts, examples = import_words(args.file, store, args.format, rejects_file, progress)
+    finally:
+        if rejects_file is not None:
+            rejects_file.close()
+    print_report(counts, examples)
+
+
+if __name__ == "__main__":
+    main()
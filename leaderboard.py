@@ -0,0 +1,236 @@
+import argparse
+import atexit
+import getpass
+import queue
+import sqlite3
+import threading
+import time
+
+from word_catalog import DIFFICULTY_LEVELS
+
+# Leaderboard of finished games, kept in a local SQLite database.
+# record() only puts the game on a queue; a background thread writes the queue
+# to the database in batches (one transaction per batch), so the end of a game
+# never waits for the disk. Every query is answered from an index:
+#
+#   top scores per difficulty   games_by_difficulty (difficulty, score DESC, finished)
+#   a player's best scores      games_by_player (player, difficulty, score DESC)
+#   daily rankings              games_by_day (day, difficulty, player, score)
+#
+# Usage: python leaderboard.py top --difficulty EASY
+#        python leaderboard.py best alice
+#        python leaderboard.py daily --day 2024-05-01
+
+BATCH_SIZE = 500  # Games written per transaction at most
+FLUSH_INTERVAL = 1.0  # Seconds a recorded game may wait before it is written
+
+# Markers put on the queue instead of a game
+_FLUSH = "flush"  # Write what is waiting now
+_STOP = "stop"  # Write what is waiting and end the writer thread
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    word TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    guesses INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    won INTEGER NOT NULL,
+    finished REAL NOT NULL,
+    day TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_difficulty ON games (difficulty, score DESC, finished);
+CREATE INDEX IF NOT EXISTS games_by_player ON games (player, difficulty, score DESC);
+CREATE INDEX IF NOT EXISTS games_by_day ON games (day, difficulty, player, score);
+CREATE INDEX IF NOT EXISTS games_by_player_recent ON games (player, finished);
+"""
+
+INSERT = ("INSERT INTO games (player, word, difficulty, score, guesses, seconds, won, finished, day)"
+          " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+
+# Function to get the name of the person running the game
+def default_player():
+    try:
+        return getpass.getuser()
+    except (KeyError, OSError):  # No user name in the environment or password database
+        return "player"
+
+
+# Function to get the day (YYYY-MM-DD, local time) a timestamp falls on
+def day_of(timestamp):
+    return time.strftime("%Y-%m-%d", time.localtime(timestamp))
+
+
+# Function to open the database, creating the table and indexes if needed
+def connect(filename):
+    connection = sqlite3.connect(filename, timeout=30, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")  # Readers do not wait for the writer
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+# Class recording finished games and answering leaderboard queries
+class Leaderboard:
+    def __init__(self, filename="leaderboard.db", batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.filename = filename
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._connection = connect(filename)  # Used for queries
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_batches, name="leaderboard-writer", daemon=True)
+        self._writer.start()
+
+    # Queue a finished game to be written
+    def record(self, player, word, difficulty, score, guesses, seconds, won, finished=None):
+        if finished is None:
+            finished = time.time()
+        self._queue.put((player, word, difficulty, score, guesses, seconds, int(won),
+                         finished, day_of(finished)))
+
+    # Wait until every recorded game is in the database
+    def flush(self):
+        self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._writer.join()
+        self._connection.close()
+
+    def _write_batches(self):
+        connection = connect(self.filename)
+        try:
+            while True:
+                # Gather games until the batch is full, the interval is over or a marker arrives
+                rows = []
+                item = self._queue.get()
+                deadline = time.monotonic() + self.flush_interval
+                while item != _FLUSH and item != _STOP:
+                    rows.append(item)
+                    timeout = deadline - time.monotonic()
+                    if len(rows) >= self.batch_size or timeout <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                try:
+                    if rows:
+                        with connection:  # Rolled back if the insert fails
+                            connection.executemany(INSERT, rows)
+                except sqlite3.Error as error:
+                    # Keep the thread going (and flush() returning); these games are lost
+                    print("Error: could not save games to the leaderboard (%d lost): %s" % (len(rows), error))
+                finally:
+                    for _ in range(len(rows) + (item == _FLUSH or item == _STOP)):
+                        self._queue.task_done()
+                if item == _STOP:
+                    return
+        finally:
+            connection.close()
+
+    # Best games at one difficulty: (player, word, score, guesses, seconds, finished)
+    def top_scores(self, difficulty, limit=10):
+        self.flush()
+        return self._connection.execute(
+            "SELECT player, word, score, guesses, seconds, finished FROM games"
+            " WHERE difficulty = ? ORDER BY score DESC, finished LIMIT ?",
+            (difficulty, limit)).fetchall()
+
+    # A player's best score at each difficulty they have played: {difficulty: score}
+    def personal_best(self, player, difficulties=DIFFICULTY_LEVELS):
+        self.flush()
+        best = {}
+        # One index lookup per difficulty (MAX() reads the first index entry only)
+        for difficulty in difficulties:
+            score = self._connection.execute(
+                "SELECT MAX(score) FROM games WHERE player = ? AND difficulty = ?",
+                (player, difficulty)).fetchone()[0]
+            if score is not None:
+                best[difficulty] = score
+        return best
+
+    # Players ranked by their best score on one day (today by default):
+    # (player, best score, games played)
+    def daily_ranking(self, day=None, difficulty=None, limit=10):
+        self.flush()
+        if day is None:
+            day = day_of(time.time())
+        if difficulty is None:
+            return self._connection.execute(
+                "SELECT player, MAX(score) AS best, COUNT(*) FROM games WHERE day = ?"
+                " GROUP BY player ORDER BY best DESC, player LIMIT ?",
+                (day, limit)).fetchall()
+        return self._connection.execute(
+            "SELECT player, MAX(score) AS best, COUNT(*) FROM games WHERE day = ? AND difficulty = ?"
+            " GROUP BY player ORDER BY best DESC, player LIMIT ?",
+            (day, difficulty, limit)).fetchall()
+
+    # A player's latest games, newest first: (word, difficulty, won)
+    def recent_games(self, player, limit=20):
+        self.flush()
+        return self._connection.execute(
+            "SELECT word, difficulty, won FROM games WHERE player = ? ORDER BY finished DESC LIMIT ?",
+            (player, limit)).fetchall()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Leaderboards shared by the whole process, one per database file
+_leaderboards = {}
+
+
+# Function to get the leaderboard for a database file (closed when the program ends)
+def get_leaderboard(filename="leaderboard.db"):
+    leaderboard = _leaderboards.get(filename)
+    if leaderboard is None:
+        leaderboard = Leaderboard(filename)
+        _leaderboards[filename] = leaderboard
+        atexit.register(leaderboard.close)  # Write the last games when the program ends
+    return leaderboard
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the Hangman leaderboard.")
+    parser.add_argument("--database", default="leaderboard.db")
+    commands = parser.add_subparsers(dest="command", required=True)
+    top = commands.add_parser("top", help="best games at a difficulty")
+    top.add_argument("--difficulty", default="EASY", type=str.upper)
+    top.add_argument("--limit", type=int, default=10)
+    best = commands.add_parser("best", help="a player's best scores")
+    best.add_argument("player", nargs="?", default=None)
+    daily = commands.add_parser("daily", help="players ranked by their best score on a day")
+    daily.add_argument("--day", help="YYYY-MM-DD (default: today)")
+    daily.add_argument("--difficulty", type=str.upper)
+    daily.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    with Leaderboard(args.database) as leaderboard:
+        if args.command == "top":
+            print(f"===== Top {args.limit} ({args.difficulty}) =====")
+            for rank, (player, word, score, guesses, seconds, finished) in enumerate(
+                    leaderboard.top_scores(args.difficulty, args.limit), 1):
+                print("%3d. %-16s %5d  %-16s %3d guesses  %6.1fs  %s" % (
+                    rank, player, score, word, guesses, seconds, day_of(finished)))
+        elif args.command == "best":
+            player = args.player or default_player()
+            print(f"===== Best scores for {player} =====")
+            for difficulty, score in sorted(leaderboard.personal_best(player).items()):
+                print("%-8s %5d" % (difficulty, score))
+        else:
+            print(f"===== Daily ranking ({args.day or day_of(time.time())}) =====")
+            for rank, (player, score, games) in enumerate(
+                    leaderboard.daily_ranking(args.day, args.difficulty, args.limit), 1):
+                print("%3d. %-16s %5d  (%d games)" % (rank, player, score, games))
+
+
+if __name__ == "__main__":
+    main()
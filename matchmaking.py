@@ -0,0 +1,258 @@
+import bisect
+import functools
+import itertools
+import math
+import operator
+import os
+import random
+from collections import deque
+
+from word_catalog import DIFFICULTY_LEVELS, get_catalog
+
+# Adaptive word choice: each player gets words they should solve about
+# TARGET_SOLVE_RATE of the time. Players and words both have a rating on the
+# same scale (log-odds), and a player with skill s solves a word with rating r
+# with probability 1 / (1 + e^(r - s)). After each game both ratings move
+# towards the result, like chess ratings.
+#
+# The words are kept in a list sorted by rating, so finding words near the
+# rating a player needs is a bisect. A new word is inserted in place and a word
+# whose rating changes is moved, so the list is never sorted again.
+TARGET_SOLVE_RATE = 0.6
+
+# Expected solve rates when there are no statistics for a word yet
+DEFAULT_SOLVE_RATES = {"EASY": 0.8, "MEDIUM": 0.6, "HARD": 0.4}
+PRIOR_GAMES = 10  # Games at the difficulty's rate mixed into a word's own statistics
+
+PLAYER_STEP = 0.4  # How far one game moves a player's skill (recent games count most)
+WORD_STEP = 0.05  # How far one game moves a word's rating
+BAND = 0.25  # Words within this much of the wanted rating are picked from at random
+RECENT_WORDS = 20  # A player's last words are not given again
+HISTORY_GAMES = 20  # Latest games replayed to work out a returning player's skill
+
+
+# Function to turn a probability into log-odds
+def logit(probability):
+    probability = min(max(probability, 0.01), 0.99)
+    return math.log(probability / (1 - probability))
+
+
+# Function to get the chance that a player with some skill solves a word with some rating
+def solve_probability(skill, rating):
+    return 1 / (1 + math.exp(rating - skill))
+
+
+# Class keeping the words of a word file sorted by rating
+class SolveRateIndex:
+    def __init__(self, stats=None):
+        self.entries = []  # (rating, difficulty, word), sorted
+        self.ratings = {difficulty: {} for difficulty in DIFFICULTY_LEVELS}  # difficulty -> {word: rating}
+        self.hints = {difficulty: {} for difficulty in DIFFICULTY_LEVELS}  # difficulty -> {word: hint}
+        self.stats = stats  # word_stats.WordStats of past games, for the starting ratings
+        self.solve_rates = dict(DEFAULT_SOLVE_RATES)
+        if stats is not None:
+            for difficulty, totals in stats.by_difficulty().items():
+                games, wins = totals[0], totals[1]
+                if games >= PRIOR_GAMES:
+                    self.solve_rates[difficulty] = wins / games
+        self._synced = None  # {difficulty: (words, hints)} of the catalog when last brought up to date
+
+    # Starting rating of a word: its solve rate in past games, mixed with its difficulty's
+    def prior(self, word, difficulty):
+        rate = self.solve_rates.get(difficulty, TARGET_SOLVE_RATE)
+        if self.stats is not None:
+            totals = self.stats.totals.get((word, difficulty))
+            if totals is not None:
+                rate = (totals[1] + PRIOR_GAMES * rate) / (totals[0] + PRIOR_GAMES)
+        return -logit(rate)
+
+    def rating(self, word, difficulty):
+        return self.ratings.get(difficulty, {}).get(word)
+
+    # Bring the index up to date with a catalog. Rows appended to the word file
+    # are merged in; any other change compares every word.
+    def sync(self, catalog):
+        synced = self._synced
+        index = catalog.index  # Words and hints of the same version of the file
+        if synced is not None and all(index.words.get(difficulty) is synced[difficulty][0]
+                                      for difficulty in DIFFICULTY_LEVELS):
+            return
+        groups = {difficulty: (index.words.get(difficulty, ()), index.hints.get(difficulty, ()))
+                  for difficulty in DIFFICULTY_LEVELS}
+        if not self.entries:
+            self._build(groups)
+        elif all(words[:len(synced[difficulty][0])] == synced[difficulty][0]
+                 and hints[:len(synced[difficulty][1])] == synced[difficulty][1]
+                 for difficulty, (words, hints) in groups.items()):
+            added = []
+            for difficulty, (words, hints) in groups.items():
+                ratings = self.ratings[difficulty]
+                start = len(synced[difficulty][0])
+                for word, hint in zip(words[start:], hints[start:]):
+                    if word not in ratings:
+                        ratings[word] = rating = self.prior(word, difficulty)
+                        added.append((rating, difficulty, word))
+                    self.hints[difficulty][word] = hint
+            self._merge(added)
+        else:
+            for difficulty, (words, hints) in groups.items():
+                current = dict(zip(words, hints))
+                for word in [word for word in self.ratings[difficulty] if word not in current]:
+                    self.remove(word, difficulty)
+                for word, hint in current.items():
+                    if word not in self.ratings[difficulty]:
+                        self.add(word, difficulty, hint)
+                self.hints[difficulty] = current
+        self._synced = groups
+
+    # Fill the empty index, sorting once instead of inserting words one by one
+    def _build(self, groups):
+        entries = []
+        for difficulty in sorted(groups):
+            words, hints = groups[difficulty]
+            self.hints[difficulty] = dict(zip(words, hints))
+            ratings = self.ratings[difficulty] = dict.fromkeys(words, self.prior(None, difficulty))
+            if self.stats is not None:
+                for word, word_difficulty in self.stats.totals:
+                    if word_difficulty == difficulty and word in ratings:
+                        ratings[word] = self.prior(word, difficulty)
+            ordered = sorted(ratings)
+            entries.extend(zip(map(ratings.__getitem__, ordered), itertools.repeat(difficulty), ordered))
+        # Each difficulty's words are in order, so a stable sort on the rating alone
+        # gives the same order as sorting the whole tuples, with far fewer comparisons
+        entries.sort(key=operator.itemgetter(0))
+        self.entries = entries
+
+    # Merge a list of new entries into the sorted list in one pass
+    def _merge(self, added):
+        if len(added) < 16:
+            for entry in added:
+                bisect.insort(self.entries, entry)
+            return
+        added.sort()
+        entries = self.entries
+        merged = []
+        start = 0
+        for entry in added:
+            end = bisect.bisect_left(entries, entry, start)
+            merged += entries[start:end]
+            merged.append(entry)
+            start = end
+        merged += entries[start:]
+        self.entries = merged
+
+    def add(self, word, difficulty, hint, rating=None):
+        if rating is None:
+            rating = self.prior(word, difficulty)
+        self.ratings.setdefault(difficulty, {})[word] = rating
+        self.hints.setdefault(difficulty, {})[word] = hint
+        bisect.insort(self.entries, (rating, difficulty, word))
+
+    def remove(self, word, difficulty):
+        rating = self.ratings[difficulty].pop(word)
+        del self.hints[difficulty][word]
+        del self.entries[bisect.bisect_left(self.entries, (rating, difficulty, word))]
+
+    # Change a word's rating, moving it to its new place in the list
+    def set_rating(self, word, difficulty, rating):
+        entries = self.entries
+        ratings = self.ratings[difficulty]
+        del entries[bisect.bisect_left(entries, (ratings[word], difficulty, word))]
+        ratings[word] = rating
+        bisect.insort(entries, (rating, difficulty, word))
+
+    # A random word rated within BAND of a rating (or the nearest word if none is),
+    # leaving out the words in exclude; returns (word, difficulty) or None
+    def pick(self, rating, rng=random, exclude=()):
+        entries = self.entries
+        if not entries:
+            return None
+        low = bisect.bisect_left(entries, (rating - BAND,))
+        high = bisect.bisect_right(entries, (rating + BAND,))
+        for _ in range(5):  # A few tries to find a word not played lately
+            if low < high:
+                entry = entries[rng.randrange(low, high)]
+            else:
+                index = min(low, len(entries) - 1)
+                if index > 0 and rating - entries[index - 1][0] < entries[index][0] - rating:
+                    index -= 1
+                entry = entries[index]
+            if entry[2] not in exclude:
+                break
+            # Widen the band so the next try has more words to choose from
+            low = max(low - 1, 0)
+            high = min(high + 1, len(entries))
+        return entry[2], entry[1]
+
+
+# Class choosing words for players and learning from their results
+class Matchmaker:
+    def __init__(self, index, history=None):
+        self.index = index
+        self.history = history  # Function giving a player's latest (word, difficulty, won), newest first
+        self.skills = {}  # player -> skill
+        self.recent = {}  # player -> their last words
+
+    # A player's skill (a new player starts at 0, the rating of a word solved half the time)
+    def skill(self, player):
+        if player not in self.skills:
+            self.skills[player] = 0.0
+            self.recent[player] = deque(maxlen=RECENT_WORDS)
+            if self.history is not None:
+                for word, difficulty, won in reversed(self.history(player)):
+                    self._update(player, word, difficulty, won, move_word=False)
+        return self.skills[player]
+
+    # Chance that a player solves a word
+    def predicted(self, player, word, difficulty):
+        rating = self.index.rating(word, difficulty)
+        return solve_probability(self.skill(player), rating if rating is not None else 0.0)
+
+    # Choose the next word for a player: (word, hint, difficulty), or Nones if there are no words
+    def next_word(self, player, target=TARGET_SOLVE_RATE, rng=random):
+        rating = self.skill(player) - logit(target)
+        picked = self.index.pick(rating, rng, self.recent[player])
+        if picked is None:
+            return None, None, None
+        word, difficulty = picked
+        return word, self.index.hints[difficulty][word], difficulty
+
+    # Learn from a finished game
+    def record(self, player, word, difficulty, won):
+        self.skill(player)
+        self._update(player, word, difficulty, won)
+
+    def _update(self, player, word, difficulty, won, move_word=True):
+        self.recent[player].append(word)
+        rating = self.index.rating(word, difficulty)
+        if rating is None:
+            return  # Not in this word file (any more)
+        surprise = (1 if won else 0) - solve_probability(self.skills[player], rating)
+        self.skills[player] += PLAYER_STEP * surprise
+        if move_word:
+            self.index.set_rating(word, difficulty, rating - WORD_STEP * surprise)
+
+
+# Matchmakers shared by the whole process, one per word file
+_matchmakers = {}
+
+
+# Function to get the (up to date) matchmaker for a word file. Starting ratings
+# come from word_stats.db when it exists, and returning players' skills from
+# their latest games on the leaderboard.
+def get_matchmaker(filename, leaderboard_file=None, stats_file="word_stats.db"):
+    matchmaker = _matchmakers.get(filename)
+    if matchmaker is None:
+        stats = None
+        if stats_file is not None and os.path.exists(stats_file):
+            from word_stats import StatsStore
+            with StatsStore(stats_file) as store:
+                stats = store.load()
+        history = None
+        if leaderboard_file is not None:
+            from leaderboard import get_leaderboard
+            history = functools.partial(get_leaderboard(leaderboard_file).recent_games, limit=HISTORY_GAMES)
+        matchmaker = _matchmakers[filename] = Matchmaker(SolveRateIndex(stats), history)
+    matchmaker.index.sync(get_catalog(filename))
+    return matchmaker
+
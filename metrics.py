@@ -0,0 +1,231 @@
+import atexit
+import bisect
+import os
+import time
+
+# Lightweight instrumentation for game sessions.
+#
+# Code reports to the sink returned by get_metrics(). Until enable_metrics() is
+# called that is NULL_METRICS, whose methods do nothing, so hooks cost a method
+# call. Timing hooks check "enabled" first so no clock is read when disabled:
+#
+#     metrics = get_metrics()
+#     if metrics.enabled:
+#         start = time.perf_counter()
+#     ...
+#     if metrics.enabled:
+#         metrics.observe("hangman_guess_seconds", time.perf_counter() - start)
+#
+# Set HANGMAN_METRICS=metrics.prom (Prometheus text) or metrics.json to have
+# the game and server write a snapshot there every HANGMAN_METRICS_INTERVAL
+# seconds (default 10).
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# Descriptions written as HELP lines in the Prometheus export
+DESCRIPTIONS = {
+    "hangman_games_started_total": "Games started.",
+    "hangman_games_won_total": "Games won.",
+    "hangman_games_lost_total": "Games lost.",
+    "hangman_guesses_total": "Guesses made.",
+    "hangman_wrong_guesses_total": "Wrong letter or word guesses.",
+    "hangman_hints_offered_total": "Times a hint was offered.",
+    "hangman_hints_taken_total": "Hints taken.",
+    "hangman_words_selected_total": "Words picked for a game, by difficulty.",
+    "hangman_custom_words_added_total": "Custom words added.",
+    "hangman_word_selection_seconds": "Time to pick a word and hint.",
+    "hangman_guess_seconds": "Time to process a guess.",
+    "hangman_add_custom_word_seconds": "Time to store a custom word.",
+    "hangman_csv_load_seconds": "Time to load a word CSV file.",
+    "hangman_csv_append_seconds": "Time to read rows appended to a word CSV file.",
+}
+
+
+# Sink used while metrics are disabled: every method does nothing
+class NullMetrics:
+    enabled = False
+
+    def inc(self, name, amount=1, label=None):
+        pass
+
+    def observe(self, name, seconds, label=None):
+        pass
+
+
+NULL_METRICS = NullMetrics()
+
+
+# Sink that keeps counters and latency histograms in memory
+class Metrics:
+    enabled = True
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        import threading  # Imported when metrics are enabled, so the game starts without it
+
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters = {}  # (name, label) -> value
+        self._histograms = {}  # (name, label) -> [bucket counts..., +Inf count, sum]
+
+    # Add to a counter; label is an optional (key, value) pair such as ("difficulty", "EASY")
+    def inc(self, name, amount=1, label=None):
+        key = (name, label)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    # Record a duration in a histogram
+    def observe(self, name, seconds, label=None):
+        key = (name, label)
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = [0] * (len(self.buckets) + 1) + [0.0]
+                self._histograms[key] = histogram
+            histogram[index] += 1
+            histogram[-1] += seconds
+
+    # Copy of the current values, safe to format while the game keeps running
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: list(values) for key, values in self._histograms.items()}
+        return counters, histograms
+
+    def to_json(self):
+        import json  # Only needed when exporting, so the game starts without it
+
+        counters, histograms = self.snapshot()
+        data = {"timestamp": time.time(), "counters": {}, "histograms": {}}
+        for (name, label), value in sorted(counters.items(), key=_sort_key):
+            data["counters"][_series_name(name, label)] = value
+        for (name, label), values in sorted(histograms.items(), key=_sort_key):
+            data["histograms"][_series_name(name, label)] = {
+                "buckets": dict(zip([str(bound) for bound in self.buckets] + ["+Inf"], values[:-1])),
+                "count": sum(values[:-1]),
+                "sum": values[-1],
+            }
+        return json.dumps(data, indent=2)
+
+    def to_prometheus(self):
+        counters, histograms = self.snapshot()
+        lines = []
+        described = set()
+
+        def header(name, kind):
+            if name not in described:
+                described.add(name)
+                if name in DESCRIPTIONS:
+                    lines.append("# HELP %s %s" % (name, DESCRIPTIONS[name]))
+                lines.append("# TYPE %s %s" % (name, kind))
+
+        for (name, label), value in sorted(counters.items(), key=_sort_key):
+            header(name, "counter")
+            lines.append("%s %s" % (_series_name(name, label), value))
+        for (name, label), values in sorted(histograms.items(), key=_sort_key):
+            header(name, "histogram")
+            cumulative = 0
+            for bound, count in zip([repr(bound) for bound in self.buckets] + ["+Inf"], values[:-1]):
+                cumulative += count
+                lines.append("%s %d" % (_series_name(name + "_bucket", label, ("le", bound)), cumulative))
+            lines.append("%s %r" % (_series_name(name + "_sum", label), values[-1]))
+            lines.append("%s %d" % (_series_name(name + "_count", label), cumulative))
+        return "\n".join(lines) + "\n"
+
+
+def _sort_key(item):
+    name, label = item[0]
+    return name, label or ()
+
+
+# Function to format a series name with its labels, e.g. name{difficulty="EASY"}
+def _series_name(name, *labels):
+    labels = [label for label in labels if label is not None]
+    if not labels:
+        return name
+    return name + "{" + ",".join('%s="%s"' % label for label in labels) + "}"
+
+
+# Class writing snapshots of a Metrics sink to a file from a background thread
+class MetricsExporter:
+    def __init__(self, metrics, filename, interval=10.0, file_format=None):
+        import threading
+
+        self.metrics = metrics
+        self.filename = filename
+        self.interval = interval
+        if file_format is None:
+            file_format = "json" if filename.endswith(".json") else "prometheus"
+        self.file_format = file_format
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.write()
+
+    # Write one snapshot; the file is replaced in one step so readers never see half of it
+    def write(self):
+        if self.file_format == "json":
+            text = self.metrics.to_json()
+        else:
+            text = self.metrics.to_prometheus()
+        import tempfile
+
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        fd, temp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                file.write(text)
+            os.replace(temp_name, self.filename)
+        except BaseException:
+            os.remove(temp_name)
+            raise
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+
+_metrics = NULL_METRICS
+_exporter = None
+
+
+# Function to get the sink hooks should report to
+def get_metrics():
+    return _metrics
+
+
+# Function to start collecting metrics, exporting them to a file if one is given
+def enable_metrics(filename=None, interval=10.0, file_format=None):
+    global _metrics, _exporter
+    if _metrics is NULL_METRICS:
+        _metrics = Metrics()
+    if filename is not None and _exporter is None:
+        _exporter = MetricsExporter(_metrics, filename, interval, file_format).start()
+        atexit.register(_exporter.stop)  # Write a last snapshot when the program ends
+    return _metrics
+
+
+# Function to stop collecting metrics (hooks go back to the no-op sink)
+def disable_metrics():
+    global _metrics, _exporter
+    if _exporter is not None:
+        atexit.unregister(_exporter.stop)
+        _exporter.stop()
+        _exporter = None
+    _metrics = NULL_METRICS
+
+
+# Function to turn metrics on if HANGMAN_METRICS names an export file
+def enable_from_environment():
+    filename = os.environ.get("HANGMAN_METRICS")
+    if filename:
+        interval = float(os.environ.get("HANGMAN_METRICS_INTERVAL", "10"))
+        enable_metrics(filename, interval)
@@ -0,0 +1,429 @@
+import argparse
+import asyncio
+import sys
+
+from game_engine import (CORRECT_LETTER, CORRECT_WORD, HINT_AFTER_WRONG_GUESSES, MAX_ATTEMPTS,
+                         WRONG_LETTER, WRONG_WORD, HangmanGame)
+from game_text import (DIFFICULTY_NAMES, DIFFICULTY_PROMPT, DIFFICULTY_RETRY_PROMPT, end_message,
+                       guess_message, turn_text)
+from metrics import enable_from_environment, get_metrics
+from seeding import SeedStreams
+from server import DEFAULT_WORDS, IDLE_TIMEOUT, WRITE_BUFFER_HIGH, HangmanServer, Session, raise_file_limit
+from spelling import spell_word
+from word_catalog import WATCH_INTERVAL, get_catalog
+
+# Multiplayer rooms on top of the Hangman server: everyone in a room races on
+# the same word, each with their own guesses and attempts, and sees how the
+# others are doing. The hangman frame is sent once when a round starts; after
+# that only what changed is sent, one short line each:
+#
+#   ROUND 3 EASY 5 6    round 3 starts: a 5-letter EASY word, 6 attempts
+#   + A 0 3             your guess A is at positions 0 and 3
+#   = APPLE             you guessed the whole word
+#   - Q 5               your guess Q is wrong, 5 attempts left
+#   ! ...               any other message for you
+#   S bob 2 4 130       bob has 2 letters to find, 4 attempts left and 130 points
+#   W bob 1 150         bob solved the word, 1st, with 150 points
+#   L bob 70            bob ran out of attempts
+#   J bob / P bob       bob joined / left the room
+#   END APPLE           the round is over, followed by the standings
+#
+# The standings changes of a room are gathered for STANDINGS_INTERVAL (keeping
+# only the latest line for each player), then joined, encoded once and written to
+# every player in the room. A player whose connection is not keeping
+# up gets no more writes until it drains; meanwhile only the latest line for
+# each other player is kept for them, so they catch up with one message.
+#
+# Run with: python rooms.py --port 7778   then   nc localhost 7778
+# (type /start to start a round before the room is full, /board for the standings)
+
+ROOM_SIZE = 50  # Players in a room; a round starts by itself once it is full
+ROUND_TIMEOUT = 300  # Seconds before a round ends for the players still guessing
+STANDINGS_INTERVAL = 0.1  # Seconds between sending the standings changes of a room
+
+ROOM_PROMPT = "Enter a room name: "
+NAME_PROMPT = "Enter your name: "
+COMMANDS_TEXT = "! Commands: /start /board /hint /quit\n"
+
+
+# Class queuing the messages for one player's connection, never waiting for it
+class Outbox:
+    def __init__(self, writer, timeout=IDLE_TIMEOUT):
+        self.writer = writer
+        self.transport = writer.transport
+        self.timeout = timeout  # Seconds to wait for the client to read before closing the connection
+        self.blocked = False  # Waiting for the client to read what was already sent
+        self.lines = []  # Messages for this player held while blocked
+        self.standings = {}  # Player name -> latest standing line held while blocked
+        self.coalesced = 0  # Standing lines replaced by a newer one before being sent
+        self._drainer = None
+
+    # Send a message to this player only
+    def send(self, text):
+        if self.blocked:
+            self.lines.append(text)
+        else:
+            self.write(text.encode("utf-8"))
+
+    # Send a message that is the same for several players, already encoded
+    def send_shared(self, data):
+        if self.blocked:
+            self.lines.append(data.decode("utf-8"))
+        else:
+            self.write(data)
+
+    # Send room standings: the encoded lines and {player name: line} they came from
+    def send_standings(self, data, changes):
+        if self.blocked:
+            held = len(self.standings)
+            self.standings.update(changes)
+            self.coalesced += held + len(changes) - len(self.standings)
+        else:
+            self.write(data)
+
+    def write(self, data):
+        transport = self.transport
+        if transport.is_closing():
+            return
+        transport.write(data)
+        if transport.get_write_buffer_size() > WRITE_BUFFER_HIGH:
+            self.blocked = True
+            self._drainer = asyncio.ensure_future(self._drain())
+
+    # Wait until the client has read enough, then send everything held in one go
+    # (a client that stops reading altogether is disconnected after timeout)
+    async def _drain(self):
+        try:
+            await asyncio.wait_for(self.writer.drain(), self.timeout)
+        except asyncio.TimeoutError:
+            self.lines = []
+            self.standings = {}
+            self.transport.abort()  # Its session sees the connection close and leaves the room
+            return
+        except ConnectionError:
+            return
+        self.blocked = False
+        text = "".join(self.lines) + "".join(self.standings.values())
+        self.lines = []
+        self.standings = {}
+        if text:
+            self.write(text.encode("utf-8"))
+
+
+# Class for a player in a room
+class Player:
+    __slots__ = ("name", "outbox", "game", "place")
+
+    def __init__(self, name, outbox):
+        self.name = name
+        self.outbox = outbox
+        self.game = None  # HangmanGame of the current round (None until they play one)
+        self.place = None  # Finishing place among the players who solved the word
+
+    # The player's line in the room standings
+    def standing(self):
+        game = self.game
+        if game is None:
+            return "J %s\n" % self.name
+        if game.won:
+            return "W %s %d %d\n" % (self.name, self.place, game.score)
+        if game.is_over:
+            return "L %s %d\n" % (self.name, game.score)
+        return "S %s %d %d %d\n" % (self.name, game.letters_left, game.remaining_attempts, game.score)
+
+
+# Class for a room: its players, and the round they are playing
+class Room:
+    def __init__(self, name, difficulty, rng, size=ROOM_SIZE, manager=None):
+        self.name = name
+        self.difficulty = difficulty
+        self.rng = rng  # Words are picked with this stream
+        self.size = size
+        self.manager = manager
+        self.players = {}  # name -> Player
+        self.round = 0
+        self.playing = False
+        self.word = None
+        self.solved = 0  # Players who have solved the word this round
+        self._spelling = None  # spelling.WordSpelling of the round's word, shared by every player
+        self._letter_lines = {}  # letter key -> positions part of the "+" line (the same for every player)
+        self._changes = {}  # Player name -> standing line, not yet sent
+        self._sender = None  # Timer sending the changes
+        self._timer = None  # Timer ending the round
+
+    # Add a player (their name is made unique in the room); returns None if the room is full
+    def join(self, name, outbox):
+        if len(self.players) >= self.size:
+            return None
+        name = "_".join(name.split()) or "player"
+        if name in self.players:
+            number = 2
+            while "%s%d" % (name, number) in self.players:
+                number += 1
+            name = "%s%d" % (name, number)
+        player = self.players[name] = Player(name, outbox)
+        outbox.send("ROOM %s %s %d/%d %s\n" % (self.name, self.difficulty, len(self.players), self.size, name))
+        outbox.send(self.board_text())
+        if self.playing:
+            outbox.send("! A round is on: you will play the next one\n")
+        self._changed(player)
+        if len(self.players) == self.size and not self.playing:
+            self.start_round()
+        return player
+
+    def leave(self, player):
+        if self.players.get(player.name) is not player:
+            return
+        del self.players[player.name]
+        self._changes[player.name] = "P %s\n" % player.name
+        self._schedule()
+        self._check_round_over()  # They may have been the last one still guessing
+        if not self.players and self.manager is not None:
+            self.manager.close(self)
+
+    def start_round(self):
+        word, hint = get_catalog(DEFAULT_WORDS).random_word(self.difficulty, self.rng)
+        if word is None:
+            self.broadcast("! No %s words found in the default word list.\n" % self.difficulty)
+            return
+        self._send_changes()  # Standings of the last round go before the new one
+        self.round += 1
+        self.playing = True
+        self.word = word
+        self.solved = 0
+        self._spelling = spelling = spell_word(word)
+        self._letter_lines = {key: " %s\n" % " ".join(map(str, indices))
+                              for key, indices in spelling.positions.items()}
+
+        metrics = get_metrics()
+        for player in self.players.values():
+            player.game = HangmanGame(word, hint, spelling=spelling)
+            player.place = None
+            metrics.inc("hangman_games_started_total")
+        frame = "ROUND %d %s %d %d\n%s" % (self.round, self.difficulty, len(word), MAX_ATTEMPTS,
+                                           turn_text(HangmanGame(word, hint, spelling=spelling)))
+        self.broadcast(frame)
+        self._timer = asyncio.get_running_loop().call_later(ROUND_TIMEOUT, self.end_round)
+
+    # Handle a line from a player: a guess, or a command starting with "/"
+    def handle(self, player, line):
+        if line.startswith("/"):
+            command = line.lower()
+            if command == "/start":
+                if self.playing:
+                    player.outbox.send("! A round is already on\n")
+                else:
+                    self.start_round()
+            elif command == "/board":
+                self._send_changes()
+                player.outbox.send(self.board_text())
+            elif command == "/hint":
+                game = player.game
+                if self.playing and game is not None and game.hint_available:
+                    get_metrics().inc("hangman_hints_taken_total")
+                    player.outbox.send("! Hint: %s\n" % game.take_hint())
+                else:
+                    player.outbox.send("! No hint yet (it comes after %d wrong guesses)\n"
+                                       % HINT_AFTER_WRONG_GUESSES)
+            else:
+                player.outbox.send(COMMANDS_TEXT)
+            return
+
+        game = player.game
+        if not self.playing or game is None or game.is_over:
+            player.outbox.send("! Wait for the next round (or type /start)\n")
+            return
+        guess = line.upper()
+        result = game.guess(guess)
+        metrics = get_metrics()
+        metrics.inc("hangman_guesses_total")
+        if result == CORRECT_LETTER:
+            letter = game.guessed_letters[-1]  # The guess as one character
+            player.outbox.send("+ " + letter + self._letter_lines[self._spelling.letters.key(letter)])
+        elif result == CORRECT_WORD:
+            player.outbox.send("= %s\n" % game.word)
+        elif result == WRONG_LETTER or result == WRONG_WORD:
+            metrics.inc("hangman_wrong_guesses_total")
+            player.outbox.send("- %s %d\n" % (guess, game.remaining_attempts))
+            if game.wrong_guesses == HINT_AFTER_WRONG_GUESSES and game.hint_available:
+                metrics.inc("hangman_hints_offered_total")
+                player.outbox.send("! A hint is available: type /hint\n")
+        else:
+            player.outbox.send("! %s\n" % guess_message(result, guess))
+            return
+
+        if game.won:
+            self.solved += 1
+            player.place = self.solved
+        self._changed(player)
+        if game.is_over:
+            metrics.inc("hangman_games_won_total" if game.won else "hangman_games_lost_total")
+            player.outbox.send("! %s\n" % end_message(game))
+            self._check_round_over()
+
+    # End the round once nobody is still guessing
+    def _check_round_over(self):
+        if self.playing and not any(player.game is not None and not player.game.is_over
+                                    for player in self.players.values()):
+            self.end_round()
+
+    def end_round(self):
+        if not self.playing:
+            return
+        self.playing = False
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._send_changes()
+        self.broadcast("END %s\n%s" % (self.word, self.board_text()))
+
+    # The standings: players who solved the word by place, then the others by letters left
+    def board_text(self):
+        def order(player):
+            game = player.game
+            if game is None:
+                return (2, 0, 0, player.name)
+            if game.won:
+                return (0, player.place, 0, player.name)
+            return (1, game.letters_left, -game.remaining_attempts, player.name)
+
+        lines = ["STANDINGS %s round %d" % (self.name, self.round)]
+        for rank, player in enumerate(sorted(self.players.values(), key=order), 1):
+            game = player.game
+            if game is None:
+                status = "waiting for the next round"
+            elif game.won:
+                status = "solved it (#%d), %d points" % (player.place, game.score)
+            elif game.is_over:
+                status = "out of attempts, %d points" % game.score
+            else:
+                status = "%d letters left, %d attempts left, %d points" % (
+                    game.letters_left, game.remaining_attempts, game.score)
+            lines.append("%d. %s: %s" % (rank, player.name, status))
+        return "\n".join(lines) + "\n"
+
+    # Send a message to every player, encoding it only once
+    def broadcast(self, text):
+        data = text.encode("utf-8")
+        for player in self.players.values():
+            player.outbox.send_shared(data)
+
+    # Note a player's new standing, sent to everyone with the next standings changes
+    def _changed(self, player):
+        self._changes[player.name] = player.standing()
+        self._schedule()
+
+    def _schedule(self):
+        if self._sender is None:
+            self._sender = asyncio.get_running_loop().call_later(STANDINGS_INTERVAL, self._send_changes)
+
+    def _send_changes(self):
+        if self._sender is not None:
+            self._sender.cancel()
+            self._sender = None
+        changes = self._changes
+        if not changes:
+            return
+        self._changes = {}
+        data = "".join(changes.values()).encode("utf-8")
+        for player in self.players.values():
+            player.outbox.send_standings(data, changes)
+
+
+# Class keeping track of the rooms of a server
+class RoomManager:
+    def __init__(self, seed=None, size=ROOM_SIZE):
+        self.size = size
+        self.streams = SeedStreams(seed, "room")  # A room's words depend only on the seed and its name
+        self.rooms = {}
+
+    def get(self, name):
+        return self.rooms.get(name)
+
+    # Open a room, or get the one with that name if somebody else just opened it
+    def open(self, name, difficulty):
+        room = self.rooms.get(name)
+        if room is None:
+            room = self.rooms[name] = Room(name, difficulty, self.streams.session(name), self.size, self)
+        return room
+
+    # Forget a room once everybody has left
+    def close(self, room):
+        if self.rooms.get(room.name) is room:
+            del self.rooms[room.name]
+
+
+# Class handling one connected player: choosing a room, then their lines in it
+class RoomSession(Session):
+    def __init__(self, reader, writer, manager, idle_timeout=IDLE_TIMEOUT):
+        super().__init__(reader, writer, idle_timeout)
+        self.manager = manager
+
+    async def run(self):
+        await self.send("Welcome to Hangman rooms!")
+        room, player = await self.join()
+        try:
+            while True:
+                line = await self.read_line()
+                if line.lower() == "/quit":
+                    break
+                if line:
+                    room.handle(player, line)
+        finally:
+            room.leave(player)
+        await self.send("Thank you for playing Hangman! Goodbye!")
+
+    # Ask for a room and a name until the player is in a room: returns (room, player)
+    async def join(self):
+        while True:
+            room_name = "_".join((await self.ask(ROOM_PROMPT)).split()) or "lobby"
+            name = await self.ask(NAME_PROMPT)
+            room = self.manager.get(room_name)
+            if room is None:
+                difficulty = (await self.ask(DIFFICULTY_PROMPT)).upper()
+                while difficulty not in DIFFICULTY_NAMES:
+                    difficulty = (await self.ask(DIFFICULTY_RETRY_PROMPT)).upper()
+                room = self.manager.open(room_name, DIFFICULTY_NAMES[difficulty])
+            player = room.join(name, Outbox(self.writer, self.idle_timeout))
+            if player is not None:
+                return room, player
+            await self.send("Room %s is full." % room_name)
+
+
+# Class running the server with rooms instead of the one-player menus
+class RoomServer(HangmanServer):
+    def __init__(self, host="127.0.0.1", port=7778, idle_timeout=IDLE_TIMEOUT, seed=None,
+                 watch_interval=WATCH_INTERVAL, room_size=ROOM_SIZE):
+        super().__init__(host, port, idle_timeout, seed, watch_interval)
+        self.manager = RoomManager(self.streams.master_seed, room_size)
+
+    def new_session(self, reader, writer):
+        return RoomSession(reader, writer, self.manager, self.idle_timeout)
+
+
+async def run_server(host, port, idle_timeout, seed=None, room_size=ROOM_SIZE):
+    server = await RoomServer(host, port, idle_timeout, seed, room_size=room_size).start()
+    print(f"Hangman room server listening on {server.host}:{server.port}")
+    print(f"Random seed: {server.streams.master_seed}")
+    sys.stdout.flush()
+    await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Hangman server with multiplayer rooms.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7778)
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT)
+    parser.add_argument("--seed", type=int, help="seed for the words of each room")
+    parser.add_argument("--room-size", type=int, default=ROOM_SIZE)
+    args = parser.parse_args()
+    raise_file_limit()
+    enable_from_environment()
+    try:
+        asyncio.run(run_server(args.host, args.port, args.idle_timeout, args.seed, args.room_size))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import hashlib
+import os
+import random
+
+# Random number streams for reproducible runs. Each session (a terminal run, a
+# server connection, a chunk of simulated games) gets its own random.Random,
+# seeded with a hash of the run's master seed and the session's place in the
+# run, e.g. ("chunk", 17) or ("server", 2, 381). No stream shares state with
+# another, so what a session draws does not depend on how many other sessions
+# there are, which process runs it or in what order. The seeds are 64-bit
+# BLAKE2b hashes, and the Mersenne Twister's period is 2**19937 - 1, so two
+# streams running into each other is not a practical concern.
+#
+# A whole run is replayed from its master seed, and one session from its own
+# seed (kept as session_seed, and written to the game log with every game).
+
+
+# Function to get a new master seed, for runs that were not given one
+def new_master_seed():
+    return int.from_bytes(os.urandom(8), "little")
+
+
+# Function to derive the seed of a stream from a master seed and the stream's place in the run
+def derive_seed(master_seed, *path):
+    digest = hashlib.blake2b(repr((master_seed,) + path).encode("utf-8"), digest_size=8,
+                             person=b"hangman-seed")
+    return int.from_bytes(digest.digest(), "little")
+
+
+# random.Random that remembers the seed it was made with
+class SessionRandom(random.Random):
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = new_master_seed()
+        self.session_seed = seed
+        super().__init__(seed)
+
+    # Keep the seed when the stream is copied or sent to another process
+    def __reduce__(self):
+        return self.__class__, (self.session_seed,), self.getstate()
+
+
+# Class handing out the session streams of a run (or of one worker of a run)
+class SeedStreams:
+    def __init__(self, master_seed=None, *prefix):
+        if master_seed is None:
+            master_seed = new_master_seed()
+        self.master_seed = master_seed
+        self.prefix = prefix  # Where these sessions are in the run, e.g. ("server", 2)
+        self.sessions = 0  # Sessions handed out by next_session()
+
+    # The stream of a numbered session (the same numbers give the same streams)
+    def session(self, index):
+        return SessionRandom(derive_seed(self.master_seed, *self.prefix, index))
+
+    # The stream of the next session
+    def next_session(self):
+        rng = self.session(self.sessions)
+        self.sessions += 1
+        return rng
@@ -0,0 +1,297 @@
+import argparse
+import asyncio
+import sys
+
+from custom_store import get_custom_store
+from game_engine import WRONG_LETTER, WRONG_WORD, HangmanGame
+from game_text import (DIFFICULTY_NAMES, DIFFICULTY_PROMPT, DIFFICULTY_RETRY_PROMPT,
+                       GUESS_PROMPT, HINT_PROMPT, MENU_PROMPT, MENU_TEXT,
+                       PLAY_AGAIN_PROMPT, end_message, guess_message, turn_text)
+from metrics import enable_from_environment, get_metrics
+from seeding import SeedStreams, SessionRandom
+from word_catalog import WATCH_INTERVAL, get_catalog, watch_word_files
+
+# Hangman over TCP: the same menus and game as the terminal version, one line
+# of text per prompt and one line per answer. Every connection is a session on
+# a single asyncio event loop, and all sessions share the word catalogs.
+# Edits to the word files are read by a background thread, so a large file
+# being reloaded never holds up the sessions.
+#
+# Try it with: python server.py --port 7777   then   nc localhost 7777
+
+DEFAULT_WORDS = "words.csv"
+CUSTOM_WORDS = "custom_words.csv"
+
+IDLE_TIMEOUT = 300  # Seconds a session may wait for input before it is closed
+WRITE_BUFFER_HIGH = 64 * 1024  # Bytes queued for a client before writes wait for it
+LINE_LIMIT = 1024  # Longest line accepted from a client
+FLUSH_INTERVAL = 1.0  # Seconds between writes of newly added custom words
+
+
+# Raised inside a session when the client goes away or stops answering
+class SessionClosed(Exception):
+    pass
+
+
+# Class handling the menus and games for one connected player
+class Session:
+    def __init__(self, reader, writer, idle_timeout=IDLE_TIMEOUT, rng=None):
+        self.reader = reader
+        self.writer = writer
+        self.idle_timeout = idle_timeout
+        self.rng = rng if rng is not None else SessionRandom()  # Words are picked with this stream
+
+    # Send some text; waits while the client is not reading (backpressure),
+    # for at most idle_timeout before the session is closed
+    async def write(self, text):
+        self.writer.write(text.encode("utf-8"))
+        try:
+            await asyncio.wait_for(self.writer.drain(), self.idle_timeout)
+        except asyncio.TimeoutError:
+            raise SessionClosed()
+
+    # Send some lines
+    async def send(self, *lines):
+        await self.write("\n".join(lines) + "\n")
+
+    # Send a prompt and wait for the answer line
+    async def ask(self, prompt):
+        await self.send(prompt)
+        return await self.read_line()
+
+    # Wait for the next line from the client
+    async def read_line(self):
+        try:
+            line = await asyncio.wait_for(self.reader.readline(), self.idle_timeout)
+        except asyncio.TimeoutError:
+            self.writer.write(b"Session timed out. Goodbye!\n")  # Not waiting for a client that may not read it
+            raise SessionClosed()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise SessionClosed()  # Line longer than LINE_LIMIT
+        if not line:
+            raise SessionClosed()
+        return line.decode("utf-8", "replace").strip()
+
+    async def run(self):
+        await self.send("Welcome to Hangman!")
+
+        # Main program loop
+        while True:
+            await self.send(MENU_TEXT)
+            menu_choice = await self.ask(MENU_PROMPT)
+
+            if menu_choice == "1":
+                await self.play_game(is_custom=False)  # Play with default words
+            elif menu_choice == "2":
+                result = await self.play_game(is_custom=True)  # Play with custom words
+                if not result:
+                    await self.send("Returning to menu...")
+            elif menu_choice == "3":
+                await self.add_custom_word()  # Add new custom words
+            elif menu_choice == "4":
+                await self.send("Thank you for playing Hangman! Goodbye!")
+                break
+            else:
+                await self.send("Invalid choice. Please enter a number from 1 to 4.")
+
+    # Set up and play games until the player stops
+    async def play_game(self, is_custom=False):
+        while True:
+            await self.send("", "===== Game Settings =====")
+            difficulty = (await self.ask(DIFFICULTY_PROMPT)).upper()
+            while difficulty not in DIFFICULTY_NAMES:
+                difficulty = (await self.ask(DIFFICULTY_RETRY_PROMPT)).upper()
+            csv_difficulty = DIFFICULTY_NAMES[difficulty]
+
+            word, hint = await self.get_word_with_hint(csv_difficulty, is_custom)
+            if word is None:
+                if is_custom:
+                    await self.send(f"No {csv_difficulty} words found in custom words list.")
+                else:
+                    await self.send(f"No {csv_difficulty} words found in the default word list.")
+                return False
+
+            await self.play(HangmanGame(word, hint))
+
+            play_again = (await self.ask(PLAY_AGAIN_PROMPT)).upper()
+            if play_again != "Y":
+                return True
+
+    async def get_word_with_hint(self, difficulty, is_custom):
+        catalog = get_catalog(CUSTOM_WORDS if is_custom else DEFAULT_WORDS)
+        if catalog.missing:
+            if is_custom:
+                await self.send("No custom words file found. Creating a new one.")
+                await asyncio.to_thread(_create_file, CUSTOM_WORDS)
+            else:
+                await self.send("Error: words.csv file not found.")
+            return None, None
+        word, hint = catalog.random_word(difficulty, self.rng)
+        if word is not None:
+            get_metrics().inc("hangman_words_selected_total", label=("difficulty", difficulty))
+        return word, hint
+
+    # One game, with the same rules and messages as play() in the terminal version
+    async def play(self, game):
+        metrics = get_metrics()
+        metrics.inc("hangman_games_started_total")
+        await self.write(turn_text(game))
+
+        while not game.is_over:
+            if game.hint_available:
+                metrics.inc("hangman_hints_offered_total")
+                hint_choice = (await self.ask(HINT_PROMPT)).upper()
+                if hint_choice == "Y":
+                    metrics.inc("hangman_hints_taken_total")
+                    await self.send("Hint: " + game.take_hint())
+
+            guess = (await self.ask(GUESS_PROMPT)).upper()
+            result = game.guess(guess)
+            metrics.inc("hangman_guesses_total")
+            if result == WRONG_LETTER or result == WRONG_WORD:
+                metrics.inc("hangman_wrong_guesses_total")
+            message = guess_message(result, guess)
+            await self.write(turn_text(game, message))
+
+        await self.send(end_message(game))
+        metrics.inc("hangman_games_won_total" if game.won else "hangman_games_lost_total")
+        return game.score
+
+    async def add_custom_word(self):
+        await self.send("", "===== Add Custom Word =====")
+        word = await self.ask("Enter the word: ")
+        if not word:
+            await self.send("Word cannot be empty.")
+            return False
+        store = get_custom_store(CUSTOM_WORDS)
+        # In a thread, like every other use of the store, so the event loop never waits on its lock
+        if await asyncio.to_thread(store.contains, word):
+            await self.send(f"Word '{word}' is already in your custom words.")
+            return False
+
+        await self.send("Select difficulty level:", "(E) Easy", "(M) Medium", "(H) Hard")
+        difficulty_choice = (await self.ask("Enter choice (E/M/H): ")).upper()
+        while difficulty_choice not in DIFFICULTY_NAMES:
+            difficulty_choice = (await self.ask("Invalid choice. Enter (E/M/H): ")).upper()
+        hint = await self.ask("Enter a hint for the word: ")
+
+        # Words are written in batches by HangmanServer (a full batch is written here,
+        # in a thread so other sessions keep going)
+        added = await asyncio.to_thread(store.add, word, DIFFICULTY_NAMES[difficulty_choice], hint)
+        if not added:
+            await self.send(f"Word '{word}' is already in your custom words.")
+            return False
+        get_metrics().inc("hangman_custom_words_added_total")
+        await self.send(f"Word '{word}' added successfully!")
+        return True
+
+
+def _create_file(filename):
+    with open(filename, "a", newline=""):
+        pass
+
+
+# Class running the listening socket and keeping track of sessions
+class HangmanServer:
+    def __init__(self, host="127.0.0.1", port=7777, idle_timeout=IDLE_TIMEOUT, seed=None,
+                 watch_interval=WATCH_INTERVAL):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.watch_interval = watch_interval  # Seconds between checks for edits to the word files
+        self.streams = SeedStreams(seed, "server")  # One random number stream per connection, in order
+        self.sessions = 0
+        self._server = None
+        self._flusher = None
+
+    async def start(self):
+        # Load the word files and the custom words index once up front, in a
+        # thread so a large file does not hold up the event loop; every session shares them
+        await asyncio.to_thread(get_catalog, DEFAULT_WORDS)
+        await asyncio.to_thread(get_catalog, CUSTOM_WORDS)
+        await asyncio.to_thread(get_custom_store, CUSTOM_WORDS)
+        watch_word_files(self.watch_interval)
+        self._server = await asyncio.start_server(self._handle, self.host, self.port,
+                                                  limit=LINE_LIMIT, backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._flusher = asyncio.create_task(self._flush_custom_words())
+        return self
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+        self._flusher.cancel()
+        await asyncio.to_thread(get_custom_store(CUSTOM_WORDS).commit)
+
+    # Write custom words added by any session, one batch per interval
+    async def _flush_custom_words(self):
+        store = get_custom_store(CUSTOM_WORDS)
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            if store.pending():
+                await asyncio.to_thread(store.commit)
+
+    def new_session(self, reader, writer):
+        return Session(reader, writer, self.idle_timeout, self.streams.next_session())
+
+    async def _handle(self, reader, writer):
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_HIGH)
+        self.sessions += 1
+        try:
+            await self.new_session(reader, writer).run()
+        except (SessionClosed, ConnectionError):
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+            try:
+                await asyncio.wait_for(writer.wait_closed(), self.idle_timeout)
+            except asyncio.TimeoutError:
+                writer.transport.abort()  # The client never read what is left to send
+            except ConnectionError:
+                pass
+
+
+# Allow as many open sockets as the system permits (the default soft limit is often 1024)
+def raise_file_limit():
+    try:
+        import resource
+    except ImportError:
+        return  # Not available on Windows
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def run_server(host, port, idle_timeout, seed=None, watch_interval=WATCH_INTERVAL):
+    server = await HangmanServer(host, port, idle_timeout, seed, watch_interval).start()
+    print(f"Hangman server listening on {server.host}:{server.port}")
+    print(f"Random seed: {server.streams.master_seed}")
+    sys.stdout.flush()
+    await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Hangman server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT)
+    parser.add_argument("--seed", type=int, help="seed for the words of each connection, in order")
+    parser.add_argument("--watch-interval", type=float, default=WATCH_INTERVAL,
+                        help="seconds between checks for edits to the word files")
+    args = parser.parse_args()
+    raise_file_limit()
+    enable_from_environment()
+    try:
+        asyncio.run(run_server(args.host, args.port, args.idle_timeout, args.seed,
+                               args.watch_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import argparse
+import importlib
+import os
+import string
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from game_engine import HangmanGame
+from seeding import SeedStreams
+from word_catalog import DIFFICULTY_LEVELS, get_catalog
+
+# Letters ordered from most to least common in English text
+LETTER_FREQUENCY_ORDER = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
+
+
+# Guessing strategies.
+# A strategy is a function taking (game, rng, catalog) that yields the guesses for
+# that game. It can look at the game (word_completion, guessed_letters, ...) between
+# guesses, and at the catalog the word was drawn from.
+
+# Guess letters in a random order
+def random_letters(game, rng, catalog):
+    letters = list(string.ascii_uppercase)
+    rng.shuffle(letters)
+    yield from letters
+
+
+# Guess letters from the most to the least common in English
+def frequent_letters(game, rng, catalog):
+    yield from LETTER_FREQUENCY_ORDER
+
+
+# Strategies given as a string are imported on first use ("module:function")
+STRATEGIES = {
+    "random": random_letters,
+    "frequency": frequent_letters,
+    "solver": "solver:solver_letters",
+}
+
+
+# Function to look up a strategy by name, or load one given as "module:function"
+def get_strategy(name):
+    if name in STRATEGIES:
+        name = STRATEGIES[name]
+        if callable(name):
+            return name
+    if ":" in name:
+        module_name, function_name = name.split(":", 1)
+        return getattr(importlib.import_module(module_name), function_name)
+    raise ValueError("Unknown strategy: " + name)
+
+
+# Function to make an empty set of results for each difficulty
+def empty_results(difficulties):
+    return {
+        difficulty: {"games": 0, "wins": 0, "guesses": 0, "scores": Counter()}
+        for difficulty in difficulties
+    }
+
+
+# Function to add one set of results into another
+def merge_results(total, part):
+    for difficulty, stats in part.items():
+        if difficulty not in total:
+            total[difficulty] = {"games": 0, "wins": 0, "guesses": 0, "scores": Counter()}
+        target = total[difficulty]
+        target["games"] += stats["games"]
+        target["wins"] += stats["wins"]
+        target["guesses"] += stats["guesses"]
+        target["scores"].update(stats["scores"])
+    return total
+
+
+# Function to play one chunk of games (runs inside a worker process).
+# Each chunk has its own random number stream, derived from the run seed and the
+# chunk number (see seeding.py), so the results do not depend on which worker
+# ran it or how many workers there are. The same seed gives the same results.
+def simulate_chunk(strategy_name, games, seed, chunk_index, filename, difficulties, take_hints=True):
+    strategy = get_strategy(strategy_name)
+    rng = SeedStreams(seed, "chunk").session(chunk_index)
+    catalog = get_catalog(filename)
+    results = empty_results(difficulties)
+
+    for _ in range(games):
+        difficulty = difficulties[rng.randrange(len(difficulties))]
+        word, hint = catalog.random_word(difficulty, rng)
+        if word is None:
+            continue
+        game = HangmanGame(word, hint)
+        for guess in strategy(game, rng, catalog):
+            if take_hints and game.hint_available:
+                game.take_hint()
+            game.guess(guess)
+            if game.is_over:
+                break
+
+        stats = results[difficulty]
+        stats["games"] += 1
+        stats["guesses"] += game.guess_count
+        stats["scores"][game.score] += 1
+        if game.won:
+            stats["wins"] += 1
+    return results
+
+
+# Function to run many games across a process pool and return the combined results
+def simulate(games, strategy="frequency", seed=0, workers=None, chunk_size=10000,
+             filename="words.csv", difficulties=DIFFICULTY_LEVELS, take_hints=True):
+    if workers is None:
+        workers = os.cpu_count() or 1
+    difficulties = tuple(difficulties)
+    get_strategy(strategy)  # Fail early on an unknown strategy name
+
+    chunks = []
+    remaining = games
+    while remaining > 0:
+        chunks.append(min(chunk_size, remaining))
+        remaining -= chunks[-1]
+
+    start = time.perf_counter()
+    results = empty_results(difficulties)
+    if workers == 1:
+        for index, size in enumerate(chunks):
+            merge_results(results, simulate_chunk(strategy, size, seed, index, filename,
+                                                  difficulties, take_hints))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(simulate_chunk, strategy, size, seed, index, filename,
+                            difficulties, take_hints)
+                for index, size in enumerate(chunks)
+            ]
+            for future in futures:
+                merge_results(results, future.result())
+    elapsed = time.perf_counter() - start
+
+    return {
+        "strategy": strategy,
+        "seed": seed,
+        "games": games,
+        "workers": workers,
+        "elapsed": elapsed,
+        "games_per_second_per_core": games / elapsed / workers if elapsed else 0.0,
+        "difficulties": results,
+    }
+
+
+# Function to print the results of a simulation
+def print_report(summary):
+    print("\n===== Simulation Results =====")
+    print("Strategy:", summary["strategy"], " Seed:", summary["seed"])
+    print("Games:", summary["games"], " Workers:", summary["workers"],
+          " Time: %.2fs" % summary["elapsed"])
+    print("Throughput: %.0f games/sec per core" % summary["games_per_second_per_core"])
+    for difficulty, stats in summary["difficulties"].items():
+        games = stats["games"]
+        if not games:
+            print("\n%s: no games" % difficulty)
+            continue
+        scores = stats["scores"]
+        mean_score = sum(score * count for score, count in scores.items()) / games
+        print("\n%s: %d games" % (difficulty, games))
+        print("  Win rate:      %.1f%%" % (100.0 * stats["wins"] / games))
+        print("  Mean guesses:  %.2f" % (stats["guesses"] / games))
+        print("  Mean score:    %.1f" % mean_score)
+        print("  Score distribution:")
+        for score in sorted(scores):
+            print("    %4d  %6.2f%%" % (score, 100.0 * scores[score] / games))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate Hangman games with a guessing strategy.")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--strategy", default="frequency",
+                        help="one of %s, or module:function" % ", ".join(sorted(STRATEGIES)))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--words", default="words.csv")
+    parser.add_argument("--difficulty", nargs="+", choices=DIFFICULTY_LEVELS, default=DIFFICULTY_LEVELS)
+    args = parser.parse_args()
+
+    summary = simulate(args.games, args.strategy, args.seed, args.workers, args.chunk_size,
+                       args.words, args.difficulty)
+    print_report(summary)
+
+
+if __name__ == "__main__":
+    main()
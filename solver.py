@@ -0,0 +1,196 @@
+import numpy as np
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# Above this many candidates the solver scores letters by how many words contain
+# them; below it, by every distinct pattern of positions they could reveal.
+POSITIONAL_LIMIT = 1024
+
+# Lookup table from byte value to letter code (26 for anything outside A-Z)
+_CODES = np.full(256, 26, dtype=np.uint8)
+_CODES[np.frombuffer(ALPHABET.encode("ascii"), dtype=np.uint8)] = np.arange(26, dtype=np.uint8)
+
+
+# Function to pick the smallest unsigned type with one bit per letter position
+def _key_type(length):
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if length <= np.iinfo(dtype).bits:
+            return dtype
+    return None
+
+
+# All the candidate words of one length, encoded for vectorised filtering
+class _LengthGroup:
+    def __init__(self, words, dtype):
+        self.words = words
+        length = len(words[0])
+        raw = np.frombuffer("".join(words).encode("latin-1", "replace"), dtype=np.uint8)
+        letters = _CODES[raw].reshape(len(words), length)  # uint8 matrix, one row per word
+
+        # keys[c, w] has bit i set when word w has letter c at position i,
+        # which is exactly what guessing c would reveal in that word
+        self.keys = np.zeros((26, len(words)), dtype=dtype)
+        for position in range(length):
+            column = letters[:, position]
+            inside = column < 26
+            self.keys[column[inside], np.flatnonzero(inside)] |= dtype(1 << position)
+
+        # masks[w] has bit c set when word w contains letter c
+        self.masks = np.zeros(len(words), dtype=np.uint32)
+        for code in range(26):
+            self.masks |= (self.keys[code] != 0).astype(np.uint32) << np.uint32(code)
+        self.letter_counts = np.count_nonzero(self.keys, axis=1)
+
+
+# Class that suggests the most informative letter to guess next
+class WordSolver:
+    def __init__(self, words):
+        by_length = {}
+        for word in set(word.upper() for word in words):
+            by_length.setdefault(len(word), []).append(word)
+        self._groups = {}
+        for length, group in by_length.items():
+            dtype = _key_type(length)
+            if dtype is not None and length > 0:
+                self._groups[length] = _LengthGroup(sorted(group), dtype)
+
+    # Start tracking the candidates for a new word of the given length
+    def candidates(self, length):
+        return Candidates(self._groups.get(length))
+
+
+# The words still consistent with one game, narrowed after each guess
+class Candidates:
+    def __init__(self, group):
+        self._group = group
+        self._indices = None  # None means every word of the length is still possible
+        self._masks = None if group is None else group.masks
+        self._known = 0  # Number of guessed letters already applied
+
+    def __len__(self):
+        if self._group is None:
+            return 0
+        return len(self._masks)
+
+    def words(self):
+        if self._group is None:
+            return []
+        if self._indices is None:
+            return list(self._group.words)
+        return [self._group.words[i] for i in self._indices]
+
+    # Narrow the candidates using the current pattern (e.g. "_A__A") and guessed letters.
+    # Only the letters guessed since the last update are applied, and only to the
+    # candidates that are left.
+    def update(self, word_completion, guessed_letters):
+        if self._group is None or len(guessed_letters) <= self._known:
+            return
+        new_letters = guessed_letters[self._known:]
+        self._known = len(guessed_letters)
+
+        keep = None
+        for letter in new_letters:
+            code = ord(letter) - 65
+            if not 0 <= code < 26:
+                continue
+            expected = 0
+            for position, shown in enumerate(word_completion):
+                if shown == letter:
+                    expected |= 1 << position
+            if expected:
+                # The letter must be at exactly the revealed positions
+                keys = self._group.keys[code]
+                matches = (keys if self._indices is None else keys[self._indices]) == expected
+            else:
+                matches = (self._masks & np.uint32(1 << code)) == 0
+            keep = matches if keep is None else keep & matches
+
+        if keep is None:
+            return
+        if self._indices is None:
+            self._indices = np.flatnonzero(keep)
+        else:
+            self._indices = self._indices[keep]
+        self._masks = self._masks[keep]
+
+    # Pick the unguessed letter that gives the most expected information about the word
+    def best_letter(self, guessed_letters):
+        total = len(self)
+        if total == 0:
+            return None
+        unguessed = np.ones(26, dtype=bool)
+        for letter in guessed_letters:
+            code = ord(letter) - 65
+            if 0 <= code < 26:
+                unguessed[code] = False
+        if not unguessed.any():
+            return None
+
+        if total <= POSITIONAL_LIMIT:
+            keys = self._group.keys if self._indices is None else self._group.keys[:, self._indices]
+            scores = _pattern_entropy(keys)
+            counts = np.count_nonzero(keys, axis=1)
+        else:
+            if self._indices is None:
+                counts = self._group.letter_counts
+            else:
+                masks = self._masks
+                counts = np.array([np.count_nonzero(masks & np.uint32(1 << code))
+                                   for code in range(26)])
+            scores = _binary_entropy(counts / total)
+        # Break ties in favour of the letter that appears in more words
+        scores = scores + counts * 1e-9
+
+        scores = np.where(unguessed, scores, -1.0)
+        return ALPHABET[int(np.argmax(scores))]
+
+
+# Entropy (in bits) of the split each letter's reveal patterns make of the candidates.
+# keys has one row per letter; equal keys in a row are words the guess cannot tell apart.
+def _pattern_entropy(keys):
+    letters, total = keys.shape
+    ordered = np.sort(keys, axis=1)
+    # Number each run of equal keys within its row, then count the size of every run
+    starts = np.ones(ordered.shape, dtype=bool)
+    starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    runs = np.cumsum(starts.ravel()) - 1
+    sizes = np.bincount(runs).astype(float)
+    rows = np.repeat(np.arange(letters), np.count_nonzero(starts, axis=1))
+    weighted = np.bincount(rows, weights=sizes * np.log2(sizes), minlength=letters)
+    return np.log2(total) - weighted / total
+
+
+def _binary_entropy(p):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        entropy = -(p * np.log2(p) + (1 - p) * np.log2(1 - p))
+    return np.nan_to_num(entropy)
+
+
+# Solvers built for each catalog, rebuilt when the catalog reloads its words
+_solvers = {}
+
+
+# Function to get a solver for all the words in a catalog
+def get_solver(catalog):
+    cached = _solvers.get(catalog.filename)
+    if cached is not None and cached[0] is catalog.words:
+        return cached[1]
+    words = [word for group in catalog.words.values() for word in group if word]
+    solver = WordSolver(words)
+    _solvers[catalog.filename] = (catalog.words, solver)
+    return solver
+
+
+# Simulator strategy: always guess the solver's best letter
+def solver_letters(game, rng, catalog):
+    candidates = get_solver(catalog).candidates(len(game.word))
+    tried_word = False
+    while True:
+        candidates.update(game.word_completion, game.guessed_letters)
+        if len(candidates) == 1 and not tried_word:
+            tried_word = True
+            yield candidates.words()[0]
+        letter = candidates.best_letter(game.guessed_letters)
+        if letter is None:
+            return
+        yield letter
@@ -0,0 +1,117 @@
+import unicodedata
+
+# How guessed letters are matched to the letters of a word. Each character has
+# a key: its casefolded form with any accents taken off, so "e", "E", "é" and
+# "È" all uncover the same letters. Some languages count an accented letter as
+# a letter of its own ("Ñ" in Spanish, "Å" in Swedish...); with that language
+# those letters keep their accent and only match themselves.
+#
+# The key of a character is worked out the first time it is seen and kept in a
+# table, so matching a guess is a dictionary lookup whatever the script and
+# however many letters its alphabet has.
+
+# Letters that are not the plain letter with an accent, per language (lower case)
+SEPARATE_LETTERS = {
+    "da": "æøå",
+    "es": "ñ",
+    "fi": "åäö",
+    "nb": "æøå",
+    "nn": "æøå",
+    "no": "æøå",
+    "sv": "åäö",
+}
+
+
+# Function to compose letters typed as a plain letter and a combining accent
+# ("E" followed by U+0301) into single characters ("É")
+def compose(text):
+    return unicodedata.normalize("NFC", text)
+
+
+# Function to write a word the way the game shows it: composed and in capitals,
+# leaving any letter that would turn into several in capitals as it is ("ß")
+def display_form(word):
+    word = compose(word)
+    upper = word.upper()
+    if len(upper) == len(word):
+        return upper
+    return "".join(char.upper() if len(char.upper()) == 1 else char for char in word)
+
+
+# Class holding the keys of the characters of one language
+class LetterTable:
+    def __init__(self, language=None):
+        self.language = language
+        self.separate = SEPARATE_LETTERS.get(language, "")
+        self.keys = {}  # character -> key, filled in as characters are first seen
+
+    # Key of one character
+    def key(self, char):
+        key = self.keys.get(char)
+        if key is None:
+            key = self.keys[char] = self._fold(char)
+        return key
+
+    def _fold(self, char):
+        folded = char.casefold()
+        if folded in self.separate:
+            return folded
+        stripped = "".join(part for part in unicodedata.normalize("NFD", folded)
+                           if not unicodedata.combining(part))
+        return stripped or folded
+
+    # Keys of every character of a text, joined together (for whole-word guesses)
+    def fold(self, text):
+        keys = self.keys
+        try:
+            return "".join([keys[char] for char in text])
+        except KeyError:  # Some characters not seen before
+            return "".join([self.key(char) for char in text])
+
+
+# Letter tables shared by the whole process, one per language
+_tables = {}
+
+
+# Function to get the letter table of a language (None for no particular language)
+def get_letter_table(language=None):
+    table = _tables.get(language)
+    if table is None:
+        table = _tables.setdefault(language, LetterTable(language))
+    return table
+
+
+# Class with everything a game needs to match guesses against one word, worked
+# out once per word (when a word file is loaded, or when a round starts)
+class WordSpelling:
+    __slots__ = ("word", "letters", "folded", "positions", "fills")
+
+    def __init__(self, word, letters):
+        self.word = word
+        self.letters = letters  # The LetterTable the keys come from
+        keys = letters.keys
+        try:
+            word_keys = [keys[char] for char in word]
+        except KeyError:  # Some characters not seen before
+            word_keys = [letters.key(char) for char in word]
+        self.folded = "".join(word_keys)  # The word as keys, to check whole-word guesses
+        positions = {}
+        for index, key in enumerate(word_keys):
+            if key in positions:
+                positions[key].append(index)
+            else:
+                positions[key] = [index]
+        self.positions = {key: tuple(indices) for key, indices in positions.items()}  # key -> positions
+        # What is written into the revealed word for each position: the
+        # word's bytes for words within Latin-1, otherwise the word itself
+        try:
+            self.fills = word.encode("latin-1")
+        except UnicodeEncodeError:
+            self.fills = word
+
+
+# Function to work out the spelling of a word (with no particular language by default)
+def spell_word(word, letters=None):
+    if letters is None:
+        letters = get_letter_table()
+    return WordSpelling(word, letters)
@@ -0,0 +1,80 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_engine import (CORRECT_LETTER, CORRECT_WORD, INVALID, MAX_ATTEMPTS, REPEATED_LETTER,
+                         STARTING_SCORE, WRONG_LETTER, HangmanGame)
+from spelling import display_form
+
+# Letters whose case change alters their length: "ß" is "SS" in capitals,
+# "ŉ" is "ʼN" and the ligature "ﬁ" is "FI". Words keep the letter itself.
+
+
+# Function to start a game the way a word pack shows the word
+def new_game(word):
+    return HangmanGame(display_form(word), "")
+
+
+def test_sharp_s_word_can_be_won_letter_by_letter():
+    game = new_game("straße")
+    assert game.word == "STRAßE"
+    assert game.guess("ß") == CORRECT_LETTER
+    for letter in "STRAE":
+        assert game.guess(letter) == CORRECT_LETTER
+    assert game.won
+    assert game.word_completion == "STRAßE"
+
+
+def test_sharp_s_guessed_in_capitals():
+    # The terminal game and the servers put guesses in capitals before passing them on
+    game = new_game("straße")
+    assert game.guess("SS") == CORRECT_LETTER
+    assert game.guess("ß") == REPEATED_LETTER
+    assert game.word_completion == "____ß_"
+
+
+def test_sharp_s_whole_word():
+    for guess in ("STRAßE", "straße", "STRASSE", "strasse"):
+        game = new_game("straße")
+        assert game.guess(guess) == CORRECT_WORD
+        assert game.won
+
+
+def test_sharp_s_not_in_word():
+    game = new_game("strand")
+    assert game.guess("ß") == WRONG_LETTER
+    assert game.guess("ß") == REPEATED_LETTER
+    assert game.guess("SS") == INVALID  # Only the letter ß when the word has it
+
+
+# Function to play one guess in a new game: (result, attempts left, score)
+def play_guess(word, guess):
+    game = new_game(word)
+    return game.guess(guess), game.remaining_attempts, game.score
+
+
+def test_capital_letters_do_not_depend_on_other_games():
+    before = play_guess("miss", "SS")
+    new_game("straße")  # A word whose letter is several letters in capitals
+    after = play_guess("miss", "SS")
+    assert before == after == (INVALID, MAX_ATTEMPTS, STARTING_SCORE)
+
+
+def test_letters_longer_in_capitals():
+    for word, letter, capitals in (("ŉa", "ŉ", "ʼN"), ("ﬁx", "ﬁ", "FI")):
+        game = new_game(word)
+        assert game.guess(letter) == CORRECT_LETTER
+        assert game.guess(capitals) == REPEATED_LETTER
+        game = new_game(word)
+        assert game.guess(capitals) == CORRECT_LETTER
+        assert game.guess(word[1]) == CORRECT_LETTER
+        assert game.won
+        assert game.word_completion == display_form(word)
+
+
+def test_accents_match_plain_letters():
+    game = new_game("élève")
+    assert game.guess("E") == CORRECT_LETTER
+    assert game.guess("é") == REPEATED_LETTER
+    assert game.word_completion == "É_È_E"
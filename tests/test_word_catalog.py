@@ -0,0 +1,43 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from word_catalog import WordCatalog
+
+
+# Function to add text to the end of a word file
+def append(filename, text):
+    with open(filename, "a", newline="") as file:
+        file.write(text)
+
+
+def test_half_written_row_is_read_on_the_next_look(tmp_path):
+    filename = str(tmp_path / "words.csv")
+    append(filename, "apple,EASY,a\n")
+    catalog = WordCatalog(filename)
+    catalog.refresh()
+    loads = []
+    load = catalog._load
+    catalog._load = lambda: loads.append(1) or load()
+
+    append(filename, "pear,EASY,p\nplu")  # The last row is still being written
+    catalog.refresh()
+    assert catalog.words["EASY"] == ("APPLE", "PEAR")
+    append(filename, "m,HARD,h\n")
+    catalog.refresh()
+    assert catalog.words["HARD"] == ("PLUM",)
+    assert loads == []  # Only the added bytes were read
+
+
+def test_last_row_without_line_ending_is_read_once_the_file_stays_the_same(tmp_path):
+    filename = str(tmp_path / "words.csv")
+    append(filename, "apple,EASY,a\n")
+    catalog = WordCatalog(filename)
+    catalog.refresh()
+    append(filename, "fig,MEDIUM,f")
+    catalog.refresh()
+    assert catalog.count("MEDIUM") == 0
+    catalog.refresh()
+    assert catalog.words["MEDIUM"] == ("FIG",)
+    assert not catalog.refresh()
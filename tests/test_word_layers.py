@@ -0,0 +1,75 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from word_layers import GROUP_MASK, LayeredCatalog
+
+
+# Function to write rows to a word file (appending with mode="a")
+def write_rows(filename, rows, mode="w"):
+    with open(filename, mode, newline="") as file:
+        for row in rows:
+            file.write(row + "\n")
+
+
+# Function to get the difficulty a word comes up under (None if it does not come up)
+def difficulty_of(layers, word):
+    owner = layers.owners.get(word)
+    if owner is None:
+        return None
+    return layers.groups[owner & GROUP_MASK][1]
+
+
+# Function to get every word that can come up for a difficulty
+def words_of(layers, difficulty):
+    words = set()
+    rng = random.Random(0)
+    for _ in range(200):
+        word, _ = layers.random_word(difficulty, rng)
+        if word is not None:
+            words.add(word)
+    return words
+
+
+def test_last_row_wins_across_difficulties(tmp_path):
+    filename = str(tmp_path / "words.csv")
+    write_rows(filename, ["cat,EASY,a", "dog,MEDIUM,b", "cat,MEDIUM,c", "cat,EASY,d"])
+    layers = LayeredCatalog([(filename, 1)])
+    assert difficulty_of(layers, "CAT") == "EASY"
+    assert layers.count("EASY") == 1
+    assert layers.count("MEDIUM") == 1
+    assert words_of(layers, "EASY") == {"CAT"}
+    assert words_of(layers, "MEDIUM") == {"DOG"}
+    assert layers.random_word("EASY")[1] == "d"
+
+
+def test_appended_row_wins_across_difficulties(tmp_path):
+    filename = str(tmp_path / "words.csv")
+    write_rows(filename, ["cat,EASY,a", "dog,MEDIUM,b", "cat,MEDIUM,c"])
+    layers = LayeredCatalog([(filename, 1)])
+    assert difficulty_of(layers, "CAT") == "MEDIUM"
+    assert layers.count("EASY") == 0
+
+    write_rows(filename, ["cat,EASY,d"], mode="a")
+    layers.refresh()
+    assert difficulty_of(layers, "CAT") == "EASY"
+    assert layers.count("EASY") == 1
+    assert layers.count("MEDIUM") == 1
+
+    # Indexing the whole file again gives the same words
+    fresh = LayeredCatalog([(filename, 1)])
+    assert difficulty_of(fresh, "CAT") == "EASY"
+    assert words_of(fresh, "MEDIUM") == words_of(layers, "MEDIUM") == {"DOG"}
+
+
+def test_higher_layer_shadows_lower(tmp_path):
+    base = str(tmp_path / "base.csv")
+    pack = str(tmp_path / "pack.csv")
+    write_rows(base, ["cat,EASY,base cat", "dog,EASY,base dog"])
+    write_rows(pack, ["cat,HARD,pack cat"])
+    layers = LayeredCatalog([(base, 1), (pack, 1)])
+    assert difficulty_of(layers, "CAT") == "HARD"
+    assert layers.layer_of("cat") == pack
+    assert words_of(layers, "EASY") == {"DOG"}
@@ -0,0 +1,180 @@
+import hashlib
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+from array import array
+
+# Shuffle bags: every word of a difficulty is drawn once, in a random order,
+# before any word is drawn again. Each bag is kept in a small file next to the
+# word file (e.g. words.csv.EASY.bag), so the order survives restarts:
+#
+#   header  magic "HMBG", version (u16), word count (u32), position (u32),
+#           fingerprint of the words the order was made for (8 bytes)
+#   order   word indices (u32), in the order they are drawn
+#
+# A draw reads one index and rewrites the 4-byte position through a memory map.
+# When words are appended to the word file, their indices are swapped into
+# random places among the words not drawn yet; the rest of the order is kept.
+BAG_MAGIC = b"HMBG"
+BAG_VERSION = 1
+
+_HEADER = struct.Struct("<4sHII8s")
+_POSITION = struct.Struct("<I")
+_POSITION_OFFSET = 10  # Offset of the position field in the header
+_INDEX = struct.Struct("<I")
+
+
+# Function to get a fingerprint of a list of words (changes if any word changes)
+def fingerprint(words):
+    digest = hashlib.blake2b(digest_size=8)
+    for word in words:
+        digest.update(word.encode("utf-8", "surrogatepass"))
+        digest.update(b"\n")
+    return digest.digest()
+
+
+# Function to get the bag file name for a word file and difficulty
+def bag_filename(filename, difficulty):
+    return "%s.%s.bag" % (filename, difficulty)
+
+
+# Class drawing the words of one difficulty without repeats
+class WordBag:
+    def __init__(self, filename, rng=random):
+        self.filename = filename
+        self.rng = rng
+        self.count = 0
+        self.position = 0
+        self._fingerprint = b""
+        self._words = None  # The word list the order was last checked against
+        self._file = None
+        self._map = None
+        self._open()
+
+    def _open(self):
+        try:
+            self._file = open(self.filename, "r+b")
+        except FileNotFoundError:
+            return
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0)
+            magic, version, count, position, words_fp = _HEADER.unpack_from(self._map, 0)
+            if (magic != BAG_MAGIC or version != BAG_VERSION
+                    or len(self._map) != _HEADER.size + count * _INDEX.size):
+                raise ValueError("not a word bag")
+        except (ValueError, struct.error):
+            self.close()  # Unreadable: start a new bag
+            return
+        self.count = count
+        self.position = position
+        self._fingerprint = words_fp
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # Index (into words) of the next word to play, or None if there are no words.
+    # words is the current list of words for this difficulty, in file order.
+    # Shuffles use rng if one is given, otherwise the bag's own.
+    def draw(self, words, rng=None):
+        if rng is None:
+            rng = self.rng
+        if words is not self._words:
+            self._sync(words, rng)
+        if not words:
+            return None
+        if self.position >= self.count:
+            self._reshuffle(len(words), rng)
+        index = _INDEX.unpack_from(self._map, _HEADER.size + self.position * _INDEX.size)[0]
+        self.position += 1
+        _POSITION.pack_into(self._map, _POSITION_OFFSET, self.position)
+        return index
+
+    # Bring the order up to date with the word list (new bag, appended words or a
+    # changed file). It only counts as done once the bag file is written, so a
+    # write that failed is tried again at the next draw.
+    def _sync(self, words, rng):
+        count = len(words)
+        if self._map is not None and self.count <= count and fingerprint(words[:self.count]) == self._fingerprint:
+            if count > self.count:
+                self._extend(words, rng)
+        else:
+            order = array("I", range(count))
+            rng.shuffle(order)
+            self._write(order, 0, fingerprint(words))
+        self._words = words
+
+    # Start a new round of the bag, not beginning with the word that was just drawn
+    def _reshuffle(self, count, rng):
+        last = None
+        if self.count:
+            last = _INDEX.unpack_from(self._map, _HEADER.size + (self.count - 1) * _INDEX.size)[0]
+        order = array("I", range(count))
+        rng.shuffle(order)
+        if count > 1 and order[0] == last:
+            swap = rng.randrange(1, count)
+            order[0], order[swap] = order[swap], order[0]
+        self._write(order, 0, self._fingerprint)
+
+    # Add the indices of appended words among the words not drawn yet
+    def _extend(self, words, rng):
+        order = array("I")
+        order.frombytes(self._map[_HEADER.size:])
+        if sys.byteorder != "little":
+            order.byteswap()
+        for index in range(self.count, len(words)):
+            order.append(index)
+            swap = rng.randrange(self.position, len(order))
+            order[-1], order[swap] = order[swap], order[-1]
+        self._write(order, self.position, fingerprint(words))
+
+    # Replace the bag file with a new order (written next to it and renamed over it)
+    def _write(self, order, position, words_fp):
+        if order.itemsize != _INDEX.size:
+            raise RuntimeError("array('I') is not 4 bytes on this platform")
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        fd, temp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(_HEADER.pack(BAG_MAGIC, BAG_VERSION, len(order), position, words_fp))
+                if sys.byteorder != "little":
+                    order.byteswap()
+                file.write(order.tobytes())
+            self.close()
+            os.replace(temp_name, self.filename)
+        except BaseException:
+            if os.path.exists(temp_name):
+                os.remove(temp_name)
+            raise
+        self._open()
+
+
+# Bags shared by the whole process, one per word file and difficulty
+_bags = {}
+
+
+# Function to draw a word and its hint from a catalog without repeats
+# (returns None, None if the difficulty has no words). If the bag file cannot
+# be written (a read-only folder, a full disk), the word is picked at random instead.
+def draw_word(catalog, difficulty, rng=None):
+    snapshot = catalog.index  # Words and hints of the same version of the file
+    words = snapshot.words.get(difficulty, ())
+    key = (catalog.filename, difficulty)
+    try:
+        bag = _bags.get(key)
+        if bag is None:
+            bag = WordBag(bag_filename(catalog.filename, difficulty))
+            _bags[key] = bag
+        index = bag.draw(words, rng)
+    except OSError:
+        return catalog.random_word(difficulty, random if rng is None else rng)
+    if index is None:
+        return None, None
+    return words[index], snapshot.hints[difficulty][index]
@@ -0,0 +1,230 @@
+import csv
+import io
+import locale
+import os
+import random
+import threading
+import time
+from array import array
+
+from metrics import get_metrics
+
+# Difficulty levels used in the word files
+DIFFICULTY_LEVELS = ("EASY", "MEDIUM", "HARD")
+
+WATCH_INTERVAL = 1.0  # Seconds between checks of the word files by the watcher
+# Bytes before the end of the last load compared to tell an append from an edit
+# (an edit that adds or removes text moves these bytes; one that only swaps
+# letters in place further up the file is not seen until the next full load)
+TAIL_CHECK_BYTES = 64
+
+
+# Class holding one version of a word file, grouped by difficulty. An index is
+# never changed after it is built: a reload builds a new one and swaps it in with
+# a single assignment, so a reader always sees the words and hints of the same version.
+class WordIndex:
+    __slots__ = ("words", "hints", "numbers", "rows", "signature", "offset", "tail")
+
+    def __init__(self, words, hints, numbers=None, rows=0, signature=None, offset=0, tail=b""):
+        self.words = words  # difficulty -> tuple of upper-case words
+        self.hints = hints  # difficulty -> tuple of hints (same order as words)
+        # difficulty -> array of each word's row number in the file (from 0), to
+        # tell which of the rows of a word listed under several difficulties comes last
+        self.numbers = numbers if numbers is not None else {}
+        self.rows = rows  # Rows read into this index
+        self.signature = signature  # (inode, mtime, size) of the file when it was read
+        self.offset = offset  # Bytes of the file read into this index
+        self.tail = tail  # The last bytes read, to check that a grown file was only appended to
+
+
+EMPTY_INDEX = WordIndex({}, {})
+
+
+# Function to get what tells one version of a file from another: (inode, mtime, size)
+def file_signature(stat):
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+# Function to parse CSV text into {difficulty: [words]}, {difficulty: [hints]} and
+# {difficulty: array of row numbers}, numbering the rows from first. Also returns
+# the number after the last row.
+def parse_rows(text, first=0):
+    words = {}
+    hints = {}
+    numbers = {}
+    number = first
+    for row in csv.reader(io.StringIO(text, newline="")):
+        if row and len(row) >= 3:  # Ensure row has required columns
+            difficulty = row[1]
+            if difficulty not in words:
+                words[difficulty] = []
+                hints[difficulty] = []
+                numbers[difficulty] = array("I")
+            words[difficulty].append(row[0].upper())
+            hints[difficulty].append(row[2])
+            numbers[difficulty].append(number)
+            number += 1
+    return words, hints, numbers, number
+
+
+# Class that keeps one word file loaded in memory, grouped by difficulty
+class WordCatalog:
+    def __init__(self, filename):
+        self.filename = filename
+        self.missing = False
+        self.checked = False  # Whether the file has been looked at yet
+        self.index = EMPTY_INDEX
+        self._encoding = locale.getpreferredencoding(False)  # Same as open() uses
+        self._lock = threading.Lock()
+
+    @property
+    def words(self):
+        return self.index.words
+
+    @property
+    def hints(self):
+        return self.index.hints
+
+    # Reload the file only if it has changed since the last load. Rows appended
+    # to the end are read on their own; any other change reads the whole file.
+    # A thread asking while another is loading waits for that load instead of repeating it.
+    def refresh(self):
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self):
+        self.checked = True
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            self.missing = True
+            self.index = EMPTY_INDEX
+            return False
+
+        index = self.index
+        unchanged = file_signature(stat) == index.signature
+        if unchanged and stat.st_size == index.offset:
+            return False
+
+        metrics = get_metrics()
+        if metrics.enabled:
+            start = time.perf_counter()
+        new_index = None
+        if index.signature is not None and stat.st_ino == index.signature[0] and stat.st_size > index.offset:
+            # A last row left without a line ending by the previous look is read
+            # as complete once the file has stayed the same until this one
+            new_index = self._append(index, unchanged)
+        appended = new_index is not None
+        if not appended:
+            new_index = self._load()
+        if metrics.enabled:
+            metrics.observe("hangman_csv_append_seconds" if appended else "hangman_csv_load_seconds",
+                            time.perf_counter() - start, label=("file", os.path.basename(self.filename)))
+        self.index = new_index
+        self.missing = False
+        return True
+
+    # Parse the whole file once and group the words by difficulty
+    def _load(self):
+        with open(self.filename, "rb") as file:
+            data = file.read()
+            signature = file_signature(os.fstat(file.fileno()))
+        words, hints, numbers, rows = parse_rows(data.decode(self._encoding))
+        # Store as tuples so the groups stay compact and read-only
+        return WordIndex({difficulty: tuple(group) for difficulty, group in words.items()},
+                         {difficulty: tuple(group) for difficulty, group in hints.items()},
+                         numbers, rows, signature, len(data), data[-TAIL_CHECK_BYTES:])
+
+    # Parse only the bytes added since the last load and add their rows to the
+    # groups. Returns None when the file was not simply appended to, and the
+    # whole file has to be read again. Unless complete is true, a last row with
+    # no line ending yet (still being written) is left for the next look.
+    def _append(self, index, complete=False):
+        with open(self.filename, "rb") as file:
+            file.seek(index.offset - len(index.tail))
+            if file.read(len(index.tail)) != index.tail:
+                return None  # Edited before the old end
+            data = file.read()
+            signature = file_signature(os.fstat(file.fileno()))
+        if not complete:
+            data = data[:data.rfind(b"\n") + 1]
+        if data and not index.tail.endswith(b"\n") and data[:1] not in (b"\r", b"\n"):
+            return None  # The last row had no line ending and was written to further
+        added_words, added_hints, added_numbers, rows = parse_rows(data.decode(self._encoding), index.rows)
+        # Groups with no new rows keep the same tuples
+        words = dict(index.words)
+        hints = dict(index.hints)
+        numbers = dict(index.numbers)
+        for difficulty, group in added_words.items():
+            words[difficulty] = words.get(difficulty, ()) + tuple(group)
+            hints[difficulty] = hints.get(difficulty, ()) + tuple(added_hints[difficulty])
+            numbers[difficulty] = numbers.get(difficulty, array("I")) + added_numbers[difficulty]
+        offset = index.offset + len(data)
+        tail = (index.tail + data)[-TAIL_CHECK_BYTES:]
+        return WordIndex(words, hints, numbers, rows, signature, offset, tail)
+
+    # Number of words available for a difficulty level
+    def count(self, difficulty):
+        return len(self.words.get(difficulty, ()))
+
+    # Pick a random word and its hint for a difficulty level in O(1)
+    def random_word(self, difficulty, rng=random):
+        index = self.index
+        words = index.words.get(difficulty)
+        if not words:
+            return None, None
+        position = rng.randrange(len(words))
+        return words[position], index.hints[difficulty][position]
+
+
+# Class checking the word files in a background thread and reloading the ones
+# that changed, so picking a word never waits for a file to be read. Games that
+# already have their word keep it; the next word comes from the new version.
+class CatalogWatcher:
+    def __init__(self, interval=WATCH_INTERVAL):
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="word-file-watcher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            for catalog in list(_catalogs.values()):
+                try:
+                    catalog.refresh()
+                except (OSError, ValueError):
+                    pass  # Tried again at the next check (the file may be half written)
+
+
+# Catalogs shared by the whole process, one per word file
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+_watcher = None
+
+
+# Function to get the (up to date) catalog for a word file. While the watcher
+# runs, the catalog is only read here the first time; the watcher keeps it up to date.
+def get_catalog(filename):
+    catalog = _catalogs.get(filename)
+    if catalog is None:
+        with _catalogs_lock:
+            catalog = _catalogs.setdefault(filename, WordCatalog(filename))
+    if _watcher is None or not catalog.checked:
+        catalog.refresh()
+    return catalog
+
+
+# Function to start the watcher for every catalog of the process (only once)
+def watch_word_files(interval=WATCH_INTERVAL):
+    global _watcher
+    with _catalogs_lock:
+        if _watcher is None:
+            _watcher = CatalogWatcher(interval).start()
+    return _watcher
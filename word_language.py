@@ -0,0 +1,104 @@
+import csv
+import os
+import random
+import threading
+
+from spelling import WordSpelling, display_form, get_letter_table
+from word_catalog import file_signature
+
+# Word files in any language and script. The file is read row by row in the
+# encoding given (UTF-8 by default, with or without the byte order mark that
+# spreadsheet programs write), instead of whatever the system's default is.
+# Each word is shown composed and in capitals, and its spelling (the word as
+# letter keys, and where each key appears; see spelling.py) is worked out once
+# when the file is loaded, so a guess is matched with table lookups only.
+
+DEFAULT_ENCODING = "utf-8-sig"
+
+
+# Class holding one word file of a language, with the spelling of every word
+class LanguagePack:
+    def __init__(self, filename, language=None, encoding=DEFAULT_ENCODING):
+        self.filename = filename
+        self.language = language
+        self.encoding = encoding
+        self.letters = get_letter_table(language)
+        self.missing = False
+        # difficulty -> (tuple of words, tuple of their hints), replaced as a
+        # whole by a reload so a word always comes with its own hint
+        self.rows = {}
+        self.spellings = {}  # word -> spelling.WordSpelling
+        self._signature = None
+        self._lock = threading.Lock()
+
+    # Reload the file if it has changed since the last load (raises
+    # UnicodeDecodeError if it is not in the pack's encoding)
+    def refresh(self):
+        with self._lock:
+            try:
+                stat = os.stat(self.filename)
+            except FileNotFoundError:
+                self.missing = True
+                return False
+            if file_signature(stat) == self._signature:
+                return False
+            self._load()
+            self.missing = False
+            return True
+
+    def _load(self):
+        letters = self.letters
+        words = {}
+        hints = {}
+        spellings = {}
+        with open(self.filename, "r", encoding=self.encoding, newline="") as file:
+            signature = file_signature(os.fstat(file.fileno()))
+            for row in csv.reader(file):
+                if row and len(row) >= 3:  # Ensure row has required columns
+                    word = display_form(row[0].strip())
+                    if not word:
+                        continue
+                    difficulty = row[1]
+                    if difficulty not in words:
+                        words[difficulty] = []
+                        hints[difficulty] = []
+                    words[difficulty].append(word)
+                    hints[difficulty].append(row[2])
+                    if word not in spellings:
+                        spellings[word] = WordSpelling(word, letters)
+        self.rows = {difficulty: (tuple(group), tuple(hints[difficulty])) for difficulty, group in words.items()}
+        self.spellings = spellings
+        self._signature = signature
+
+    # Number of words available for a difficulty level
+    def count(self, difficulty):
+        return len(self.rows.get(difficulty, ((),))[0])
+
+    # Pick a random word and its hint for a difficulty level
+    def random_word(self, difficulty, rng=random):
+        group = self.rows.get(difficulty)
+        if group is None:
+            return None, None
+        words, hints = group
+        position = rng.randrange(len(words))
+        return words[position], hints[position]
+
+    # Spelling of a word of the pack (None if it is not in the pack)
+    def spelling(self, word):
+        return self.spellings.get(word)
+
+
+# Language packs shared by the whole process, one per file, language and encoding
+_packs = {}
+_packs_lock = threading.Lock()
+
+
+# Function to get the (up to date) language pack of a word file
+def get_language_pack(filename, language=None, encoding=DEFAULT_ENCODING):
+    key = (filename, language, encoding)
+    pack = _packs.get(key)
+    if pack is None:
+        with _packs_lock:
+            pack = _packs.setdefault(key, LanguagePack(filename, language, encoding))
+    pack.refresh()
+    return pack
@@ -0,0 +1,270 @@
+import random
+import threading
+from array import array
+
+from word_catalog import EMPTY_INDEX, get_catalog
+
+# Words drawn from several word files at once (the default words, custom words,
+# packs for a team...), each a layer on top of the ones before it. A word in a
+# higher layer shadows the same word in the layers below: only the top copy, with
+# its hint and difficulty, can come up (a word listed twice in one file comes up
+# once too, from its last row, whatever difficulty that row has). Each layer has
+# a weight, and a word of a layer with weight 2 is twice as likely to be picked
+# as one with weight 1.
+#
+# Nothing is copied out of the word files' catalogs. Each layer keeps, per
+# difficulty, the positions of its rows that are not shadowed (while none are,
+# just how many there are). A shadowed row is taken out by moving the last
+# position into its place, so it costs the same however large the layer is.
+# Picking a word chooses a layer with an alias table (weight times visible
+# words, one table per difficulty) and then a position in it: O(1) however many
+# layers and words there are. Adding a layer, or rows appended to a word file,
+# only looks at the new rows.
+
+
+GROUP_BITS = 16  # A word's visible row is kept as one number: position << GROUP_BITS | group
+GROUP_MASK = (1 << GROUP_BITS) - 1
+
+
+# Class keeping the rows of one difficulty of a layer that are not shadowed
+class VisibleRows:
+    __slots__ = ("count", "positions", "places")
+
+    def __init__(self):
+        self.count = 0
+        self.positions = None  # Positions of the visible rows (None while they are simply 0 to count - 1)
+        self.places = None  # Position -> index in positions (-1 for rows not visible)
+
+    # Position of the row at an index from 0 to count - 1
+    def position(self, place):
+        if self.positions is None:
+            return place
+        return self.positions[place]
+
+    def _list_positions(self):
+        self.positions = array("q", range(self.count))
+        self.places = array("q", range(self.count))
+
+    # Make the rows from start to end visible, leaving out the hidden ones
+    # (rows are added in the order of the file)
+    def show(self, start, end, hidden=()):
+        if self.positions is None:
+            if self.count == start and not hidden:
+                self.count = end
+                return
+            self._list_positions()
+        shown = [position for position in range(start, end) if position not in hidden]
+        places = self.places
+        places.extend(array("q", [-1]) * (end - len(places)))
+        for place, position in enumerate(shown, self.count):
+            places[position] = place
+        self.positions.extend(shown)
+        self.count += len(shown)
+
+    # Make a visible row not visible
+    def hide(self, position):
+        if self.positions is None:
+            self._list_positions()
+        positions = self.positions
+        places = self.places
+        place = places[position]
+        last = positions.pop()
+        if last != position:
+            positions[place] = last
+            places[last] = place
+        places[position] = -1
+        self.count -= 1
+
+
+# Class for one word file in the layers
+class Layer:
+    def __init__(self, filename, weight=1):
+        self.filename = filename
+        self.weight = weight
+        self.index = EMPTY_INDEX  # word_catalog.WordIndex of the file the rows were taken from
+        self.rows = {}  # difficulty -> VisibleRows
+
+
+# Function to build an alias table (Vose's method) for picking from weighted
+# choices in O(1): returns (probabilities, aliases)
+def alias_table(weights):
+    count = len(weights)
+    total = sum(weights)
+    scaled = [weight * count / total for weight in weights]
+    probabilities = [1.0] * count
+    aliases = list(range(count))
+    small = [index for index, weight in enumerate(scaled) if weight < 1]
+    large = [index for index, weight in enumerate(scaled) if weight >= 1]
+    while small and large:
+        less = small.pop()
+        more = large.pop()
+        probabilities[less] = scaled[less]
+        aliases[less] = more
+        scaled[more] -= 1 - scaled[less]
+        if scaled[more] < 1:
+            small.append(more)
+        else:
+            large.append(more)
+    return probabilities, aliases
+
+
+# Class drawing words from layered word files
+class LayeredCatalog:
+    def __init__(self, layers=()):
+        self.layers = []
+        self.missing = True  # Whether none of the files exist
+        self.owners = {}  # word -> its visible row, as position << GROUP_BITS | group
+        self.groups = []  # group -> (layer number, difficulty)
+        self._group_numbers = {}  # (layer number, difficulty) -> group
+        self._tables = {}  # difficulty -> (layers, probabilities, aliases), or None without words
+        self._lock = threading.Lock()
+        for filename, weight in layers:
+            self.add_layer(filename, weight)
+
+    # Put a word file on top of the layers (only its own rows are indexed)
+    def add_layer(self, filename, weight=1):
+        catalog = get_catalog(filename)
+        with self._lock:
+            layer = Layer(filename, weight)
+            self.layers.append(layer)
+            self._add_rows(len(self.layers) - 1, catalog.index, EMPTY_INDEX)
+            self.missing = self.missing and catalog.missing
+        return layer
+
+    # Bring the layers up to date with their files. Rows appended to a file are
+    # added on their own; any other change indexes all the layers again.
+    def refresh(self):
+        catalogs = [get_catalog(layer.filename) for layer in self.layers]
+        with self._lock:
+            self.missing = all(catalog.missing for catalog in catalogs)
+            for number, (layer, catalog) in enumerate(zip(self.layers, catalogs)):
+                index = catalog.index
+                if index is layer.index:
+                    continue
+                if not appended_to(layer.index, index):
+                    self._rebuild([catalog.index for catalog in catalogs])
+                    return
+                self._add_rows(number, index, layer.index)
+
+    def _rebuild(self, indexes):
+        self.owners = {}
+        self.groups = []
+        self._group_numbers = {}
+        for number, (layer, index) in enumerate(zip(self.layers, indexes)):
+            layer.index = EMPTY_INDEX
+            layer.rows = {}
+            self._add_rows(number, index, EMPTY_INDEX)
+
+    # Index the rows of a layer's file that come after the ones in old_index.
+    # The last copy of a word in the file wins (by row number, as the copies may
+    # be under different difficulties), and rows shadowed by a layer above are skipped.
+    def _add_rows(self, number, index, old_index):
+        layer = self.layers[number]
+        owners = self.owners
+        numbers = index.numbers
+        for difficulty, words in index.words.items():
+            start = len(old_index.words.get(difficulty, ()))
+            end = len(words)
+            if start == end:
+                continue
+            rows = layer.rows.get(difficulty)
+            if rows is None:
+                rows = layer.rows[difficulty] = VisibleRows()
+                self._group_numbers[number, difficulty] = len(self.groups)
+                self.groups.append((number, difficulty))
+            group = self._group_numbers[number, difficulty]
+            codes = range(start << GROUP_BITS | group, end << GROUP_BITS | group, 1 << GROUP_BITS)
+            added = dict(zip(words[start:], codes))  # word -> its last row
+            hidden = set()
+            if len(added) < end - start:
+                # Earlier copies of words listed twice
+                hidden = {code for word, code in zip(words[start:], codes) if added[word] != code}
+            for word in list(filter(owners.__contains__, added)):
+                owner = owners[word]
+                owner_number, owner_difficulty = self.groups[owner & GROUP_MASK]
+                if owner_number > number or (
+                        owner_number == number and numbers[owner_difficulty][owner >> GROUP_BITS]
+                        > numbers[difficulty][added[word] >> GROUP_BITS]):
+                    hidden.add(added.pop(word))  # Shadowed by a layer above, or a later row of this file
+                else:
+                    self.layers[owner_number].rows[owner_difficulty].hide(owner >> GROUP_BITS)
+            owners.update(added)
+            rows.show(start, end, {code >> GROUP_BITS for code in hidden})
+        layer.index = index
+        self._tables = {}
+
+    # Alias table for picking a layer, weighted by its weight times its visible words
+    def _table(self, difficulty):
+        layers = []
+        weights = []
+        for layer in self.layers:
+            rows = layer.rows.get(difficulty)
+            if rows is not None and rows.count and layer.weight > 0:
+                layers.append(layer)
+                weights.append(layer.weight * rows.count)
+        table = None
+        if layers:
+            table = (layers,) + alias_table(weights)
+        self._tables[difficulty] = table
+        return table
+
+    # Number of words that can come up for a difficulty level
+    def count(self, difficulty):
+        with self._lock:
+            return sum(layer.rows[difficulty].count for layer in self.layers if difficulty in layer.rows)
+
+    # Pick a random word and its hint for a difficulty level in O(1)
+    def random_word(self, difficulty, rng=random):
+        with self._lock:
+            if difficulty in self._tables:
+                table = self._tables[difficulty]
+            else:
+                table = self._table(difficulty)
+            if table is None:
+                return None, None
+            layers, probabilities, aliases = table
+            pick = rng.randrange(len(layers))
+            if rng.random() >= probabilities[pick]:
+                pick = aliases[pick]
+            layer = layers[pick]
+            rows = layer.rows[difficulty]
+            position = rows.position(rng.randrange(rows.count))
+            return layer.index.words[difficulty][position], layer.index.hints[difficulty][position]
+
+    # File a word comes up from (None if it is in none of the layers)
+    def layer_of(self, word):
+        owner = self.owners.get(word.upper())
+        if owner is None:
+            return None
+        return self.layers[self.groups[owner & GROUP_MASK][0]].filename
+
+
+# Function to check whether a new version of a file only added rows to an old one
+def appended_to(old_index, index):
+    for difficulty, words in old_index.words.items():
+        new_words = index.words.get(difficulty, ())
+        if new_words is not words and new_words[:len(words)] != words:
+            return False
+        hints = old_index.hints[difficulty]
+        new_hints = index.hints[difficulty]
+        if new_hints is not hints and new_hints[:len(hints)] != hints:
+            return False
+    return True
+
+
+# Layered catalogs shared by the whole process, one per list of layers
+_layered = {}
+_layered_lock = threading.Lock()
+
+
+# Function to get the (up to date) layered catalog for a list of (filename, weight) layers
+def get_layered_catalog(layers):
+    layers = tuple(tuple(layer) for layer in layers)
+    catalog = _layered.get(layers)
+    if catalog is None:
+        with _layered_lock:
+            catalog = _layered.get(layers)
+            if catalog is None:
+                catalog = _layered[layers] = LayeredCatalog(layers)
+    catalog.refresh()
+    return catalog
@@ -0,0 +1,212 @@
+import csv
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+from array import array
+
+# Layout of a compiled word pack (all numbers little-endian):
+#
+#   header     magic "HMWP", version (u16), number of difficulties (u16),
+#              offset of the blob (u64)
+#   directory  for each difficulty: name length (u8), name (ASCII),
+#              word count (u32), offset of its offset table (u64)
+#   tables     for each difficulty: one record offset (u64) per word, counted
+#              from the start of the blob
+#   blob       records: word and hint lengths in bytes (u16, u16),
+#              word (UTF-8), hint (UTF-8)
+#
+# A word and its hint can be read straight out of the memory map with two
+# lookups, without parsing anything else in the file.
+PACK_MAGIC = b"HMWP"
+PACK_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHQ")
+_DIRECTORY_ENTRY = struct.Struct("<IQ")
+_OFFSET = struct.Struct("<Q")
+_LENGTHS = struct.Struct("<HH")
+MAX_FIELD_BYTES = 0xFFFF  # Longest word or hint (in UTF-8) a record can hold
+MAX_NAME_BYTES = 0xFF  # Longest difficulty name the directory can hold
+
+
+# Error raised when a file is not a word pack this version can read
+class WordPackError(Exception):
+    pass
+
+
+# Function to get the pack file name that belongs to a CSV word file
+def pack_filename(csv_filename):
+    return os.path.splitext(csv_filename)[0] + ".pack"
+
+
+# Function to compile a CSV word file into a binary word pack (raises
+# WordPackError for a row the pack format cannot hold)
+def compile_pack(csv_filename, output_filename=None):
+    if output_filename is None:
+        output_filename = pack_filename(csv_filename)
+    directory = os.path.dirname(os.path.abspath(output_filename))
+
+    # Records are streamed into a temporary blob file, only the offsets stay in memory
+    offsets = {}  # difficulty -> array of record offsets
+    with tempfile.TemporaryFile(dir=directory) as blob:
+        position = 0
+        with open(csv_filename, "r") as file:
+            reader = csv.reader(file)
+            for row in reader:
+                if row and len(row) >= 3:  # Ensure row has required columns
+                    word = row[0].upper().encode("utf-8")
+                    hint = row[2].encode("utf-8")
+                    difficulty = row[1]
+                    if len(word) > MAX_FIELD_BYTES or len(hint) > MAX_FIELD_BYTES:
+                        raise WordPackError("%s line %d: a word or hint is longer than %d bytes."
+                                            % (csv_filename, reader.line_num, MAX_FIELD_BYTES))
+                    if difficulty not in offsets:
+                        if not difficulty.isascii() or len(difficulty) > MAX_NAME_BYTES:
+                            raise WordPackError(
+                                "%s line %d: difficulty %r must be ASCII and at most %d characters long."
+                                % (csv_filename, reader.line_num, difficulty, MAX_NAME_BYTES))
+                        offsets[difficulty] = array("Q")
+                    offsets[difficulty].append(position)
+                    record = _LENGTHS.pack(len(word), len(hint)) + word + hint
+                    blob.write(record)
+                    position += len(record)
+
+        # Work out where each offset table goes so the directory can point at it
+        names = [name.encode("ascii") for name in offsets]
+        header_size = _HEADER.size + sum(1 + len(name) + _DIRECTORY_ENTRY.size for name in names)
+        table_start = header_size
+        table_offsets = []
+        for table in offsets.values():
+            table_offsets.append(table_start)
+            table_start += len(table) * _OFFSET.size
+        blob_start = table_start
+
+        # Write to a temporary file and rename it, so open maps of the old pack stay valid
+        fd, temp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                out.write(_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(names), blob_start))
+                for name, table, table_offset in zip(names, offsets.values(), table_offsets):
+                    out.write(bytes([len(name)]) + name)
+                    out.write(_DIRECTORY_ENTRY.pack(len(table), table_offset))
+                for table in offsets.values():
+                    if sys.byteorder != "little":
+                        table.byteswap()
+                    table.tofile(out)
+                blob.seek(0)
+                while True:
+                    chunk = blob.read(1 << 20)
+                    if not chunk:
+                        break
+                    out.write(chunk)
+            os.replace(temp_name, output_filename)
+        except BaseException:
+            os.remove(temp_name)
+            raise
+    return output_filename
+
+
+# Class that reads words and hints out of a memory-mapped word pack
+class WordPack:
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, "rb") as file:
+            self._stat = os.fstat(file.fileno())
+            # Mapped read-only, so the pages are shared by every process using the pack
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._tables = {}  # difficulty -> (word count, offset table position)
+        self._read_directory()
+
+    # Read the header and directory (the only part parsed when the pack is opened)
+    def _read_directory(self):
+        if len(self._map) < _HEADER.size:
+            raise WordPackError(self.filename + " is not a word pack.")
+        magic, version, count, self._blob = _HEADER.unpack_from(self._map, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise WordPackError(self.filename + " is not a version %d word pack." % PACK_VERSION)
+        position = _HEADER.size
+        for _ in range(count):
+            name_length = self._map[position]
+            name = self._map[position + 1:position + 1 + name_length].decode("ascii")
+            position += 1 + name_length
+            words, table = _DIRECTORY_ENTRY.unpack_from(self._map, position)
+            position += _DIRECTORY_ENTRY.size
+            self._tables[name] = (words, table)
+
+    # Check whether the file on disk is still the one that is mapped
+    def is_current(self):
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return False
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size) == (
+            self._stat.st_ino, self._stat.st_mtime_ns, self._stat.st_size)
+
+    def close(self):
+        self._map.close()
+
+    # Number of words available for a difficulty level
+    def count(self, difficulty):
+        return self._tables.get(difficulty, (0, 0))[0]
+
+    # Read the word and hint stored at an index of a difficulty level
+    def word_at(self, difficulty, index):
+        words, table = self._tables[difficulty]
+        (start,) = _OFFSET.unpack_from(self._map, table + index * _OFFSET.size)
+        start += self._blob
+        word_length, hint_length = _LENGTHS.unpack_from(self._map, start)
+        word_start = start + _LENGTHS.size
+        hint_start = word_start + word_length
+        word = self._map[word_start:hint_start].decode("utf-8")
+        hint = self._map[hint_start:hint_start + hint_length].decode("utf-8")
+        return word, hint
+
+    # Pick a random word and its hint for a difficulty level
+    def random_word(self, difficulty, rng=random):
+        words = self.count(difficulty)
+        if not words:
+            return None, None
+        return self.word_at(difficulty, rng.randrange(words))
+
+
+# Packs opened by this process, one per CSV word file
+_packs = {}
+
+
+# Function to get the word pack for a CSV word file, compiling it when it is out of date.
+# A pack without its CSV file is used as it is, so a pack can be shipped on its
+# own; delete the pack too to take the words away. Raises WordPackError if the
+# CSV file cannot be compiled or the pack cannot be read.
+def get_pack(csv_filename):
+    filename = pack_filename(csv_filename)
+    try:
+        csv_mtime = os.stat(csv_filename).st_mtime_ns
+    except FileNotFoundError:
+        csv_mtime = None
+    try:
+        pack_mtime = os.stat(filename).st_mtime_ns
+    except FileNotFoundError:
+        pack_mtime = None
+
+    if pack_mtime is None and csv_mtime is None:
+        return None
+    if pack_mtime is None or (csv_mtime is not None and csv_mtime > pack_mtime):
+        compile_pack(csv_filename, filename)
+
+    pack = _packs.get(csv_filename)
+    if pack is None or not pack.is_current():
+        pack = WordPack(filename)
+        _packs[csv_filename] = pack
+    return pack
+
+
+# Compile the word files given on the command line
+# Usage: python word_pack.py words.csv custom_words.csv
+if __name__ == "__main__":
+    for name in sys.argv[1:] or ["words.csv", "custom_words.csv"]:
+        try:
+            print("Compiled", name, "->", compile_pack(name))
+        except WordPackError as error:
+            print("Error:", error)
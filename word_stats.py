@@ -0,0 +1,299 @@
+import argparse
+import itertools
+import math
+import os
+import sqlite3
+
+from game_engine import HINT_AFTER_WRONG_GUESSES
+from game_log import HINT, MISS, GameLogReader
+from word_catalog import DIFFICULTY_LEVELS, get_catalog
+
+# Statistics of how each word plays, built from the game log (game_log.py), to
+# find words that are in the wrong difficulty or have a hint that does not help.
+# Games are read as a stream and added into one running total per word and
+# difficulty, so memory grows with the number of words, never the number of games.
+# The totals are kept in a SQLite database with how far each log has been read;
+# an update only reads the games logged since and adds them into the stored totals.
+#
+# Usage: python word_stats.py update games.hlog
+#        python word_stats.py report --words words.csv
+
+BATCH_GAMES = 100000  # Games added up in memory before they are merged into the database
+
+# Totals kept for each word and difficulty
+FIELDS = (
+    "games", "wins", "wrong",  # Games played, won, and wrong guesses in all of them
+    "offered", "taken", "taken_wins",  # Games the hint was offered in, taken in, and won after taking it
+    "score", "taken_score", "declined_score",  # Final scores: all games, hint taken, hint offered but declined
+)
+GAMES, WINS, WRONG, OFFERED, TAKEN, TAKEN_WINS, SCORE, TAKEN_SCORE, DECLINED_SCORE = range(len(FIELDS))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS word_stats (
+    word TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    %s,
+    PRIMARY KEY (word, difficulty)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS logs (
+    filename TEXT PRIMARY KEY,
+    session INTEGER NOT NULL,
+    position INTEGER NOT NULL
+);
+""" % ",\n    ".join("%s INTEGER NOT NULL" % field for field in FIELDS)
+
+# Adds a batch of totals to the stored ones
+MERGE = ("INSERT INTO word_stats (word, difficulty, %s) VALUES (?, ?, %s)"
+         " ON CONFLICT (word, difficulty) DO UPDATE SET %s") % (
+    ", ".join(FIELDS), ", ".join("?" * len(FIELDS)),
+    ", ".join("%s = %s + excluded.%s" % (field, field, field) for field in FIELDS))
+
+
+# Bytes with the MISS flag (a wrong guess), deleted to count the wrong guesses
+_MISS_BYTES = bytes(b for b in range(256) if b & MISS)
+
+
+# Function to turn logged games into results:
+# (word, difficulty, won, wrong guesses, hint offered, hint taken, score)
+def game_results(games):
+    for game in games:
+        difficulty = game.difficulty_name
+        if difficulty is None:
+            continue  # Not played from a difficulty of a word file
+        codes = game.codes
+        wrong = len(codes) - len(codes.translate(None, _MISS_BYTES))
+        # The hint is offered once the wrong guesses reach the limit, unless that lost the game
+        offered = HINT_AFTER_WRONG_GUESSES <= wrong and HINT_AFTER_WRONG_GUESSES < game.attempts
+        yield game.word, difficulty, wrong < game.attempts, wrong, offered, HINT in codes, game.score
+
+
+# Class adding up results per word and difficulty
+class WordStats:
+    def __init__(self):
+        self.totals = {}  # (word, difficulty) -> list of totals, in the order of FIELDS
+
+    def add(self, word, difficulty, won, wrong, offered, taken, score):
+        totals = self.totals.get((word, difficulty))
+        if totals is None:
+            totals = self.totals[(word, difficulty)] = [0] * len(FIELDS)
+        totals[GAMES] += 1
+        totals[WRONG] += wrong
+        totals[SCORE] += score
+        if won:
+            totals[WINS] += 1
+        if offered:
+            totals[OFFERED] += 1
+            if taken:
+                totals[TAKEN] += 1
+                totals[TAKEN_SCORE] += score
+                if won:
+                    totals[TAKEN_WINS] += 1
+            else:
+                totals[DECLINED_SCORE] += score
+
+    # Add a stream of results; returns how many were added
+    def update(self, results):
+        count = 0
+        for result in results:
+            self.add(*result)
+            count += 1
+        return count
+
+    # Add the totals of another WordStats into these
+    def merge(self, other):
+        for key, values in other.totals.items():
+            totals = self.totals.get(key)
+            if totals is None:
+                self.totals[key] = list(values)
+            else:
+                for index, value in enumerate(values):
+                    totals[index] += value
+
+    # Totals of every word at each difficulty: {difficulty: totals}
+    def by_difficulty(self):
+        totals = {}
+        for (word, difficulty), values in self.totals.items():
+            if difficulty not in totals:
+                totals[difficulty] = [0] * len(FIELDS)
+            group = totals[difficulty]
+            for index, value in enumerate(values):
+                group[index] += value
+        return totals
+
+
+# Class keeping the totals in a database, with how far each log has been read
+class StatsStore:
+    def __init__(self, filename="word_stats.db"):
+        self.filename = filename
+        self._connection = sqlite3.connect(filename, timeout=30)
+        self._connection.executescript(SCHEMA)
+
+    def close(self):
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Add totals into the stored ones (with the log position they were read up to,
+    # in the same transaction, so no game is ever counted twice)
+    def merge(self, stats, log=None, checkpoint=None):
+        with self._connection:
+            self._connection.executemany(MERGE, [key + tuple(values) for key, values in stats.totals.items()])
+            if checkpoint is not None:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO logs (filename, session, position) VALUES (?, ?, ?)",
+                    (os.path.abspath(log), checkpoint[0], checkpoint[1]))
+
+    # Read the games added to a log since the last update; returns how many were read
+    def update_from_log(self, log, batch_games=BATCH_GAMES):
+        row = self._connection.execute("SELECT session, position FROM logs WHERE filename = ?",
+                                       (os.path.abspath(log),)).fetchone()
+        reader = GameLogReader(log, row)
+        games = game_results(reader)
+        count = 0
+        while True:
+            stats = WordStats()
+            added = stats.update(itertools.islice(games, batch_games))
+            if added:
+                self.merge(stats, log, reader.checkpoint)
+            count += added
+            if added < batch_games:
+                return count
+
+    # The stored totals
+    def load(self):
+        stats = WordStats()
+        for row in self._connection.execute("SELECT word, difficulty, %s FROM word_stats" % ", ".join(FIELDS)):
+            stats.totals[row[:2]] = list(row[2:])
+        return stats
+
+
+# Function to get the averages of a set of totals:
+# (win rate, mean wrong guesses, hint uptake, mean score with the hint, mean score declining it)
+def averages(totals):
+    games = totals[GAMES]
+    offered = totals[OFFERED]
+    taken = totals[TAKEN]
+    declined = offered - taken
+    return (totals[WINS] / games if games else None,
+            totals[WRONG] / games if games else None,
+            taken / offered if offered else None,
+            totals[TAKEN_SCORE] / taken if taken else None,
+            totals[DECLINED_SCORE] / declined if declined else None)
+
+
+# Function to find the words to re-tier: words whose win rate is nearer another
+# difficulty's than their own. Ranked by how sure that is (the z-score of the
+# word's win rate against its difficulty's).
+# Returns (z, word, difficulty, suggested difficulty, win rate, games).
+def retier_suggestions(stats, min_games=20):
+    rates = {difficulty: averages(totals)[0] for difficulty, totals in stats.by_difficulty().items()}
+    suggestions = []
+    for (word, difficulty), totals in stats.totals.items():
+        games = totals[GAMES]
+        expected = rates.get(difficulty)
+        if games < min_games or expected is None or expected in (0, 1):
+            continue
+        rate = totals[WINS] / games
+        nearest = min(rates, key=lambda other: abs(rates[other] - rate))
+        if nearest != difficulty:
+            z = (rate - expected) / math.sqrt(expected * (1 - expected) / games)
+            suggestions.append((abs(z), word, difficulty, nearest, rate, games))
+    suggestions.sort(reverse=True)
+    return suggestions
+
+
+# Function to find the hints to rewrite: words where taking the hint gains fewer
+# points (mean score with the hint minus declining it) than at their difficulty.
+# Ranked by the shortfall, weighted by how often the hint was taken.
+# Returns (shortfall, word, difficulty, gain, difficulty's gain, uptake, hints taken).
+def hint_suggestions(stats, min_hints=10):
+    gains = {}
+    for difficulty, totals in stats.by_difficulty().items():
+        uptake, with_hint, without_hint = averages(totals)[2:]
+        if with_hint is not None and without_hint is not None:
+            gains[difficulty] = with_hint - without_hint
+    suggestions = []
+    for (word, difficulty), totals in stats.totals.items():
+        uptake, with_hint, without_hint = averages(totals)[2:]
+        if totals[TAKEN] < min_hints or without_hint is None or difficulty not in gains:
+            continue
+        gain = with_hint - without_hint
+        if gain < gains[difficulty]:
+            shortfall = (gains[difficulty] - gain) * math.sqrt(totals[TAKEN])
+            suggestions.append((shortfall, word, difficulty, gain, gains[difficulty], uptake, totals[TAKEN]))
+    suggestions.sort(reverse=True)
+    return suggestions
+
+
+# Function to keep only the totals of the words in some word files
+def only_words_in(stats, filenames):
+    entries = set()
+    for filename in filenames:
+        catalog = get_catalog(filename)
+        for difficulty, words in catalog.words.items():
+            entries.update((word, difficulty) for word in words)
+    kept = WordStats()
+    kept.totals = {key: totals for key, totals in stats.totals.items() if key in entries}
+    return kept
+
+
+# Function to format an average for the report ("-" when there is none)
+def _format(value, pattern, scale=1):
+    return pattern % (value * scale) if value is not None else "-"
+
+
+# Function to print the report: totals per difficulty, then the ranked suggestions
+def print_report(stats, min_games=20, min_hints=10, limit=20):
+    print("===== Difficulties =====")
+    print("%-8s %8s %8s %8s %8s %12s %12s" % ("", "games", "win rate", "wrong", "uptake",
+                                            "with hint", "declined"))
+    by_difficulty = stats.by_difficulty()
+    for difficulty in sorted(by_difficulty, key=lambda d: (d not in DIFFICULTY_LEVELS, d)):
+        totals = by_difficulty[difficulty]
+        rate, wrong, uptake, with_hint, without_hint = averages(totals)
+        print("%-8s %8d %8s %8s %8s %12s %12s" % (
+            difficulty, totals[GAMES], _format(rate, "%.1f%%", 100), _format(wrong, "%.2f"),
+            _format(uptake, "%.1f%%", 100), _format(with_hint, "%.1f"),
+            _format(without_hint, "%.1f")))
+
+    print("\n===== Words to re-tier =====")
+    for z, word, difficulty, nearest, rate, games in retier_suggestions(stats, min_games)[:limit]:
+        print("%-20s %-6s -> %-6s  won %5.1f%% of %d games (z = %.1f)" % (
+            word, difficulty, nearest, 100 * rate, games, z))
+
+    print("\n===== Hints to rewrite =====")
+    for shortfall, word, difficulty, gain, expected, uptake, taken in hint_suggestions(stats, min_hints)[:limit]:
+        print("%-20s %-6s  hint gains %+.1f points (%+.1f at %s), taken %d times (%.0f%% uptake)" % (
+            word, difficulty, gain, expected, difficulty, taken, 100 * uptake))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-word statistics from the game log.")
+    parser.add_argument("--database", default="word_stats.db")
+    commands = parser.add_subparsers(dest="command", required=True)
+    update = commands.add_parser("update", help="add the games logged since the last update")
+    update.add_argument("logs", nargs="*", default=["games.hlog"])
+    report = commands.add_parser("report", help="words to re-tier and hints to rewrite")
+    report.add_argument("--words", nargs="*", help="only words in these files (e.g. words.csv custom_words.csv)")
+    report.add_argument("--min-games", type=int, default=20)
+    report.add_argument("--min-hints", type=int, default=10)
+    report.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    with StatsStore(args.database) as store:
+        if args.command == "update":
+            for log in args.logs:
+                print("%s: %d new games" % (log, store.update_from_log(log)))
+        else:
+            stats = store.load()
+            if args.words:
+                stats = only_words_in(stats, args.words)
+            print_report(stats, args.min_games, args.min_hints, args.limit)
+
+
+if __name__ == "__main__":
+    main()
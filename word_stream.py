@@ -0,0 +1,22 @@
+import csv
+import random
+
+
+# Function to pick a uniformly random word of a difficulty in one pass over a word file.
+# Uses reservoir sampling: the n-th matching row replaces the kept one with
+# probability 1/n, so only one row is held in memory however large the file is.
+# Raises FileNotFoundError if the file does not exist.
+def sample_word(filename, difficulty, rng=random):
+    chosen = None
+    matches = 0
+    with open(filename, "r") as file:
+        reader = csv.reader(file)
+        for row in reader:
+            if row and len(row) >= 3 and row[1] == difficulty:
+                matches += 1
+                if rng.randrange(matches) == 0:
+                    chosen = row
+
+    if chosen is None:
+        return None, None
+    return chosen[0].upper(), chosen[2]